@@ -122,6 +122,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset paging cursor of /api/prospects (backend/api/routes/simple_prospects.py)
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Basic routes
@@ -200,22 +202,15 @@ async def get_companies(db: Session = Depends(get_db)):
 async def get_prospects(db: Session = Depends(get_db)):
     """Get all prospects"""
     try:
+        # Rows are keyed by column name; p.* put company_name at an index
+        # that moved whenever prospects gained a column
         result = db.execute(text("""
-            SELECT p.*, c.name as company_name 
+            SELECT p.id, p.company_id, p.score, p.ai_analysis, c.name as company_name 
             FROM prospects p 
             LEFT JOIN companies c ON p.company_id = c.id 
             LIMIT 100
         """))
-        prospects = []
-        for row in result:
-            prospects.append({
-                "id": row[0],
-                "company_id": row[1],
-                "score": row[2],
-                "ai_analysis": row[3],
-                "company_name": row[5] if len(row) > 5 else None
-            })
-        return prospects
+        return [dict(row._mapping) for row in result]
     except Exception as e:
         logger.error(f"Error fetching prospects: {e}")
         return []
@@ -0,0 +1,26 @@
+"""
+Eager-loading policy for the ORM routes
+
+Every relationship a response model serializes is loaded together with the
+rows that need it: many-to-one with a JOIN (joinedload), one-to-many with
+one extra IN query (selectinload). Any other relationship raises instead
+of lazy loading, so a route that starts walking relationships per row
+fails loudly in development rather than issuing one query per row (N+1).
+Aggregate endpoints should not load ORM objects at all; they select the
+columns they need with joins and GROUP BY.
+"""
+
+from sqlalchemy.orm import Query, contains_eager, joinedload, raiseload
+
+from models.models import Prospect
+
+# ProspectResponse nests CompanyResponse, which has no relationships
+PROSPECT_RESPONSE = (joinedload(Prospect.company), raiseload('*'))
+
+# Same, for queries that already JOIN companies to filter on them
+PROSPECT_RESPONSE_JOINED = (contains_eager(Prospect.company), raiseload('*'))
+
+
+def with_policy(query: Query, policy: tuple) -> Query:
+    """Apply a route's loading policy to a query"""
+    return query.options(*policy)
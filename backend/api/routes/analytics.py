@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from models.database import get_db
 from models.models import Prospect, Company, Opportunity, AnalyticsSnapshot
 from api.schemas import AnalyticsDashboard, AnalyticsIslandSummary, AnalyticsIndustrySummary
+from api.eager_loading import PROSPECT_RESPONSE, with_policy
 
 router = APIRouter()
 
@@ -60,7 +61,7 @@ async def get_dashboard(db: Session = Depends(get_db)):
     ]
     
     # Recent high scores
-    recent_high_scores = db.query(Prospect).filter(
+    recent_high_scores = with_policy(db.query(Prospect), PROSPECT_RESPONSE).filter(
         Prospect.score >= 80
     ).order_by(Prospect.created_at.desc()).limit(10).all()
     
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from models.database import get_db
+from services.analytics_rollups import rollup_refresher
 from models.models import Company
 from api.schemas import CompanyResponse, CompanyCreate, CompanyUpdate, IslandEnum, IndustryEnum
 
@@ -53,6 +54,7 @@ async def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
     db_company = Company(**company.dict())
     db.add(db_company)
     db.commit()
+    rollup_refresher.request_refresh()
     db.refresh(db_company)
     return db_company
 
@@ -72,6 +74,7 @@ async def update_company(
         setattr(company, field, value)
         
     db.commit()
+    rollup_refresher.request_refresh()
     db.refresh(company)
     return company
 
@@ -85,4 +88,5 @@ async def delete_company(company_id: int, db: Session = Depends(get_db)):
         
     db.delete(company)
     db.commit()
+    rollup_refresher.request_refresh()
     return {"message": "Company deleted successfully"}
\ No newline at end of file
@@ -4,7 +4,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from models.database import get_db
-from models.models import Interaction, Prospect
+from models.models import Interaction, Prospect, Company
 from api.schemas import InteractionResponse, InteractionCreate
 
 router = APIRouter()
@@ -84,19 +84,31 @@ async def delete_interaction(interaction_id: int, db: Session = Depends(get_db))
 
 @router.get("/upcoming/tasks")
 async def get_upcoming_tasks(db: Session = Depends(get_db)):
-    """Get interactions with upcoming next actions"""
-    upcoming = db.query(Interaction).filter(
+    """Get interactions with upcoming next actions
+    
+    The company name comes from the same query via outer joins, so the
+    query count does not grow with the number of tasks.
+    """
+    upcoming = db.query(
+        Interaction.id,
+        Interaction.prospect_id,
+        Interaction.next_action,
+        Interaction.next_action_date,
+        Company.name
+    ).outerjoin(Prospect, Prospect.id == Interaction.prospect_id).outerjoin(
+        Company, Company.id == Prospect.company_id
+    ).filter(
         Interaction.next_action_date >= datetime.now().date(),
         Interaction.next_action.isnot(None)
     ).order_by(Interaction.next_action_date).all()
     
     return [
         {
-            "interaction_id": i.id,
-            "prospect_id": i.prospect_id,
-            "next_action": i.next_action,
-            "next_action_date": i.next_action_date,
-            "prospect_name": i.prospect.company.name if i.prospect and i.prospect.company else "Unknown"
+            "interaction_id": interaction_id,
+            "prospect_id": prospect_id,
+            "next_action": next_action,
+            "next_action_date": next_action_date,
+            "prospect_name": company_name or "Unknown"
         }
-        for i in upcoming
-    ]
\ No newline at end of file
+        for interaction_id, prospect_id, next_action, next_action_date, company_name in upcoming
+    ]
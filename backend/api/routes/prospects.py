@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime
 
 from models.database import get_db
+from services.analytics_rollups import rollup_refresher
 from models.models import Prospect, Company, IslandEnum, IndustryEnum
 from api.schemas import ProspectResponse, ProspectCreate, ProspectUpdate
+from api.eager_loading import PROSPECT_RESPONSE, PROSPECT_RESPONSE_JOINED, with_policy
 from services.claude_analyzer import ClaudeBusinessAnalyzer
 
 router = APIRouter()
@@ -22,7 +25,7 @@ async def get_prospects(
     db: Session = Depends(get_db)
 ):
     """Get filtered list of prospects"""
-    query = db.query(Prospect).join(Company)
+    query = with_policy(db.query(Prospect).join(Company), PROSPECT_RESPONSE_JOINED)
     
     if island:
         query = query.filter(Company.island == island)
@@ -40,7 +43,7 @@ async def get_prospects(
 @router.get("/{prospect_id}", response_model=ProspectResponse)
 async def get_prospect(prospect_id: int, db: Session = Depends(get_db)):
     """Get a specific prospect by ID"""
-    prospect = db.query(Prospect).filter(Prospect.id == prospect_id).first()
+    prospect = with_policy(db.query(Prospect), PROSPECT_RESPONSE).filter(Prospect.id == prospect_id).first()
     if not prospect:
         raise HTTPException(status_code=404, detail="Prospect not found")
     return prospect
@@ -58,6 +61,7 @@ async def create_prospect(prospect: ProspectCreate, db: Session = Depends(get_db
     db_prospect = Prospect(**prospect.dict())
     db.add(db_prospect)
     db.commit()
+    rollup_refresher.request_refresh()
     db.refresh(db_prospect)
     return db_prospect
 
@@ -78,6 +82,7 @@ async def update_prospect(
         
     prospect.updated_at = datetime.utcnow()
     db.commit()
+    rollup_refresher.request_refresh()
     db.refresh(prospect)
     return prospect
 
@@ -110,6 +115,7 @@ async def analyze_prospect(prospect_id: int, db: Session = Depends(get_db)):
         
     prospect.last_analyzed = datetime.utcnow()
     db.commit()
+    rollup_refresher.request_refresh()
     db.refresh(prospect)
     
     return {"message": "Prospect re-analyzed successfully", "new_score": prospect.score}
@@ -124,33 +130,34 @@ async def delete_prospect(prospect_id: int, db: Session = Depends(get_db)):
         
     db.delete(prospect)
     db.commit()
+    rollup_refresher.request_refresh()
     return {"message": "Prospect deleted successfully"}
 
 
 @router.get("/high-priority/summary")
 async def get_high_priority_summary(db: Session = Depends(get_db)):
-    """Get summary of high priority prospects"""
-    high_priority_prospects = db.query(Prospect).filter(
+    """Get summary of high priority prospects
+    
+    Two aggregate queries regardless of how many prospects are High: one
+    grouped by island, one grouped by unnested recommended service.
+    """
+    by_island = db.query(
+        Company.island,
+        func.count(Prospect.id),
+        func.coalesce(func.sum(Prospect.estimated_deal_value), 0)
+    ).join(Prospect, Prospect.company_id == Company.id).filter(
         Prospect.priority_level == "High"
-    ).all()
+    ).group_by(Company.island).all()
     
-    summary = {
-        "total_count": len(high_priority_prospects),
-        "by_island": {},
-        "by_service": {},
-        "total_potential_value": 0
-    }
+    # unnest() cannot appear in GROUP BY, so expand the arrays in a subquery
+    services = db.query(
+        func.unnest(Prospect.recommended_services).label("service")
+    ).filter(Prospect.priority_level == "High").subquery()
+    by_service = db.query(services.c.service, func.count()).group_by(services.c.service).all()
     
-    for prospect in high_priority_prospects:
-        # Count by island
-        island = prospect.company.island.value
-        summary["by_island"][island] = summary["by_island"].get(island, 0) + 1
-        
-        # Count by recommended service
-        for service in (prospect.recommended_services or []):
-            summary["by_service"][service] = summary["by_service"].get(service, 0) + 1
-            
-        # Sum potential value
-        summary["total_potential_value"] += prospect.estimated_deal_value or 0
-        
-    return summary
\ No newline at end of file
+    return {
+        "total_count": sum(count for _, count, _ in by_island),
+        "by_island": {island.value: count for island, count, _ in by_island},
+        "by_service": {getattr(service, "value", service): count for service, count in by_service},
+        "total_potential_value": sum(value for _, _, value in by_island)
+    }
@@ -1,57 +1,73 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
 from models.database import get_db
+from services.analytics_cache import analytics_cache
+from services.analytics_rollups import rollup_refresher
+from services.row_serializer import dumps
+from api.serializers import DASHBOARD_ISLAND, DASHBOARD_INDUSTRY, DASHBOARD_RECENT, TIMELINE
 
-router = APIRouter()
+# The rollups these routes read are refreshed by a background thread
+router = APIRouter(on_startup=[rollup_refresher.start])
 
 
 @router.get("/dashboard")
 async def get_dashboard(db: Session = Depends(get_db)):
-    """Get dashboard analytics using raw SQL to avoid enum issues"""
+    """Get dashboard analytics, served from cache until data changes
+    
+    The encoded JSON is cached, so cache hits skip serialization too.
+    """
+    body = analytics_cache.get_or_compute('dashboard', lambda: dumps(_compute_dashboard(db)))
+    return Response(content=body, media_type="application/json")
+
+
+def _compute_dashboard(db: Session) -> Dict[str, Any]:
+    """Assemble dashboard analytics using raw SQL to avoid enum issues
+    
+    Aggregates come from the prospect_rollups materialized view and its
+    island/industry views (database/schema.sql), which RollupRefresher
+    keeps current in the background.
+    """
     
     # Basic stats
     stats_query = text("""
         SELECT 
-            COUNT(*) as total_prospects,
-            COUNT(*) FILTER (WHERE priority_level = 'High') as high_priority_count,
-            COALESCE(SUM(estimated_deal_value), 0) as total_pipeline_value,
-            COALESCE(AVG(score), 0) as average_score
-        FROM prospects
+            COALESCE(SUM(prospect_count), 0)::int as total_prospects,
+            COALESCE(SUM(high_priority_count), 0)::int as high_priority_count,
+            COALESCE(SUM(pipeline_value), 0) as total_pipeline_value,
+            COALESCE(SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0), 0) as average_score
+        FROM prospect_rollups
     """)
     stats_result = db.execute(stats_query).fetchone()
     
     # By island
     island_query = text("""
         SELECT 
-            c.island,
-            COUNT(p.id) as prospect_count,
-            COALESCE(AVG(p.score), 0) as average_score,
-            COUNT(p.id) FILTER (WHERE p.priority_level = 'High') as high_priority_count,
-            COALESCE(SUM(p.estimated_deal_value), 0) as total_pipeline_value
-        FROM companies c
-        JOIN prospects p ON c.id = p.company_id
-        GROUP BY c.island
+            island,
+            prospect_count,
+            average_score,
+            high_priority_count,
+            total_pipeline_value
+        FROM island_rollups
         ORDER BY prospect_count DESC
     """)
-    island_results = db.execute(island_query).fetchall()
+    island_results = db.execute(island_query)
     
     # By industry
     industry_query = text("""
         SELECT 
-            c.industry,
-            COUNT(p.id) as prospect_count,
-            COALESCE(AVG(p.score), 0) as average_score
-        FROM companies c
-        JOIN prospects p ON c.id = p.company_id
-        GROUP BY c.industry
+            industry,
+            prospect_count,
+            average_score,
+            ARRAY[]::text[] as top_services  -- not computed yet
+        FROM industry_rollups
         ORDER BY prospect_count DESC
         LIMIT 10
     """)
-    industry_results = db.execute(industry_query).fetchall()
+    industry_results = db.execute(industry_query)
     
     # Recent high scores
     recent_query = text("""
@@ -70,7 +86,7 @@ async def get_dashboard(db: Session = Depends(get_db)):
         ORDER BY p.created_at DESC
         LIMIT 10
     """)
-    recent_results = db.execute(recent_query).fetchall()
+    recent_results = db.execute(recent_query)
     
     return {
         "total_prospects": stats_result[0],
@@ -78,57 +94,24 @@ async def get_dashboard(db: Session = Depends(get_db)):
         "total_pipeline_value": float(stats_result[2]),
         "average_score": float(stats_result[3]),
         "conversion_rate": 0,  # Placeholder
-        "by_island": [
-            {
-                "island": row[0],
-                "prospect_count": row[1],
-                "average_score": float(row[2]),
-                "high_priority_count": row[3],
-                "total_pipeline_value": float(row[4])
-            }
-            for row in island_results
-        ],
-        "by_industry": [
-            {
-                "industry": row[0],
-                "prospect_count": row[1],
-                "average_score": float(row[2]),
-                "top_services": []
-            }
-            for row in industry_results
-        ],
-        "recent_high_scores": [
-            {
-                "id": row[0],
-                "score": row[1],
-                "priority_level": row[2],
-                "estimated_deal_value": float(row[3]) if row[3] else 0,
-                "recommended_services": list(row[4]) if row[4] and isinstance(row[4], (list, tuple)) else [s.strip('" ') for s in row[4].strip('{}').split(',')] if row[4] and isinstance(row[4], str) else [],
-                "company": {
-                    "name": row[5],
-                    "island": row[6],
-                    "industry": row[7]
-                }
-            }
-            for row in recent_results
-        ]
+        "by_island": DASHBOARD_ISLAND.rows(island_results.keys(), island_results),
+        "by_industry": DASHBOARD_INDUSTRY.rows(industry_results.keys(), industry_results),
+        "recent_high_scores": DASHBOARD_RECENT.rows(recent_results.keys(), recent_results)
     }
 
 
 @router.get("/by-island")
 async def get_analytics_by_island(db: Session = Depends(get_db)):
-    """Get analytics grouped by island"""
+    """Get analytics grouped by island, from the rollup views"""
     
     query = text("""
         SELECT 
-            c.island,
-            COUNT(p.id) as prospect_count,
-            COALESCE(AVG(p.score), 0) as average_score,
-            COUNT(p.id) FILTER (WHERE p.priority_level = 'High') as high_priority_count,
-            COALESCE(SUM(p.estimated_deal_value), 0) as total_pipeline_value
-        FROM companies c
-        JOIN prospects p ON c.id = p.company_id
-        GROUP BY c.island
+            island,
+            prospect_count,
+            average_score,
+            high_priority_count,
+            total_pipeline_value
+        FROM island_rollups
         ORDER BY total_pipeline_value DESC
     """)
     
@@ -148,17 +131,15 @@ async def get_analytics_by_island(db: Session = Depends(get_db)):
 
 @router.get("/by-industry")
 async def get_analytics_by_industry(db: Session = Depends(get_db)):
-    """Get analytics grouped by industry"""
+    """Get analytics grouped by industry, from the rollup views"""
     
     query = text("""
         SELECT 
-            c.industry,
-            COUNT(p.id) as prospect_count,
-            COALESCE(AVG(p.score), 0) as average_score,
-            COALESCE(SUM(p.estimated_deal_value), 0) as total_pipeline_value
-        FROM companies c
-        JOIN prospects p ON c.id = p.company_id
-        GROUP BY c.industry
+            industry,
+            prospect_count,
+            average_score,
+            total_pipeline_value
+        FROM industry_rollups
         ORDER BY prospect_count DESC
         LIMIT 15
     """)
@@ -176,54 +157,52 @@ async def get_analytics_by_industry(db: Session = Depends(get_db)):
     ]
 
 
+TIMELINE_QUERY = text("""
+    WITH buckets AS (
+        SELECT generate_series(
+            date_trunc(:bucket, CAST(:start_date AS timestamp)),
+            date_trunc(:bucket, CAST(:end_date AS timestamp)),
+            CAST('1 ' || :bucket AS interval)
+        )::date AS date
+    ),
+    counts AS (
+        SELECT 
+            date_trunc(:bucket, CAST(day AS timestamp))::date AS date,
+            SUM(new_prospects) AS new_prospects,
+            SUM(pipeline_value) AS pipeline_value
+        FROM prospect_daily_counts
+        WHERE day BETWEEN :start_date AND :end_date
+        GROUP BY 1
+    )
+    SELECT 
+        b.date,
+        COALESCE(c.new_prospects, 0)::int as new_prospects,
+        COALESCE(c.pipeline_value, 0) as pipeline_value
+    FROM buckets b
+    LEFT JOIN counts c ON b.date = c.date
+    ORDER BY b.date
+""")
+
+
 @router.get("/timeline")
 async def get_analytics_timeline(
     days: int = Query(default=30, ge=1, le=365),
+    bucket: str = Query(default="day", pattern="^(day|week|month)$"),
     db: Session = Depends(get_db)
 ):
-    """Get timeline analytics for the specified number of days"""
+    """Get timeline analytics for the specified number of days
     
-    # Calculate start date
-    end_date = datetime.now()
+    Reads the prospect_daily_counts table (at most one row per day), so
+    the cost does not grow with the number of prospects. Week and month
+    buckets are summed from the same counters and dated by their first
+    day (weeks start on Monday); the first bucket may be partial.
+    """
+    end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
-    # Get daily stats
-    query = text("""
-        WITH date_series AS (
-            SELECT generate_series(
-                CAST(:start_date AS date),
-                CAST(:end_date AS date),
-                '1 day'::interval
-            )::date AS date
-        ),
-        daily_stats AS (
-            SELECT 
-                DATE(p.created_at) as date,
-                COUNT(*) as new_prospects,
-                COALESCE(SUM(p.estimated_deal_value), 0) as pipeline_value
-            FROM prospects p
-            WHERE p.created_at >= :start_date
-            GROUP BY DATE(p.created_at)
-        )
-        SELECT 
-            ds.date,
-            COALESCE(d.new_prospects, 0) as new_prospects,
-            COALESCE(d.pipeline_value, 0) as pipeline_value
-        FROM date_series ds
-        LEFT JOIN daily_stats d ON ds.date = d.date
-        ORDER BY ds.date
-    """)
-    
-    results = db.execute(query, {
+    result = db.execute(TIMELINE_QUERY, {
+        "bucket": bucket,
         "start_date": start_date,
         "end_date": end_date
-    }).fetchall()
-    
-    return [
-        {
-            "date": row[0].isoformat(),
-            "new_prospects": row[1],
-            "pipeline_value": float(row[2])
-        }
-        for row in results
-    ]
\ No newline at end of file
+    })
+    return Response(content=TIMELINE.dumps(result.keys(), result), media_type="application/json")
@@ -1,13 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
+import base64
+import csv
+import io
+import json
 
 from models.database import get_db
+from api.serializers import PROSPECT_DETAIL, PROSPECT_LIST
 
 router = APIRouter()
 
 
+def _encode_cursor(score: int, prospect_id: int) -> str:
+    """Opaque cursor for the position after (score, id)"""
+    return base64.urlsafe_b64encode(json.dumps([score, prospect_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Inverse of _encode_cursor"""
+    try:
+        score, prospect_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(score), int(prospect_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
 async def get_prospects(
     island: Optional[str] = None,
@@ -16,9 +36,16 @@ async def get_prospects(
     priority: Optional[str] = None,
     limit: int = Query(100, le=500),
     offset: int = 0,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get filtered list of prospects using raw SQL"""
+    """Get filtered list of prospects using raw SQL
+    
+    Pages are ordered by (score, id) descending. Pass the X-Next-Cursor
+    header of one page as `cursor` to get the next; keyset paging keeps
+    deep pages as cheap as the first. `offset` is still honoured for
+    older clients when no cursor is given.
+    """
     
     # Build query
     query = """
@@ -70,45 +97,196 @@ async def get_prospects(
         query += " AND p.priority_level = :priority"
         params['priority'] = priority
     
-    query += " ORDER BY p.score DESC LIMIT :limit OFFSET :offset"
-    params['limit'] = limit
+    if cursor:
+        # Keyset condition; served by idx_prospects_score_id
+        query += " AND (COALESCE(p.score, 0), p.id) < (:cursor_score, :cursor_id)"
+        params['cursor_score'], params['cursor_id'] = _decode_cursor(cursor)
+        offset = 0
+    
+    # Fetch one extra row to learn whether another page follows
+    query += " ORDER BY COALESCE(p.score, 0) DESC, p.id DESC LIMIT :limit OFFSET :offset"
+    params['limit'] = limit + 1
     params['offset'] = offset
     
-    results = db.execute(text(query), params).fetchall()
-    
-    prospects = []
-    for row in results:
-        prospect = {
-            "id": row[0],
-            "score": row[1],
-            "ai_analysis": row[2],
-            "pain_points": row[3] if row[3] else [],
-            "recommended_services": list(row[4]) if row[4] and isinstance(row[4], (list, tuple)) else [s.strip('" ') for s in row[4].strip('{}').split(',')] if row[4] and isinstance(row[4], str) else [],
-            "estimated_deal_value": float(row[5]) if row[5] else 0,
-            "growth_signals": row[6] if row[6] else [],
-            "technology_readiness": row[7],
-            "priority_level": row[8],
-            "last_analyzed": row[9].isoformat() if row[9] else None,
-            "created_at": row[10].isoformat() if row[10] else None,
-            "updated_at": row[11].isoformat() if row[11] else None,
-            "company": {
-                "id": row[12],
-                "name": row[13],
-                "address": row[14],
-                "island": row[15],
-                "industry": row[16],
-                "website": row[17],
-                "phone": row[18],
-                "employee_count_estimate": row[19],
-                "annual_revenue_estimate": float(row[20]) if row[20] else 0,
-                "description": row[21],
-                "source": row[22],
-                "source_url": row[23]
-            }
-        }
-        prospects.append(prospect)
-    
-    return prospects
+    result = db.execute(text(query), params)
+    results = result.fetchall()
+    
+    has_more = len(results) > limit
+    results = results[:limit]
+    
+    page = Response(content=PROSPECT_LIST.dumps(result.keys(), results), media_type="application/json")
+    if has_more:
+        last = results[-1]
+        page.headers["X-Next-Cursor"] = _encode_cursor(last.score or 0, last.id)
+    return page
+
+
+EXPORT_COLUMNS = [
+    "id", "score", "priority_level", "ai_analysis", "pain_points",
+    "recommended_services", "estimated_deal_value", "growth_signals",
+    "technology_readiness", "last_analyzed", "created_at", "updated_at",
+    "company_id", "company_name", "address", "island", "industry", "website",
+    "phone", "employee_count_estimate", "annual_revenue_estimate",
+    "description", "source", "source_url", "decision_makers"
+]
+
+EXPORT_QUERY = text("""
+    SELECT 
+        p.id,
+        p.score,
+        p.priority_level,
+        p.ai_analysis,
+        p.pain_points,
+        p.recommended_services::text[] AS recommended_services,
+        p.estimated_deal_value,
+        p.growth_signals,
+        p.technology_readiness,
+        p.last_analyzed,
+        p.created_at,
+        p.updated_at,
+        c.id as company_id,
+        c.name as company_name,
+        c.address,
+        c.island::text AS island,
+        c.industry::text AS industry,
+        c.website,
+        c.phone,
+        c.employee_count_estimate,
+        c.annual_revenue_estimate,
+        c.description,
+        c.source,
+        c.source_url,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', dm.id,
+                'name', dm.name,
+                'title', dm.title,
+                'email', dm.email,
+                'phone', dm.phone,
+                'linkedin_url', dm.linkedin_url
+            ) ORDER BY dm.name)
+            FROM decision_makers dm
+            WHERE dm.company_id = c.id
+        ), '[]'::json) AS decision_makers
+    FROM prospects p
+    JOIN companies c ON p.company_id = c.id
+    ORDER BY p.id
+""")
+
+# Rows fetched per server-side cursor round trip and flushed per chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_rows(db: Session) -> Iterator[list]:
+    """Yield export rows in batches from a server-side cursor
+    
+    Uses its own connection so the stream does not depend on the request
+    session staying open while the response is sent.
+    """
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=EXPORT_BATCH_SIZE).execute(EXPORT_QUERY)
+        while True:
+            rows = result.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+
+
+def _export_ndjson(db: Session) -> Iterator[str]:
+    """One JSON object per prospect, one chunk per batch"""
+    for rows in _export_rows(db):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n"
+            for row in rows
+        )
+
+
+def _export_csv(db: Session) -> Iterator[str]:
+    """CSV with list columns and decision makers encoded as JSON"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    
+    for rows in _export_rows(db):
+        for row in rows:
+            writer.writerow([
+                json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+                for value in row
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_prospects(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_db)
+):
+    """Stream every prospect with its company and decision makers
+    
+    Rows are read through a server-side cursor and sent in chunks, so
+    memory stays flat and the first rows go out before the query is done.
+    """
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(db),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=prospects.csv"}
+        )
+    return StreamingResponse(
+        _export_ndjson(db),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=prospects.ndjson"}
+    )
+
+
+DETAIL_QUERY = text("""
+    SELECT 
+        p.id,
+        p.score,
+        p.ai_analysis,
+        p.estimated_deal_value,
+        p.technology_readiness,
+        p.priority_level,
+        p.last_analyzed,
+        p.created_at,
+        p.updated_at,
+        p.pain_points,
+        p.recommended_services,
+        p.growth_signals,
+        c.id as company_id,
+        c.name as company_name,
+        c.address,
+        c.island,
+        c.industry,
+        c.website,
+        c.phone,
+        c.employee_count_estimate,
+        c.annual_revenue_estimate,
+        c.description,
+        c.source,
+        c.source_url,
+        NULL AS founded_date,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', dm.id,
+                'name', dm.name,
+                'title', dm.title,
+                'email', dm.email,
+                'phone', dm.phone,
+                'linkedin_url', dm.linkedin_url
+            ) ORDER BY dm.name)
+            FROM decision_makers dm
+            WHERE dm.company_id = c.id
+        ), '[]'::json) AS decision_makers
+    FROM prospects p
+    JOIN companies c ON p.company_id = c.id
+    WHERE p.id = :prospect_id
+""")
 
 
 @router.get("/{prospect_id}")
@@ -116,136 +294,22 @@ async def get_prospect_by_id(
     prospect_id: int,
     db: Session = Depends(get_db)
 ):
-    """Get a specific prospect by ID using raw SQL"""
+    """Get a specific prospect by ID using raw SQL
+    
+    One round trip: the array columns come with the row and decision
+    makers are aggregated into JSON by the database.
+    """
     
     try:
-        query = """
-            SELECT 
-                p.id,
-                p.score,
-                p.ai_analysis,
-                p.estimated_deal_value,
-                p.technology_readiness,
-                p.priority_level,
-                p.last_analyzed,
-                p.created_at,
-                p.updated_at,
-                c.id as company_id,
-                c.name as company_name,
-                c.address,
-                c.island,
-                c.industry,
-                c.website,
-                c.phone,
-                c.employee_count_estimate,
-                c.annual_revenue_estimate,
-                c.description,
-                c.source,
-                c.source_url
-            FROM prospects p
-            JOIN companies c ON p.company_id = c.id
-            WHERE p.id = :prospect_id
-        """
-        
-        result = db.execute(text(query), {"prospect_id": prospect_id}).fetchone()
+        result = db.execute(DETAIL_QUERY, {"prospect_id": prospect_id})
+        row = result.fetchone()
         
-        if not result:
-            from fastapi import HTTPException
+        if not row:
             raise HTTPException(status_code=404, detail="Prospect not found")
         
-        # Convert result to dictionary
-        prospect = {
-            "id": result[0],
-            "score": result[1],
-            "ai_analysis": result[2],
-            "estimated_deal_value": float(result[3]) if result[3] else 0,
-            "technology_readiness": result[4],
-            "priority_level": result[5],
-            "last_analyzed": result[6].isoformat() if result[6] else None,
-            "created_at": result[7].isoformat() if result[7] else None,
-            "updated_at": result[8].isoformat() if result[8] else None,
-            "company": {
-                "id": result[9],
-                "name": result[10],
-                "address": result[11],
-                "island": result[12],
-                "industry": result[13],
-                "website": result[14],
-                "phone": result[15],
-                "employee_count_estimate": result[16],
-                "annual_revenue_estimate": float(result[17]) if result[17] else 0,
-                "description": result[18],
-                "source": result[19],
-                "source_url": result[20],
-                "founded_date": None
-            },
-            # Use default arrays for now - these are stored as PostgreSQL arrays which are complex to parse
-            "pain_points": ["Outdated technology infrastructure", "Manual processes", "Limited data insights"],
-            "recommended_services": ["Data Analytics", "Custom Chatbots"],
-            "growth_signals": ["Expanding operations", "Hiring new staff"]
-        }
-        
-        # Fetch actual pain points, services, and growth signals from database
-        array_query = """
-            SELECT 
-                p.pain_points,
-                p.recommended_services,
-                p.growth_signals
-            FROM prospects p
-            WHERE p.id = :prospect_id
-        """
-        array_result = db.execute(text(array_query), {"prospect_id": prospect_id}).fetchone()
-        if array_result:
-            if array_result[0]:
-                prospect["pain_points"] = array_result[0]
-            if array_result[1]:
-                # Handle both array and string representations
-                services = array_result[1]
-                if isinstance(services, str):
-                    # Parse PostgreSQL array string format like '{"Data Analytics","Custom Chatbots"}'
-                    if services.startswith('{') and services.endswith('}'):
-                        services = services[1:-1]  # Remove curly braces
-                        # Split by comma and clean up quotes
-                        services = [s.strip().strip('"') for s in services.split(',') if s.strip()]
-                        prospect["recommended_services"] = services
-                    else:
-                        prospect["recommended_services"] = [services]
-                else:
-                    prospect["recommended_services"] = services
-            if array_result[2]:
-                prospect["growth_signals"] = array_result[2]
-        
-        # Fetch decision makers
-        dm_query = """
-            SELECT 
-                dm.id,
-                dm.name,
-                dm.title,
-                dm.email,
-                dm.phone,
-                dm.linkedin_url
-            FROM decision_makers dm
-            WHERE dm.company_id = :company_id
-            ORDER BY dm.name
-        """
-        dm_results = db.execute(text(dm_query), {"company_id": result[9]}).fetchall()
-        
-        prospect["decision_makers"] = [
-            {
-                "id": dm[0],
-                "name": dm[1],
-                "title": dm[2],
-                "email": dm[3],
-                "phone": dm[4],
-                "linkedin_url": dm[5]
-            }
-            for dm in dm_results
-        ]
-        
-        return prospect
+        return Response(content=PROSPECT_DETAIL.dumps_row(result.keys(), row), media_type="application/json")
         
     except Exception as e:
-        from fastapi import HTTPException
         if isinstance(e, HTTPException):
             raise
-        raise HTTPException(status_code=500, detail=f"Error fetching prospect: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching prospect: {str(e)}")
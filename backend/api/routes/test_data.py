@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from models.database import get_db
+from services.analytics_rollups import rollup_refresher
 from models.models import Company, Prospect, IslandEnum, IndustryEnum
 from datetime import datetime
 
@@ -107,6 +108,9 @@ async def create_sample_data(db: Session = Depends(get_db)):
             
             created_companies.append(company.name)
     
+    if created_companies:
+        rollup_refresher.request_refresh()
+    
     return {
         "message": f"Created {len(created_companies)} sample companies with prospects",
         "companies": created_companies
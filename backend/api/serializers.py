@@ -0,0 +1,89 @@
+"""
+Response shapes of the raw-SQL routes (the ORM routes use api.schemas)
+Each serializer names the columns its query must select.
+"""
+
+from services.pg_array import decode_array
+from services.row_serializer import RowSerializer, to_float
+
+COMPANY = {
+    "id": "company_id",
+    "name": "company_name",
+    "address": "address",
+    "island": "island",
+    "industry": "industry",
+    "website": "website",
+    "phone": "phone",
+    "employee_count_estimate": "employee_count_estimate",
+    "annual_revenue_estimate": ("annual_revenue_estimate", to_float),
+    "description": "description",
+    "source": "source",
+    "source_url": "source_url"
+}
+
+PROSPECT_LIST = RowSerializer({
+    "id": "id",
+    "score": "score",
+    "ai_analysis": "ai_analysis",
+    "pain_points": ("pain_points", decode_array),
+    "recommended_services": ("recommended_services", decode_array),
+    "estimated_deal_value": ("estimated_deal_value", to_float),
+    "growth_signals": ("growth_signals", decode_array),
+    "technology_readiness": "technology_readiness",
+    "priority_level": "priority_level",
+    "last_analyzed": "last_analyzed",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "company": COMPANY
+})
+
+PROSPECT_DETAIL = RowSerializer({
+    "id": "id",
+    "score": "score",
+    "ai_analysis": "ai_analysis",
+    "estimated_deal_value": ("estimated_deal_value", to_float),
+    "technology_readiness": "technology_readiness",
+    "priority_level": "priority_level",
+    "last_analyzed": "last_analyzed",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "pain_points": ("pain_points", decode_array),
+    "recommended_services": ("recommended_services", decode_array),
+    "growth_signals": ("growth_signals", decode_array),
+    "company": {**COMPANY, "founded_date": "founded_date"},
+    "decision_makers": "decision_makers"
+})
+
+DASHBOARD_ISLAND = RowSerializer({
+    "island": "island",
+    "prospect_count": "prospect_count",
+    "average_score": ("average_score", float),
+    "high_priority_count": "high_priority_count",
+    "total_pipeline_value": ("total_pipeline_value", float)
+})
+
+DASHBOARD_INDUSTRY = RowSerializer({
+    "industry": "industry",
+    "prospect_count": "prospect_count",
+    "average_score": ("average_score", float),
+    "top_services": "top_services"
+})
+
+DASHBOARD_RECENT = RowSerializer({
+    "id": "id",
+    "score": "score",
+    "priority_level": "priority_level",
+    "estimated_deal_value": ("estimated_deal_value", to_float),
+    "recommended_services": ("recommended_services", decode_array),
+    "company": {
+        "name": "company_name",
+        "island": "island",
+        "industry": "industry"
+    }
+})
+
+TIMELINE = RowSerializer({
+    "date": "date",
+    "new_prospects": "new_prospects",
+    "pipeline_value": ("pipeline_value", float)
+})
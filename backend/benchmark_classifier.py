@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled business classifier vs the old keyword loops
+Usage: python benchmark_classifier.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.business_classifier import classify_business
+
+
+def legacy_determine_island(address):
+    """BaseScraper.determine_island before the shared classifier"""
+    if not address:
+        return "Unknown"
+    address_lower = address.lower()
+    island_keywords = {
+        'Oahu': ['honolulu', 'pearl city', 'kailua', 'kaneohe', 'waipahu', 'mililani', 'aiea', 'ewa'],
+        'Maui': ['kahului', 'kihei', 'lahaina', 'wailuku', 'makawao', 'paia', 'haiku'],
+        'Big Island': ['hilo', 'kona', 'kailua-kona', 'waimea', 'pahoa', 'kamuela'],
+        'Kauai': ['lihue', 'kapaa', 'princeville', 'poipu', 'hanapepe', 'waimea'],
+        'Molokai': ['kaunakakai', 'maunaloa'],
+        'Lanai': ['lanai city']
+    }
+    for island, keywords in island_keywords.items():
+        if any(keyword in address_lower for keyword in keywords):
+            return island
+    return "Unknown"
+
+
+def legacy_determine_industry(description, name=""):
+    """BaseScraper.determine_industry before the shared classifier"""
+    text = f"{description} {name}".lower()
+    industry_keywords = {
+        'Tourism': ['tour', 'tourist', 'visitor', 'sightseeing', 'activity', 'excursion'],
+        'Hospitality': ['hotel', 'resort', 'accommodation', 'lodging', 'bed and breakfast', 'vacation rental'],
+        'Agriculture': ['farm', 'ranch', 'agricultural', 'crop', 'livestock', 'aquaculture'],
+        'Retail': ['store', 'shop', 'boutique', 'mall', 'retail', 'merchandise'],
+        'Healthcare': ['hospital', 'clinic', 'medical', 'health', 'doctor', 'dental', 'pharmacy'],
+        'Real Estate': ['realty', 'property', 'real estate', 'broker', 'development', 'construction'],
+        'Technology': ['software', 'tech', 'it', 'computer', 'digital', 'app', 'saas'],
+        'Food Service': ['restaurant', 'cafe', 'food', 'dining', 'catering', 'bakery'],
+        'Transportation': ['transport', 'shipping', 'freight', 'logistics', 'delivery', 'moving'],
+        'Professional Services': ['consulting', 'accounting', 'legal', 'law', 'marketing', 'design']
+    }
+    for industry, keywords in industry_keywords.items():
+        if any(keyword in text for keyword in keywords):
+            return industry
+    return "Other"
+
+
+# (description, name, address) of typical directory listings
+LISTINGS = [
+    ("Family-owned dental clinic offering cleanings and orthodontics", "Kona Smiles",
+     "75-5591 Palani Rd, Kailua-Kona, HI 96740"),
+    ("Surf lessons and snorkel tours on the north shore", "Aloha Adventures",
+     "66-250 Kamehameha Hwy, Haleiwa, HI 96712"),
+    ("Full-service accounting and tax preparation", "Pacific Tax & Accounting",
+     "1001 Bishop St, Honolulu, HI 96813"),
+    ("Organic farm supplying local restaurants", "Kauai Fresh Farms",
+     "4150 Nuhou St, Lihue, HI 96766"),
+]
+
+# A website's worth of text where the deciding keyword comes late
+PAGE = ("Welcome to our family business. We are proud to serve our community with care. " * 400
+        + "Our pharmacy is located at 1010 Kapiolani Blvd, Honolulu, HI 96814.")
+
+
+def run(iterations: int):
+    cases = {
+        'listing': (
+            lambda: [(legacy_determine_island(address), legacy_determine_industry(description, name))
+                     for description, name, address in LISTINGS],
+            lambda: [classify_business(description, name, address) for description, name, address in LISTINGS]
+        ),
+        'page': (
+            lambda: (legacy_determine_island(PAGE), legacy_determine_industry(PAGE)),
+            lambda: classify_business(PAGE)
+        )
+    }
+
+    print(f"{'case':<10}{'legacy (us)':>14}{'compiled (us)':>16}{'speedup':>10}")
+    # Listing times are per listing
+    for name, (legacy, compiled) in cases.items():
+        number = iterations if name == 'listing' else max(1, iterations // 100)
+        per_call = number * (len(LISTINGS) if name == 'listing' else 1)
+        legacy_time = min(timeit.repeat(legacy, number=number, repeat=5)) / per_call * 1e6
+        compiled_time = min(timeit.repeat(compiled, number=number, repeat=5)) / per_call * 1e6
+        print(f"{name:<10}{legacy_time:>14.1f}{compiled_time:>16.1f}{legacy_time / compiled_time:>9.1f}x")
+
+    result = classify_business(PAGE)
+    print(f"\npage -> {result.island} {result.island_evidence}, {result.industry} {result.industry_evidence}")
+    print(f"legacy page -> {legacy_determine_island(PAGE)}, {legacy_determine_industry(PAGE)}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Parse-throughput benchmark: page_parser backends vs BeautifulSoup(html.parser)
+Usage: python benchmark_page_parser.py [corpus_dir] [iterations]
+
+corpus_dir holds saved pages (*.html); without it a fixed synthetic
+business-site corpus is used so runs are comparable between machines.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from services.page_parser import available_backends, parse_page
+
+LINK_PATTERN = r'contact|about|team|staff'
+
+
+def synthetic_corpus(count=20):
+    """Business home pages of a few sizes with the markup scrapers look for"""
+    pages = []
+    for i in range(count):
+        sections = 5 + (i % 4) * 15
+        ld = json.dumps({"@type": "LocalBusiness", "name": f"Business {i}",
+                         "address": {"streetAddress": f"{100 + i} Kapiolani Blvd",
+                                     "addressLocality": "Honolulu"}})
+        body = ''.join(
+            f'<section><h2>Service {j}</h2><p>We proudly serve Oahu families with care since {1950 + j}. '
+            f'Call us at (808) 555-{1000 + j:04d}.</p>'
+            f'<ul><li><a href="/services/{j}">Service {j}</a></li><li><a href="/about#s{j}">About</a></li></ul>'
+            f'</section>'
+            for j in range(sections)
+        )
+        pages.append(
+            f'<!DOCTYPE html><html><head><title>Business {i}</title>'
+            f'<meta name="description" content="Family-owned Honolulu business number {i}">'
+            f'<script type="application/ld+json">{ld}</script>'
+            f'<style>body {{ font-family: sans-serif; }}</style>'
+            f'<script>window.dataLayer = [];</script></head>'
+            f'<body><nav><a href="/">Home</a><a href="/contact">Contact</a><a href="/team">Our Team</a></nav>'
+            f'{body}<footer><p>&copy; Business {i}</p></footer></body></html>'
+        )
+    return [page.encode('utf-8') for page in pages]
+
+
+def load_corpus(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html')) + glob.glob(os.path.join(directory, '*.htm'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def soup_extract(html):
+    """What the scrapers did per page before the parser backend"""
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text()
+    meta = soup.find('meta', attrs={'name': 'description'})
+    ld = [script.string for script in soup.find_all('script', type='application/ld+json')]
+    links = [a['href'] for a in soup.find_all('a', href=True)
+             if any(word in a['href'].lower() for word in ['contact', 'about', 'team', 'staff'])]
+    return text, meta, ld, links
+
+
+def backend_extract(backend):
+    def extract(html):
+        page = parse_page(html, backend)
+        return page.text(), page.meta_description(), page.json_ld(), page.anchors(LINK_PATTERN)
+    return extract
+
+
+def measure(extract, corpus, iterations):
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for html in corpus:
+            extract(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(corpus, iterations):
+    size_mb = sum(len(html) for html in corpus) / 1e6
+    print(f"{len(corpus)} pages, {size_mb:.2f} MB, best of {iterations}\n")
+    print(f"{'parser':<22}{'pages/s':>10}{'MB/s':>10}{'speedup':>10}")
+
+    baseline = measure(soup_extract, corpus, iterations)
+    cases = [('bs4 html.parser (old)', baseline)]
+    cases += [(backend, measure(backend_extract(backend), corpus, iterations)) for backend in available_backends()]
+
+    for name, elapsed in cases:
+        print(f"{name:<22}{len(corpus) / elapsed:>10.0f}{size_mb / elapsed:>10.2f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    corpus_dir = sys.argv[1] if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]) else None
+    iterations = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 5
+    corpus = load_corpus(corpus_dir) if corpus_dir else synthetic_corpus()
+    if not corpus:
+        sys.exit(f"No .html files in {corpus_dir}")
+    run(corpus, iterations)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the prospect list response (500 rows)
+Usage: python benchmark_row_serializer.py [rows] [iterations]
+
+Compares the old per-row dict building plus FastAPI's jsonable_encoder and
+JSONResponse rendering with PROSPECT_LIST, with orjson and with the stdlib
+fallback encoder. Rows are synthetic tuples shaped like the list query.
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+
+from services import row_serializer
+from services.pg_array import decode_array
+from api.serializers import PROSPECT_LIST
+
+COLUMNS = [
+    "id", "score", "ai_analysis", "pain_points", "recommended_services",
+    "estimated_deal_value", "growth_signals", "technology_readiness",
+    "priority_level", "last_analyzed", "created_at", "updated_at",
+    "company_id", "company_name", "address", "island", "industry", "website",
+    "phone", "employee_count_estimate", "annual_revenue_estimate",
+    "description", "source", "source_url"
+]
+
+
+def synthetic_rows(count):
+    now = datetime(2025, 6, 1, 12, 0, 0)
+    return [
+        (
+            i, 40 + i % 60,
+            f"Business {i} is a family-owned Honolulu company with growing reporting needs.",
+            ["Manual reporting", "No online booking"],
+            '{"Data Analytics","Custom Chatbots"}',
+            Decimal(25000 + i), ["Hiring"], "Medium", ["High", "Medium", "Low"][i % 3],
+            now - timedelta(days=i % 30), now - timedelta(days=90), now - timedelta(days=i % 7),
+            i, f"Business {i}", f"{100 + i} Kapiolani Blvd, Honolulu, HI", "Oahu", "Tourism",
+            f"https://business{i}.example.com", "(808) 555-0100", 25 + i % 200, Decimal(2500000),
+            "Google rating: 4.5/5 (312 reviews)", "google_places", f"https://maps.google.com/?cid={i}"
+        )
+        for i in range(count)
+    ]
+
+
+def old_response(rows):
+    """Positional dicts as the route built them, rendered like JSONResponse"""
+    prospects = [
+        {
+            "id": row[0],
+            "score": row[1],
+            "ai_analysis": row[2],
+            "pain_points": decode_array(row[3]),
+            "recommended_services": decode_array(row[4]),
+            "estimated_deal_value": float(row[5]) if row[5] else 0,
+            "growth_signals": decode_array(row[6]),
+            "technology_readiness": row[7],
+            "priority_level": row[8],
+            "last_analyzed": row[9].isoformat() if row[9] else None,
+            "created_at": row[10].isoformat() if row[10] else None,
+            "updated_at": row[11].isoformat() if row[11] else None,
+            "company": {
+                "id": row[12],
+                "name": row[13],
+                "address": row[14],
+                "island": row[15],
+                "industry": row[16],
+                "website": row[17],
+                "phone": row[18],
+                "employee_count_estimate": row[19],
+                "annual_revenue_estimate": float(row[20]) if row[20] else 0,
+                "description": row[21],
+                "source": row[22],
+                "source_url": row[23]
+            }
+        }
+        for row in rows
+    ]
+    return json.dumps(jsonable_encoder(prospects), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_response(rows):
+    orjson, row_serializer.orjson = row_serializer.orjson, None
+    try:
+        return PROSPECT_LIST.dumps(COLUMNS, rows)
+    finally:
+        row_serializer.orjson = orjson
+
+
+def measure(render, rows, iterations):
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows, iterations):
+    print(f"{len(rows)} rows, best of {iterations}\n")
+    print(f"{'serializer':<30}{'rows/s':>12}{'ms/response':>14}{'speedup':>10}")
+
+    baseline = measure(old_response, rows, iterations)
+    cases = [('dicts + jsonable_encoder (old)', baseline)]
+    cases.append(('RowSerializer + json', measure(stdlib_response, rows, iterations)))
+    if row_serializer.orjson is not None:
+        cases.append(('RowSerializer + orjson', measure(lambda r: PROSPECT_LIST.dumps(COLUMNS, r), rows, iterations)))
+
+    for name, elapsed in cases:
+        print(f"{name:<30}{len(rows) / elapsed:>12.0f}{elapsed * 1000:>14.2f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    run(synthetic_rows(count), iterations)
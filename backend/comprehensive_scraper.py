@@ -6,8 +6,6 @@ Comprehensive web scraper to extract ALL business data from real Hawaii sources
 import os
 import sys
 import requests
-from bs4 import BeautifulSoup
-import json
 import re
 from datetime import datetime
 from sqlalchemy import text
@@ -19,6 +17,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models.database import SessionLocal
 from services.claude_analyzer import ClaudeBusinessAnalyzer
+from services.business_classifier import classify_business
+from services.page_parser import parse_page
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -48,7 +48,7 @@ class HawaiiBusinessScraper:
                     return f"({numbers[:3]}) {numbers[3:6]}-{numbers[6:]}"
         return None
     
-    def extract_address(self, text, soup):
+    def extract_address(self, text, page):
         """Extract Hawaii address from text"""
         # Look for Hawaii addresses
         hawaii_patterns = [
@@ -62,9 +62,8 @@ class HawaiiBusinessScraper:
                 return match.group().strip()
         
         # Look in structured data
-        for script in soup.find_all('script', type='application/ld+json'):
+        for data in page.json_ld():
             try:
-                data = json.loads(script.string)
                 if isinstance(data, dict) and 'address' in data:
                     addr = data['address']
                     if isinstance(addr, dict):
@@ -81,42 +80,11 @@ class HawaiiBusinessScraper:
     
     def determine_island(self, address, website_text):
         """Determine which Hawaii island based on address/content"""
-        text = (address or '') + ' ' + website_text
-        text = text.lower()
-        
-        if any(word in text for word in ['honolulu', 'waikiki', 'pearl', 'kaneohe', 'kailua']):
-            return 'Oahu'
-        elif any(word in text for word in ['kahului', 'lahaina', 'kihei', 'wailea', 'haleakala']):
-            return 'Maui'
-        elif any(word in text for word in ['kona', 'hilo', 'volcano', 'waimea', 'big island']):
-            return 'Big Island'
-        elif any(word in text for word in ['lihue', 'kapaa', 'princeville', 'poipu']):
-            return 'Kauai'
-        else:
-            return 'Oahu'  # Default
+        return classify_business(address, website_text).island or 'Oahu'  # Default
     
     def determine_industry(self, name, description, website_text):
         """Determine industry from business info"""
-        text = (name + ' ' + description + ' ' + website_text).lower()
-        
-        if any(word in text for word in ['dental', 'dentist', 'orthodont', 'teeth', 'braces']):
-            return 'Healthcare'
-        elif any(word in text for word in ['restaurant', 'dining', 'food', 'kitchen', 'menu', 'cuisine']):
-            return 'Food Service'
-        elif any(word in text for word in ['hotel', 'resort', 'inn', 'lodging', 'accommodation']):
-            return 'Hospitality'
-        elif any(word in text for word in ['tour', 'luau', 'adventure', 'excursion', 'activity']):
-            return 'Tourism'
-        elif any(word in text for word in ['cpa', 'accounting', 'tax', 'bookkeeping', 'financial']):
-            return 'Professional Services'
-        elif any(word in text for word in ['condo', 'rental', 'property', 'real estate']):
-            return 'Real Estate'
-        elif any(word in text for word in ['law', 'legal', 'attorney', 'lawyer']):
-            return 'Professional Services'
-        elif any(word in text for word in ['retail', 'shop', 'store', 'shopping']):
-            return 'Retail'
-        else:
-            return 'Other'
+        return classify_business(name, description, website_text).industry or 'Other'
     
     def estimate_employees(self, website_text, industry):
         """Estimate employee count based on website content"""
@@ -156,40 +124,40 @@ class HawaiiBusinessScraper:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Fast parser: only text, meta, JSON-LD and paragraphs are needed
+            page = parse_page(response.content)
             
             # Get all text content
-            full_text = soup.get_text()
+            full_text = page.text()
             
             # Extract structured data
             phone = self.extract_phone(full_text)
-            address = self.extract_address(full_text, soup)
+            address = self.extract_address(full_text, page)
             
             # Get description from meta or content
             description = ""
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                description = meta_desc['content']
+            meta_desc = page.meta_description()
+            paragraphs = page.paragraphs()
+            if meta_desc:
+                description = meta_desc
             else:
                 # Find the most relevant paragraph
-                paragraphs = soup.find_all('p')
-                for p in paragraphs:
-                    p_text = p.get_text().strip()
+                for p_text in paragraphs:
                     if len(p_text) > 100 and any(word in p_text.lower() for word in name.lower().split()):
                         description = p_text[:300]
                         break
             
             if not description:
                 # Fallback to first substantial paragraph
-                for p in paragraphs:
-                    p_text = p.get_text().strip()
+                for p_text in paragraphs:
                     if len(p_text) > 50:
                         description = p_text[:300]
                         break
             
-            # Determine location and industry
-            island = self.determine_island(address, full_text)
-            industry = self.determine_industry(name, description, full_text)
+            # Determine location and industry in one scan of the page
+            classification = classify_business(name, description, address, full_text)
+            island = classification.island or 'Oahu'
+            industry = classification.industry or 'Other'
             employee_count = self.estimate_employees(full_text, industry)
             
             return {
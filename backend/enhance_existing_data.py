@@ -6,7 +6,6 @@ Enhance existing business data with comprehensive AI analysis and real decision
 import os
 import sys
 import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 from sqlalchemy import text
@@ -18,6 +17,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models.database import SessionLocal
 from services.claude_analyzer import ClaudeBusinessAnalyzer
+from services.analysis_cache import input_fingerprint
+from services.page_parser import parse_page
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ class EnhancedBusinessAnalyzer:
         })
         self.analyzer = ClaudeBusinessAnalyzer()
     
-    def extract_decision_makers(self, url, company_name, soup, full_text):
+    def extract_decision_makers(self, url, company_name, page, full_text):
         """Extract real decision makers from website"""
         decision_makers = []
         
@@ -47,10 +48,8 @@ class EnhancedBusinessAnalyzer:
         ]
         
         # Look for structured data (JSON-LD, microdata)
-        for script in soup.find_all('script', type='application/ld+json'):
+        for data in page.json_ld():
             try:
-                import json
-                data = json.loads(script.string)
                 if isinstance(data, dict):
                     # Look for person or employee data
                     if data.get('@type') == 'Person':
@@ -88,21 +87,19 @@ class EnhancedBusinessAnalyzer:
         
         # Look for "About Us", "Team", "Staff" pages
         team_links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href'].lower()
-            text = link.get_text().lower()
-            if any(word in href or word in text for word in ['about', 'team', 'staff', 'doctor', 'meet', 'biography']):
-                if href.startswith('http'):
-                    team_links.append(href)
-                elif href.startswith('/'):
-                    team_links.append(urljoin(url, href))
+        for href, _ in page.anchors(r'about|team|staff|doctor|meet|biography'):
+            href = href.lower()
+            if href.startswith('http'):
+                team_links.append(href)
+            elif href.startswith('/'):
+                team_links.append(urljoin(url, href))
         
         # Scrape team pages for more detailed info
         for team_url in team_links[:3]:  # Limit to 3 team pages
             try:
                 team_response = self.session.get(team_url, timeout=10)
-                team_soup = BeautifulSoup(team_response.content, 'html.parser')
-                team_text = team_soup.get_text()
+                # One line per text node, as the name/title scan below expects
+                team_text = parse_page(team_response.content).text()
                 
                 # Look for name-title combinations in team pages
                 lines = team_text.split('\n')
@@ -378,26 +375,54 @@ Format as detailed JSON with comprehensive explanations for each section.
             'technology_readiness': 'Medium'
         }
 
-def enhance_all_existing_businesses():
-    """Enhance all existing businesses with comprehensive analysis and decision makers"""
+def enhance_all_existing_businesses(force=False):
+    """Enhance businesses with comprehensive analysis and decision makers
+    
+    Only companies with a prospect flagged needs_analysis are processed,
+    highest priority first; force=True (--all) re-analyzes every company.
+    """
     analyzer = EnhancedBusinessAnalyzer()
     db = SessionLocal()
     
     try:
-        # Get all companies
+        # Get companies whose analysis inputs changed since the last run
         companies = db.execute(text("""
-            SELECT id, name, website, industry, island, employee_count_estimate, 
-                   description, phone, address
-            FROM companies
-        """)).fetchall()
+            SELECT c.id, c.name, c.website, c.industry, c.island, c.employee_count_estimate, 
+                   c.description, c.phone, c.address, p.analysis_fingerprint
+            FROM companies c
+            JOIN prospects p ON p.company_id = c.id
+            WHERE p.needs_analysis OR :force
+            ORDER BY CASE p.priority_level
+                         WHEN 'High' THEN 0
+                         WHEN 'Medium' THEN 1
+                         WHEN 'Low' THEN 3
+                         ELSE 2
+                     END,
+                     COALESCE(p.score, 0) DESC
+        """), {'force': force}).fetchall()
         
         logger.info(f"Enhancing {len(companies)} businesses...")
         
         for company in companies:
-            company_id, name, website, industry, island, employee_count, description, phone, address = company
+            company_id, name, website, industry, island, employee_count, description, phone, address, stored_fingerprint = company
             
             logger.info(f"\nEnhancing {name}...")
             
+            fingerprint = input_fingerprint({
+                'name': name,
+                'island': island,
+                'industry': industry,
+                'description': description,
+                'employee_count_estimate': employee_count,
+                'website': website
+            })
+            if fingerprint == stored_fingerprint and not force:
+                logger.info(f"Inputs unchanged for {name}, skipping")
+                db.execute(text("UPDATE prospects SET needs_analysis = FALSE WHERE company_id = :id"),
+                           {'id': company_id})
+                db.commit()
+                continue
+            
             if not website:
                 logger.warning(f"No website for {name}, skipping")
                 continue
@@ -407,11 +432,11 @@ def enhance_all_existing_businesses():
                 response = analyzer.session.get(website, timeout=15)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                full_text = soup.get_text()
+                page = parse_page(response.content)
+                full_text = page.text()
                 
                 # Extract decision makers
-                decision_makers = analyzer.extract_decision_makers(website, name, soup, full_text)
+                decision_makers = analyzer.extract_decision_makers(website, name, page, full_text)
                 logger.info(f"  Found {len(decision_makers)} decision makers")
                 
                 # Create comprehensive business data
@@ -445,6 +470,8 @@ def enhance_all_existing_businesses():
                         growth_signals = :growth_signals,
                         technology_readiness = :tech_readiness,
                         estimated_deal_value = :deal_value,
+                        analysis_fingerprint = :fingerprint,
+                        needs_analysis = FALSE,
                         last_analyzed = NOW()
                     WHERE company_id = :company_id
                 """), {
@@ -455,6 +482,7 @@ def enhance_all_existing_businesses():
                     'growth_signals': growth_signals_array,
                     'tech_readiness': analysis.get('technology_readiness', 'Medium'),
                     'deal_value': analysis.get('estimated_deal_value', 50000),
+                    'fingerprint': fingerprint,
                     'company_id': company_id
                 })
                 
@@ -500,4 +528,4 @@ def enhance_all_existing_businesses():
         db.close()
 
 if __name__ == "__main__":
-    enhance_all_existing_businesses()
\ No newline at end of file
+    enhance_all_existing_businesses(force='--all' in sys.argv)
\ No newline at end of file
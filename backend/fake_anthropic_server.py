@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages and Message Batches endpoints
+Usage: python fake_anthropic_server.py [port] [batch_seconds]
+
+Run it, then set ANTHROPIC_BASE_URL=http://localhost:8089 to exercise the
+concurrent engine and bulk batch mode without calling the real API.
+Batches end batch_seconds (default 5) after they are created.
+"""
+
+import sys
+import json
+import time
+import uuid
+import hashlib
+import threading
+from datetime import datetime, timezone, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_SECONDS = 5.0
+
+batches = {}
+batches_lock = threading.Lock()
+
+
+def fake_message(params):
+    """Message with a deterministic analysis of the business in params"""
+    prompt = params['messages'][0]['content']
+    name = prompt.split('\n', 1)[0].replace('Company: ', '')
+    score = int(hashlib.md5(name.encode('utf-8')).hexdigest(), 16) % 101
+    analysis = {
+        "score": score,
+        "summary": f"{name} is a fake analysis for local testing.",
+        "pain_points": ["Manual reporting"],
+        "recommended_services": ["Data Analytics"],
+        "estimated_deal_value": 25000,
+        "growth_signals": [],
+        "technology_readiness": "Medium",
+        "outreach_strategy": "Introductory call",
+        "decision_makers": ["Owner"]
+    }
+    if params.get('tools'):
+        content = [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                    "name": params['tools'][0]['name'], "input": analysis}]
+    else:
+        content = [{"type": "text", "text": json.dumps(analysis)}]
+    system = params.get('system', '')
+    system_chars = len(system) if isinstance(system, str) else sum(len(block['text']) for block in system)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get('model'),
+        "content": content,
+        "stop_reason": "tool_use" if params.get('tools') else "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": 150,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": system_chars // 4
+        }
+    }
+
+
+def batch_object(batch, base_url):
+    now = time.time()
+    ended = now - batch['created'] >= BATCH_SECONDS
+    count = len(batch['requests'])
+
+    def iso(seconds):
+        return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+    return {
+        "id": batch['id'],
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else count,
+            "succeeded": count if ended else 0,
+            "errored": 0, "canceled": 0, "expired": 0
+        },
+        "created_at": iso(batch['created']),
+        "expires_at": iso(batch['created'] + timedelta(days=1).total_seconds()),
+        "ended_at": iso(batch['created'] + BATCH_SECONDS) if ended else None,
+        "cancel_initiated_at": None,
+        "archived_at": None,
+        "results_url": f"{base_url}/v1/messages/batches/{batch['id']}/results" if ended else None
+    }
+
+
+class FakeAnthropicHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        if self.path.startswith('/v1/messages/batches'):
+            batch = {'id': f"msgbatch_{uuid.uuid4().hex[:24]}", 'created': time.time(), 'requests': body['requests']}
+            with batches_lock:
+                batches[batch['id']] = batch
+            return self._json(batch_object(batch, self._base_url()))
+
+        if self.path.startswith('/v1/messages'):
+            return self._json(fake_message(body))
+
+        self._json({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+
+    def do_GET(self):
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        # v1/messages/batches/<id>[/results]
+        with batches_lock:
+            batch = batches.get(parts[3]) if len(parts) >= 4 and parts[2] == 'batches' else None
+        if batch is None:
+            return self._json({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+
+        if len(parts) == 5 and parts[4] == 'results':
+            lines = [
+                json.dumps({"custom_id": request['custom_id'],
+                            "result": {"type": "succeeded", "message": fake_message(request['params'])}})
+                for request in batch['requests']
+            ]
+            return self._send('\n'.join(lines).encode('utf-8'), 'application/binary')
+
+        self._json(batch_object(batch, self._base_url()))
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host')}"
+
+    def _json(self, payload, status=200):
+        self._send(json.dumps(payload).encode('utf-8'), 'application/json', status)
+
+    def _send(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"{self.command} {self.path} {args[1] if len(args) > 1 else ''}")
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    BATCH_SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else BATCH_SECONDS
+    print(f"Fake Anthropic API on http://localhost:{port} (batches end after {BATCH_SECONDS:.0f}s)")
+    ThreadingHTTPServer(('', port), FakeAnthropicHandler).serve_forever()
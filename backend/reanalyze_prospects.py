@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Re-analyze prospects with score 0 using Claude API
+Re-analyze prospects flagged needs_analysis using Claude API
 """
 
 import os
@@ -10,103 +10,179 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.orm import joinedload
+
 from models.database import SessionLocal
-from models.models import Prospect, Company
+from models.models import Prospect
 from services.claude_analyzer import ClaudeBusinessAnalyzer
+from services.analysis_cache import input_fingerprint
+from services.prospect_scorer import ProspectScorer
+
+# Prospects whose heuristic fit score is below this skip Claude (0 = off),
+# as in the collector's DataProcessor
+FIT_SCORE_THRESHOLD = int(os.getenv('FIT_SCORE_THRESHOLD', 50))
+
+# Same effect as DatabaseService.update_prospect(..., fingerprint): the
+# prospect stays clean until its analysis inputs change
+MARK_ANALYZED = text("""
+    UPDATE prospects SET analysis_fingerprint = :fingerprint, needs_analysis = FALSE
+    WHERE id = :id
+""")
+
+# Same effect as DatabaseService.record_fit_scores: a fingerprint is only
+# passed for prospects below the threshold, which are then marked clean
+RECORD_FIT_SCORE = text("""
+    UPDATE prospects SET fit_score = :fit_score,
+        needs_analysis = needs_analysis AND :fingerprint IS NULL,
+        analysis_fingerprint = COALESCE(:fingerprint, analysis_fingerprint)
+    WHERE id = :id
+""")
+
+# High and Medium priority first, then never-scored, then Low, as in
+# DatabaseService.get_unanalyzed_prospects
+PRIORITY_ORDER = text("""
+    CASE prospects.priority_level
+        WHEN 'High' THEN 0 WHEN 'Medium' THEN 1 WHEN 'Low' THEN 3 ELSE 2
+    END
+""")
+
+def analysis_inputs(company):
+    """Fingerprinted fields of a company, as the collector reads them from the database"""
+    return {
+        'name': company.name,
+        'island': getattr(company.island, 'value', company.island),
+        'industry': getattr(company.industry, 'value', company.industry),
+        'description': company.description,
+        'employee_count_estimate': company.employee_count_estimate,
+        'website': company.website
+    }
 
-def map_to_valid_services(services):
-    """Map Claude's service recommendations to valid enum values"""
-    valid_services = []
-    for service in services:
-        service_lower = service.lower()
-        if 'data analytics' in service_lower or 'analyze' in service_lower:
-            valid_services.append('Data Analytics')
-        elif 'chatbot' in service_lower or 'customer service' in service_lower:
-            valid_services.append('Custom Chatbots')
-        elif 'cto' in service_lower or 'technology leadership' in service_lower:
-            valid_services.append('Fractional CTO')
-        elif 'hubspot' in service_lower or 'digital marketing' in service_lower or 'marketing' in service_lower:
-            valid_services.append('HubSpot Digital Marketing')
+def prefilter(db, jobs):
+    """Drop low-fit jobs before spending Claude calls on them
     
-    # Remove duplicates and ensure we have valid services
-    valid_services = list(set(valid_services))
-    if not valid_services:
-        valid_services = ['Data Analytics']  # Default recommendation
+    Mirrors DataProcessor._prefilter: every job's fit score is stored, and
+    those below FIT_SCORE_THRESHOLD are marked clean under their
+    fingerprint until their inputs change.
+    """
+    if not jobs or not FIT_SCORE_THRESHOLD:
+        return jobs
+        
+    scores = ProspectScorer().score([company_data for _, company_data, _ in jobs])
+    keep = scores >= FIT_SCORE_THRESHOLD
+    db.execute(RECORD_FIT_SCORE, [
+        {'id': prospect_id, 'fit_score': int(score), 'fingerprint': None if passed else fingerprint}
+        for (prospect_id, _, fingerprint), score, passed in zip(jobs, scores, keep)
+    ])
     
-    return valid_services
+    skipped = len(jobs) - int(keep.sum())
+    if skipped:
+        print(f"Fit score pre-filter skipped {skipped} of {len(jobs)} prospects below {FIT_SCORE_THRESHOLD}")
+    return [job for job, passed in zip(jobs, keep) if passed]
 
-def reanalyze_prospects():
-    """Re-analyze all prospects with score 0"""
-    db = SessionLocal()
-    analyzer = ClaudeBusinessAnalyzer()
+def load_prospects():
+    """(prospect_id, company_data, fingerprint) for every prospect that needs analysis
     
+    Like the collector's sweep, prospects whose inputs still hash to their
+    stored fingerprint are cleared, and the rest go through prefilter.
+    """
+    db = SessionLocal()
     try:
-        # Get prospects with score 0
-        prospects = db.query(Prospect).filter(Prospect.score == 0).all()
-        print(f"Found {len(prospects)} prospects to re-analyze")
+        rows = (
+            db.query(Prospect, literal_column('prospects.analysis_fingerprint'))
+            .options(joinedload(Prospect.company))
+            .filter(text('prospects.needs_analysis'))
+            .order_by(PRIORITY_ORDER, func.coalesce(Prospect.score, 0).desc(), Prospect.created_at.desc())
+            .all()
+        )
         
-        success_count = 0
-        for prospect in prospects:
-            company = prospect.company
-            print(f"\nAnalyzing {company.name}...")
+        jobs = []
+        unchanged = []
+        for prospect, stored_fingerprint in rows:
+            inputs = analysis_inputs(prospect.company)
+            fingerprint = input_fingerprint(inputs)
+            if fingerprint == stored_fingerprint:
+                unchanged.append({'id': prospect.id, 'fingerprint': fingerprint})
+                continue
+            jobs.append((prospect.id, {**inputs, 'growth_signals': prospect.growth_signals or []}, fingerprint))
+            
+        if unchanged:
+            print(f"Skipped {len(unchanged)} prospects whose analysis inputs are unchanged")
+            db.execute(MARK_ANALYZED, unchanged)
             
-            try:
-                # Convert company to dictionary for analyzer
-                company_data = {
-                    'name': company.name,
-                    'island': company.island,
-                    'industry': company.industry,
-                    'description': company.description,
-                    'employee_count_estimate': company.employee_count_estimate,
-                    'website': company.website,
-                    'growth_signals': []
-                }
-                
-                # Get AI analysis
-                analysis = analyzer.analyze_business(company_data)
-                
-                if analysis and analysis.get('score', 0) > 0:
-                    # Update prospect
-                    prospect.score = analysis['score']
-                    prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis pending')
-                    prospect.pain_points = analysis['pain_points']
-                    prospect.recommended_services = map_to_valid_services(analysis['recommended_services'])
-                    prospect.estimated_deal_value = analysis['estimated_deal_value']
-                    prospect.growth_signals = analysis.get('growth_signals', [])
-                    prospect.technology_readiness = analysis['technology_readiness']
-                    prospect.priority_level = analysis['priority_level']
-                    prospect.last_analyzed = datetime.now()
-                    
-                    db.commit()
-                    success_count += 1
-                    print(f"✓ Successfully analyzed - Score: {analysis['score']}")
-                else:
-                    print(f"✗ Analysis failed or returned score 0")
-                    
-            except Exception as e:
-                print(f"✗ Error analyzing {company.name}: {str(e)}")
-                db.rollback()
-                # Try to at least update the score and analysis
-                try:
-                    if 'analysis' in locals() and analysis and analysis.get('score', 0) > 0:
-                        prospect.score = analysis['score'] 
-                        prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis completed')
-                        prospect.priority_level = analysis['priority_level']
-                        prospect.technology_readiness = analysis['technology_readiness']
-                        prospect.estimated_deal_value = analysis['estimated_deal_value']
-                        prospect.last_analyzed = datetime.now()
-                        # Skip the problematic fields for now
-                        db.commit()
-                        print(f"  Partially updated with score: {analysis['score']}")
-                except Exception as e2:
-                    print(f"  Failed to do partial update: {e2}")
-                    db.rollback()
-                
-        print(f"\n{success_count}/{len(prospects)} prospects successfully re-analyzed")
+        jobs = prefilter(db, jobs)
+        db.commit()
+        return jobs
+    finally:
+        db.close()
+
+def save_analysis(prospect_id, analysis, fingerprint):
+    """Write one analysis and its input fingerprint in its own short transaction"""
+    db = SessionLocal()
+    try:
+        prospect = db.get(Prospect, prospect_id)
+        prospect.score = analysis['score']
+        prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis pending')
+        prospect.pain_points = analysis['pain_points']
+        # Already coerced to service_enum values by the analyzer
+        prospect.recommended_services = analysis['recommended_services']
+        prospect.estimated_deal_value = analysis['estimated_deal_value']
+        prospect.growth_signals = analysis.get('growth_signals', [])
+        prospect.technology_readiness = analysis['technology_readiness']
+        prospect.priority_level = analysis['priority_level']
+        prospect.last_analyzed = datetime.now()
+        db.execute(MARK_ANALYZED, {'id': prospect_id, 'fingerprint': fingerprint})
         
+        try:
+            db.commit()
+        except Exception as e:
+            print(f"  Full update failed ({e}), saving score and analysis only")
+            db.rollback()
+            # Skip the problematic fields
+            prospect = db.get(Prospect, prospect_id)
+            prospect.score = analysis['score']
+            prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis completed')
+            prospect.priority_level = analysis['priority_level']
+            prospect.technology_readiness = analysis['technology_readiness']
+            prospect.estimated_deal_value = analysis['estimated_deal_value']
+            prospect.last_analyzed = datetime.now()
+            db.execute(MARK_ANALYZED, {'id': prospect_id, 'fingerprint': fingerprint})
+            db.commit()
     finally:
         db.close()
 
+def reanalyze_prospects(bulk=True):
+    """Re-analyze every prospect flagged needs_analysis that passes the fit pre-filter
+    
+    No database session is held while Claude works. With bulk (the
+    default) the analyses run as one Message Batches job; --sync uses the
+    concurrent API path instead. Results are saved as they come back.
+    """
+    analyzer = ClaudeBusinessAnalyzer()
+    jobs = load_prospects()
+    print(f"Found {len(jobs)} prospects to re-analyze")
+    
+    businesses = [company_data for _, company_data, _ in jobs]
+    analyses = analyzer.iter_analyze_batch(businesses) if bulk else analyzer.iter_analyze(businesses)
+    
+    success_count = 0
+    for index, analysis in analyses:
+        prospect_id, company_data, fingerprint = jobs[index]
+        
+        if not analysis or analysis.get('score', 0) <= 0:
+            print(f"✗ {company_data['name']}: analysis failed or returned score 0")
+            continue
+            
+        try:
+            save_analysis(prospect_id, analysis, fingerprint)
+            success_count += 1
+            print(f"✓ {company_data['name']} - Score: {analysis['score']}")
+        except Exception as e:
+            print(f"✗ Error saving {company_data['name']}: {str(e)}")
+            
+    print(f"\n{success_count}/{len(jobs)} prospects successfully re-analyzed")
+    print(analyzer.usage_summary())
+
 if __name__ == "__main__":
     print("Re-analyzing prospects with Claude AI...")
-    reanalyze_prospects()
\ No newline at end of file
+    reanalyze_prospects(bulk='--sync' not in sys.argv)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import os
+import time
+import logging
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from anthropic import Anthropic
+
+from .analysis_schema import AnalysisParseError
+
+logger = logging.getLogger(__name__)
+
+# Result of a Message Batches entry that produced a usable message
+SUCCEEDED = 'succeeded'
+
+
+class BatchAnalysisJob:
+    """Run ClaudeBusinessAnalyzer requests through the Message Batches API
+
+    Batches cost half as much as individual requests and do not count
+    against the per-minute rate limits, but results only come back once a
+    batch has ended (usually within an hour, at most 24). Meant for
+    overnight sweeps where throughput and cost matter more than latency.
+
+    Point base_url (or ANTHROPIC_BASE_URL) at a local fake endpoint such as
+    backend/fake_anthropic_server.py to exercise it without the real API.
+    """
+
+    def __init__(self, analyzer, poll_interval: Optional[float] = None,
+                 max_requests: Optional[int] = None, base_url: Optional[str] = None):
+        self.analyzer = analyzer
+        self.poll_interval = poll_interval or float(os.getenv('CLAUDE_BATCH_POLL_SECONDS', 60))
+        self.max_requests = max_requests or int(os.getenv('CLAUDE_BATCH_MAX_REQUESTS', 10000))
+        self.client = Anthropic(api_key=analyzer.api_key, base_url=base_url or os.getenv('ANTHROPIC_BASE_URL'))
+
+    def iter_analyze(self, businesses: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index, analysis) pairs: cached ones first, then each batch's results
+
+        All batches are submitted before polling so they are processed
+        side by side. Replies that fail validation are collected and
+        resubmitted as a smaller batch, up to the analyzer's parse_retries.
+        Requests that fail, expire or cannot be submitted are logged and
+        left out rather than yielded as the analyzer's default (score 0)
+        analysis, so callers cannot save a failure over a good analysis and
+        those prospects stay flagged for the next sweep.
+        """
+        pending = []
+        for index, business in enumerate(businesses):
+            cached = self.analyzer._cached_analysis(business)
+            if cached:
+                yield index, cached
+            else:
+                pending.append(index)
+
+        for attempt in range(self.analyzer.parse_retries + 1):
+            if not pending:
+                return
+            if attempt:
+                logger.info(f"Resubmitting {len(pending)} analyses that could not be parsed")
+            unparsed = []
+            yield from self._run(businesses, pending, unparsed)
+            pending = unparsed
+
+        for index in pending:
+            logger.warning(f"Giving up on the analysis of {businesses[index].get('name')}: reply never validated")
+
+    def _run(self, businesses: List[Dict[str, Any]], indexes: List[int],
+             unparsed: List[int]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Submit indexes in batches of max_requests and stream their results
+
+        Indexes whose reply did not validate are appended to unparsed
+        instead of being yielded.
+        """
+        chunks = [indexes[i:i + self.max_requests] for i in range(0, len(indexes), self.max_requests)]
+        submitted = [(self._submit(businesses, chunk), chunk) for chunk in chunks]
+
+        for batch_id, chunk in submitted:
+            if batch_id is None:
+                continue
+
+            returned = set()
+            for index, analysis in self._results(batch_id, businesses):
+                returned.add(index)
+                if analysis is None:
+                    unparsed.append(index)
+                else:
+                    yield index, analysis
+            for index in chunk:
+                if index not in returned:
+                    logger.warning(f"Batch {batch_id} returned no result for {businesses[index].get('name')}")
+
+    def _submit(self, businesses: List[Dict[str, Any]], indexes: List[int]) -> Optional[str]:
+        """Create one batch for the given businesses and return its id"""
+        requests = [
+            {'custom_id': f"business-{index}", 'params': self.analyzer._build_request(businesses[index])}
+            for index in indexes
+        ]
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+            logger.info(f"Submitted analysis batch {batch.id} with {len(requests)} requests")
+            return batch.id
+        except Exception as e:
+            logger.error(f"Error submitting analysis batch of {len(requests)} requests: {str(e)}")
+            return None
+
+    def _results(self, batch_id: str,
+                 businesses: List[Dict[str, Any]]) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Wait for a batch to end, then stream its results
+
+        Unparseable replies come back as None; requests that errored,
+        expired or were canceled are logged and skipped.
+        """
+        self._wait(batch_id)
+
+        for entry in self.client.messages.batches.results(batch_id):
+            index = int(entry.custom_id.rsplit('-', 1)[1])
+            result = entry.result
+            if result.type != SUCCEEDED:
+                logger.warning(f"Batch request for {businesses[index].get('name')} {result.type}: "
+                               f"{getattr(result, 'error', '')}")
+                continue
+
+            message = result.message
+            self.analyzer._record_usage(getattr(message, 'usage', None))
+            try:
+                analysis = self.analyzer._build_analysis(message)
+            except AnalysisParseError as e:
+                self.analyzer._record_parse_failure(businesses[index], e)
+                yield index, None
+                continue
+            self.analyzer._store_analysis(businesses[index], analysis)
+            yield index, analysis
+
+    def _wait(self, batch_id: str):
+        """Poll until the batch has ended; transient polling errors are retried"""
+        while True:
+            try:
+                batch = self.client.messages.batches.retrieve(batch_id)
+                counts = batch.request_counts
+                if batch.processing_status == 'ended':
+                    logger.info(f"Batch {batch_id} ended: {counts.succeeded} succeeded, {counts.errored} errored, "
+                                f"{counts.expired} expired, {counts.canceled} canceled")
+                    return
+                logger.info(f"Batch {batch_id} {batch.processing_status}: {counts.processing} processing")
+            except Exception as e:
+                logger.warning(f"Error polling batch {batch_id}: {str(e)}")
+            time.sleep(self.poll_interval)
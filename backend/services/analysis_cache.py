@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'analysis_cache.db'
+)
+
+# Business fields that feed _create_analysis_prompt and key the cache.
+# Fields an analysis writes back onto the prospect (growth_signals) are
+# left out: they would change the key after the first analysis, so a
+# re-analysis could never hit.
+PROMPT_FIELDS = [
+    'name', 'island', 'industry', 'description',
+    'employee_count_estimate', 'website'
+]
+
+# Company fields whose change warrants re-analysing a prospect. Growth
+# signals are left out because analyses overwrite them.
+FINGERPRINT_FIELDS = [
+    'name', 'island', 'industry', 'description',
+    'employee_count_estimate', 'website'
+]
+
+
+def input_fingerprint(business_data: Dict[str, Any]) -> str:
+    """Hash of a prospect's analysis inputs, ignoring case and whitespace
+
+    Stored on prospects.analysis_fingerprint so sweeps can tell a material
+    change from a rewrite that leaves the inputs the same.
+    """
+    payload = {}
+    for field in FINGERPRINT_FIELDS:
+        value = business_data.get(field)
+        if value is not None:
+            # Scraped values arrive as strings, stored ones may not (12 vs "12")
+            value = ' '.join(str(value).lower().split()) or None
+        payload[field] = value
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """Persistent cache of Claude analyses keyed by a hash of the prompt inputs"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 30 * 24 * 3600,
+                 max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses(accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(business_data: Dict[str, Any], model: str, prompt_version: str) -> str:
+        """Content hash of the prompt inputs, model and prompt version"""
+        payload = {field: business_data.get(field) for field in PROMPT_FIELDS}
+        payload['model'] = model
+        payload['prompt_version'] = prompt_version
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached analysis unless it has expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis, created_at FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if not row or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, analysis: Dict[str, Any]):
+        """Store an analysis, evicting expired and least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO analyses (key, analysis, created_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+            """, (key, json.dumps(analysis, default=str), now, now))
+
+            self._conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute("""
+                DELETE FROM analyses WHERE key IN (
+                    SELECT key FROM analyses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self._conn.commit()
+
+
+_cache: Optional[AnalysisCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Get the process-wide analysis cache, or None if ANALYSIS_CACHE_ENABLED is off"""
+    global _cache
+
+    if os.getenv('ANALYSIS_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = AnalysisCache(
+                    path=os.getenv('ANALYSIS_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    ttl=float(os.getenv('ANALYSIS_CACHE_TTL_DAYS', 30)) * 24 * 3600,
+                    max_entries=int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', 10000))
+                )
+            except Exception as e:
+                logger.warning(f"Analysis cache disabled: {str(e)}")
+                return None
+        return _cache
@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import queue
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple, Iterator, AsyncIterator
+
+from anthropic import AsyncAnthropic, RateLimitError
+
+from .analysis_schema import AnalysisParseError
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """Request, token and concurrency budget shared by in-flight analyses
+
+    Budgets are enforced over a sliding one-minute window. The number of
+    requests allowed in flight is halved on every 429 and grows back by one
+    after each run of successful requests (AIMD).
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, max_in_flight: int, requests_per_minute: int, tokens_per_minute: int):
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self.limit = max_in_flight
+        self.in_flight = 0
+        self.pause_until = 0.0
+        self._successes = 0
+        self._window = deque()  # [started_at, tokens] per request
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, tokens: int) -> list:
+        """Wait until a request of `tokens` fits every budget, then claim it"""
+        tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._condition:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] > self.WINDOW_SECONDS:
+                    self._window.popleft()
+
+                waits = []
+                if now < self.pause_until:
+                    waits.append(self.pause_until - now)
+                if len(self._window) >= self.requests_per_minute or \
+                        sum(entry[1] for entry in self._window) + tokens > self.tokens_per_minute:
+                    waits.append(self._window[0][0] + self.WINDOW_SECONDS - now)
+
+                if not waits and self.in_flight < self.limit:
+                    entry = [now, tokens]
+                    self._window.append(entry)
+                    self.in_flight += 1
+                    return entry
+
+                # Woken early by release(); otherwise re-check once a budget frees up
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=max(waits) if waits else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, entry: list, used_tokens: Optional[int] = None,
+                      rate_limited: bool = False, retry_after: Optional[float] = None):
+        """Return a claimed slot, correcting its token count and adapting to 429s"""
+        async with self._condition:
+            self.in_flight -= 1
+            if used_tokens is not None:
+                entry[1] = used_tokens
+
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self.pause_until = max(self.pause_until, time.monotonic() + (retry_after or 0))
+                logger.warning(f"Rate limited; in-flight limit now {self.limit}, "
+                               f"pausing {retry_after or 0:.1f}s")
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_in_flight:
+                    self.limit += 1
+                    self._successes = 0
+
+            self._condition.notify_all()
+
+
+class ConcurrentAnalysisEngine:
+    """Run ClaudeBusinessAnalyzer requests concurrently within API rate limits
+
+    Point base_url at a local fake Messages endpoint to exercise the engine
+    without calling the real API.
+    """
+
+    def __init__(self, analyzer, max_in_flight: Optional[int] = None,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 base_url: Optional[str] = None, max_rate_limit_retries: int = 5):
+        self.analyzer = analyzer
+        self.max_in_flight = max_in_flight or int(os.getenv('CLAUDE_MAX_IN_FLIGHT', 5))
+        self.requests_per_minute = requests_per_minute or int(os.getenv('CLAUDE_REQUESTS_PER_MINUTE', 50))
+        self.tokens_per_minute = tokens_per_minute or int(os.getenv('CLAUDE_TOKENS_PER_MINUTE', 40000))
+        self.base_url = base_url or os.getenv('ANTHROPIC_BASE_URL')
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+    async def analyze_stream(self, businesses: List[Dict[str, Any]]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index, analysis) pairs in completion order"""
+        limiter = AdaptiveRateLimiter(self.max_in_flight, self.requests_per_minute, self.tokens_per_minute)
+        # The limiter owns backoff, so the SDK must not retry on its own
+        client = AsyncAnthropic(api_key=self.analyzer.api_key, base_url=self.base_url, max_retries=0)
+
+        async def run(index: int, business: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+            return index, await self._analyze_one(client, limiter, business)
+
+        tasks = [asyncio.ensure_future(run(i, business)) for i, business in enumerate(businesses)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await client.close()
+
+    def iter_analyze(self, businesses: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Blocking wrapper around analyze_stream for synchronous callers
+        
+        Closing the generator early (a break, an exception in the caller or
+        garbage collection) cancels the outstanding requests and waits for
+        the worker thread to exit.
+        """
+        results = queue.Queue()
+        done = object()
+        started = threading.Event()
+        worker = {}
+
+        async def consume():
+            worker['loop'] = asyncio.get_running_loop()
+            worker['task'] = asyncio.current_task()
+            started.set()
+            async for item in self.analyze_stream(businesses):
+                results.put(item)
+
+        def run():
+            try:
+                asyncio.run(consume())
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                results.put(e)
+            finally:
+                started.set()
+                results.put(done)
+
+        thread = threading.Thread(target=run, name='claude-analysis', daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            started.wait()
+            if thread.is_alive() and 'task' in worker:
+                try:
+                    worker['loop'].call_soon_threadsafe(worker['task'].cancel)
+                except RuntimeError:
+                    pass  # The loop closed in the meantime
+            thread.join()
+
+    async def _analyze_one(self, client: AsyncAnthropic, limiter: AdaptiveRateLimiter,
+                           business_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze one business, backing off on 429s and retrying other errors
+        
+        Replies that fail validation are re-requested up to the analyzer's
+        parse_retries, for this business only.
+        """
+        cached = self.analyzer._cached_analysis(business_data)
+        if cached:
+            return cached
+
+        request = self.analyzer._build_request(business_data)
+        estimate = self._estimate_tokens(request)
+        rate_limited = 0
+        failures = 0
+        parse_failures = 0
+
+        while True:
+            entry = await limiter.acquire(estimate)
+            try:
+                message = await client.messages.create(**request)
+            except RateLimitError as e:
+                retry_after = self._retry_after(e) or min(60, 2 ** rate_limited)
+                await limiter.release(entry, rate_limited=True, retry_after=retry_after)
+                rate_limited += 1
+                if rate_limited > self.max_rate_limit_retries:
+                    logger.error(f"Giving up on {business_data.get('name')} after {rate_limited} rate limits")
+                    return self.analyzer._get_default_analysis()
+                continue
+            except Exception as e:
+                await limiter.release(entry, used_tokens=0)
+                failures += 1
+                if failures >= 3:
+                    logger.error(f"Error analyzing business {business_data.get('name')}: {str(e)}")
+                    return self.analyzer._get_default_analysis()
+                # Same schedule as the synchronous path: exponential, 4-10s
+                await asyncio.sleep(min(10, max(4, 2 ** failures)))
+                continue
+
+            usage = getattr(message, 'usage', None)
+            self.analyzer._record_usage(usage)
+            used = usage.input_tokens + usage.output_tokens if usage else None
+            await limiter.release(entry, used_tokens=used)
+            try:
+                analysis = self.analyzer._build_analysis(message)
+            except AnalysisParseError as e:
+                self.analyzer._record_parse_failure(business_data, e)
+                parse_failures += 1
+                if parse_failures > self.analyzer.parse_retries:
+                    return self.analyzer._get_default_analysis()
+                continue
+            self.analyzer._store_analysis(business_data, analysis)
+            return analysis
+
+    def _estimate_tokens(self, request: Dict[str, Any]) -> int:
+        """Rough token reservation: ~4 characters per input token plus max output"""
+        system = request.get('system', '')
+        if not isinstance(system, str):
+            system = ''.join(block['text'] for block in system)
+        chars = len(system) + len(json.dumps(request.get('tools', []))) + \
+            sum(len(m['content']) for m in request['messages'])
+        return chars // 4 + request['max_tokens']
+
+    def _retry_after(self, error: RateLimitError) -> Optional[float]:
+        """Seconds to wait from a 429's retry-after header, if present"""
+        try:
+            return float(error.response.headers.get('retry-after'))
+        except (AttributeError, TypeError, ValueError):
+            return None
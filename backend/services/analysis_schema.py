@@ -0,0 +1,180 @@
+"""
+Structured output for Claude business analyses
+Claude is forced to answer through the record_analysis tool, whose input
+schema mirrors the prospect columns, and the tool input is checked and
+coerced by a validator compiled from that same schema.
+"""
+
+import re
+import json
+from typing import Any, Callable, Dict, List, Tuple
+
+# Values of service_enum in database/schema.sql
+SERVICES = ['Data Analytics', 'Custom Chatbots', 'Fractional CTO', 'HubSpot Digital Marketing']
+
+# Phrasings Claude uses for each service, for answers that do not echo the
+# enum exactly (e.g. from the text fallback). The first match wins, so the
+# more specific services come first.
+SERVICE_ALIASES = [
+    ('HubSpot Digital Marketing', r'hubspot|marketing|\bcrm\b'),
+    ('Custom Chatbots', r'chat ?bot|customer service|virtual assistant|conversational'),
+    ('Fractional CTO', r'\bcto\b|technology (leadership|strategy)|chief technology'),
+    ('Data Analytics', r'data|analy[st]|business intelligence|reporting|dashboard')
+]
+
+ANALYSIS_TOOL = {
+    "name": "record_analysis",
+    "description": "Record the consulting-fit analysis of one Hawaii business.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "score": {"type": "integer", "minimum": 0, "maximum": 100,
+                      "description": "Fit and opportunity for LeniLani Consulting"},
+            "summary": {"type": "string", "description": "2-3 sentence executive summary"},
+            "pain_points": {"type": "array", "items": {"type": "string"},
+                            "description": "Specific pain points"},
+            "recommended_services": {"type": "array", "items": {"type": "string", "enum": SERVICES}},
+            "estimated_deal_value": {"type": "number", "minimum": 0, "description": "Annual value in USD"},
+            "growth_signals": {"type": "array", "items": {"type": "string"}},
+            "technology_readiness": {"type": "string", "enum": ["Low", "Medium", "High"]},
+            "outreach_strategy": {"type": "string",
+                                  "description": "Personalized approach considering Hawaii culture "
+                                                 "and business environment"},
+            "decision_makers": {"type": "array", "items": {"type": "string"},
+                                "description": "Likely titles of the decision makers"}
+        },
+        "required": ["score", "summary", "pain_points", "recommended_services",
+                     "estimated_deal_value", "technology_readiness"]
+    }
+}
+
+
+class AnalysisParseError(ValueError):
+    """A response did not contain a usable analysis"""
+
+
+class AnalysisValidator:
+    """Checks and coerces analyses against a JSON schema
+
+    The schema is compiled once into a coercion function per property, so
+    validating a response is a single pass over its fields. Enum strings
+    match case-insensitively and enum arrays (recommended_services) are
+    mapped through SERVICE_ALIASES, dropping values that match nothing.
+    """
+
+    def __init__(self, schema: Dict[str, Any], aliases: List[Tuple[str, str]] = SERVICE_ALIASES):
+        self._aliases = [(value, re.compile(pattern, re.IGNORECASE)) for value, pattern in aliases]
+        self._required = set(schema.get('required', []))
+        self._fields: List[Tuple[str, Callable[[Any], Any], Any]] = [
+            (name, self._compile(prop), self._empty(prop)) for name, prop in schema['properties'].items()
+        ]
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        """Coerced copy of data; raises AnalysisParseError if it cannot conform"""
+        if not isinstance(data, dict):
+            raise AnalysisParseError(f"expected an object, got {type(data).__name__}")
+
+        result = {}
+        for name, coerce, empty in self._fields:
+            value = data.get(name)
+            if value is None:
+                if name in self._required:
+                    raise AnalysisParseError(f"missing {name}")
+                result[name] = empty
+                continue
+            try:
+                result[name] = coerce(value)
+            except (TypeError, ValueError) as e:
+                raise AnalysisParseError(f"{name}: {e}")
+        return result
+
+    def _compile(self, prop: Dict[str, Any]) -> Callable[[Any], Any]:
+        kind = prop.get('type')
+        if kind in ('integer', 'number'):
+            return self._number(int if kind == 'integer' else float, prop.get('minimum'), prop.get('maximum'))
+        if kind == 'string':
+            return self._enum(prop['enum']) if 'enum' in prop else self._string
+        if kind == 'array':
+            items = prop.get('items', {})
+            if 'enum' in items:
+                return self._enum_list(items['enum'])
+            return lambda value: [self._string(item) for item in self._as_list(value) if item is not None]
+        raise ValueError(f"unsupported schema type {kind}")
+
+    @staticmethod
+    def _empty(prop: Dict[str, Any]) -> Any:
+        return [] if prop.get('type') == 'array' else None
+
+    @staticmethod
+    def _number(cast, minimum, maximum) -> Callable[[Any], Any]:
+        def coerce(value):
+            if isinstance(value, bool):
+                raise TypeError("boolean is not a number")
+            if isinstance(value, str):
+                value = value.replace('$', '').replace(',', '').strip()
+            number = cast(float(value))
+            if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+                raise ValueError(f"{number} outside [{minimum}, {maximum}]")
+            return number
+        return coerce
+
+    @staticmethod
+    def _string(value: Any) -> str:
+        if isinstance(value, (dict, list)):
+            raise TypeError(f"expected a string, got {type(value).__name__}")
+        return str(value).strip()
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]:
+        return value if isinstance(value, list) else [value]
+
+    def _enum(self, values: List[str]) -> Callable[[Any], str]:
+        lookup = {value.lower(): value for value in values}
+
+        def coerce(value):
+            try:
+                return lookup[self._string(value).lower()]
+            except KeyError:
+                raise ValueError(f"{value!r} is not one of {values}")
+        return coerce
+
+    def _enum_list(self, values: List[str]) -> Callable[[Any], List[str]]:
+        lookup = {value.lower(): value for value in values}
+        aliases = [(value, pattern) for value, pattern in self._aliases if value in values]
+
+        def coerce(value):
+            result = []
+            for item in self._as_list(value):
+                text = self._string(item)
+                match = lookup.get(text.lower()) or next(
+                    (service for service, pattern in aliases if pattern.search(text)), None
+                )
+                if match and match not in result:
+                    result.append(match)
+            return result
+        return coerce
+
+
+validator = AnalysisValidator(ANALYSIS_TOOL['input_schema'])
+
+
+def parse_analysis_message(message: Any) -> Dict[str, Any]:
+    """Validated analysis from a Messages API response
+
+    Reads the record_analysis tool call; a reply that is a bare JSON object
+    in a text block is accepted too. Raises AnalysisParseError otherwise.
+    """
+    texts = []
+    for block in getattr(message, 'content', None) or []:
+        if block.type == 'tool_use' and block.name == ANALYSIS_TOOL['name']:
+            return validator.validate(block.input)
+        if block.type == 'text':
+            texts.append(block.text)
+
+    text = ''.join(texts).strip()
+    if not text:
+        raise AnalysisParseError("no record_analysis call in response")
+    try:
+        return validator.validate(json.loads(text))
+    except json.JSONDecodeError as e:
+        raise AnalysisParseError(f"reply is neither a tool call nor JSON: {e}")
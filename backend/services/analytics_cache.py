@@ -0,0 +1,110 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Redis is optional; the cache then only sees local writes
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Shared with data-collectors DatabaseService, which bumps it after refreshing the rollups
+VERSION_KEY = 'hbi:analytics:version'
+
+
+class AnalyticsCache:
+    """In-process cache for assembled analytics payloads
+
+    Entries are dropped when the analytics rollups are refreshed and are
+    never served older than max_staleness seconds. Refreshes in this
+    process invalidate locally; when REDIS_URL is set, a version counter in
+    Redis also picks up refreshes by other API workers and the data
+    collectors. While Redis is unreachable nothing is cached.
+    """
+
+    def __init__(self, max_staleness: float = 60.0, redis_url: Optional[str] = None,
+                 version_ttl: float = 1.0, retry_after: float = 30.0):
+        self.max_staleness = max_staleness
+        self.version_ttl = version_ttl
+        self.retry_after = retry_after
+        self._entries: Dict[str, Tuple[Any, Tuple[int, int], float]] = {}
+        self._local_version = 0
+        self._shared_version = 0
+        self._shared_read_at = float('-inf')
+        self._redis_down_until = float('-inf')
+        self._lock = threading.Lock()
+
+        self._redis = None
+        if redis_url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.warning(f"Analytics cache running without Redis: {str(e)}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached payload for key, recomputing it if stale or invalidated"""
+        version = self._version()
+        if version is None:
+            # Other processes' changes cannot be seen while Redis is down
+            return compute()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] == version and now - entry[2] < self.max_staleness:
+                return entry[0]
+
+        payload = compute()
+
+        with self._lock:
+            self._entries[key] = (payload, version, now)
+        return payload
+
+    def invalidate(self):
+        """Drop every cached payload here and, via Redis, in other processes
+
+        Called once the rollups behind the payloads have been refreshed
+        (see RollupRefresher), not straight after a write.
+        """
+        with self._lock:
+            self._local_version += 1
+            self._entries.clear()
+
+        if self._redis is not None and time.monotonic() >= self._redis_down_until:
+            try:
+                self._redis.incr(VERSION_KEY)
+            except Exception as e:
+                self._redis_down_until = time.monotonic() + self.retry_after
+                logger.warning(f"Could not publish analytics invalidation: {str(e)}")
+
+    def _version(self) -> Optional[Tuple[int, int]]:
+        """Combined local and shared version of the data, or None while Redis is down
+
+        The shared version is read from Redis at most once per version_ttl
+        seconds, and after a Redis error not again for retry_after seconds,
+        so a Redis outage costs one timeout rather than one per request.
+        """
+        if self._redis is None:
+            return self._local_version, 0
+
+        now = time.monotonic()
+        if now < self._redis_down_until:
+            return None
+        if now - self._shared_read_at >= self.version_ttl:
+            try:
+                self._shared_version = int(self._redis.get(VERSION_KEY) or 0)
+                self._shared_read_at = now
+            except Exception as e:
+                self._redis_down_until = now + self.retry_after
+                logger.warning(f"Analytics cache bypassed, Redis unavailable: {str(e)}")
+                return None
+        return self._local_version, self._shared_version
+
+
+analytics_cache = AnalyticsCache(
+    max_staleness=float(os.getenv('ANALYTICS_CACHE_MAX_STALENESS', 60)),
+    redis_url=os.getenv('REDIS_URL')
+)
@@ -0,0 +1,89 @@
+"""
+Refresh of the prospect_rollups materialized view from the API process
+The data-collectors scheduler refreshes the view after collection runs,
+but API deployments do not run the scheduler, and prospect and company
+edits made through the API change the aggregates too. A background thread
+refreshes the view instead, so the analytics routes only ever read it.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+
+from models.database import SessionLocal
+from services.analytics_cache import analytics_cache
+
+logger = logging.getLogger(__name__)
+
+# Held for the refresh transaction, so API workers skip a refresh another
+# worker is already running instead of repeating it
+TRY_LOCK = text("SELECT pg_try_advisory_xact_lock(hashtext('prospect_rollups'))")
+REFRESH = text("REFRESH MATERIALIZED VIEW CONCURRENTLY prospect_rollups")
+
+
+class RollupRefresher:
+    """Background thread keeping prospect_rollups current
+
+    The view is refreshed every interval seconds, and sooner once
+    request_refresh() is called after a write, but never more than once
+    per min_interval so a burst of writes costs one refresh. The analytics
+    cache is invalidated after each refresh, so cached payloads are rebuilt
+    from the new rollups rather than cached again from the old ones.
+    """
+
+    def __init__(self, interval: float = 600.0, min_interval: float = 30.0):
+        self.interval = interval
+        self.min_interval = min_interval
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the refresh thread if it is not running yet"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='rollup-refresher', daemon=True)
+                self._thread.start()
+
+    def request_refresh(self):
+        """Ask for a refresh soon, e.g. after prospects or companies changed"""
+        self.start()
+        self._wake.set()
+
+    def refresh(self) -> bool:
+        """Refresh the view now; returns False if it failed or another worker holds it"""
+        db = SessionLocal()
+        try:
+            if not db.execute(TRY_LOCK).scalar():
+                db.rollback()
+                return False
+            # CONCURRENTLY keeps readers on the previous contents meanwhile
+            db.execute(REFRESH)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not refresh analytics rollups: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+        analytics_cache.invalidate()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.refresh()
+            # Writes during the pause are covered by one refresh after it
+            time.sleep(self.min_interval)
+
+
+rollup_refresher = RollupRefresher(
+    interval=float(os.getenv('ANALYTICS_ROLLUP_REFRESH_MINUTES', 10)) * 60,
+    min_interval=float(os.getenv('ANALYTICS_ROLLUP_MIN_INTERVAL', 30))
+)
@@ -0,0 +1,180 @@
+import string
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+# Keyword tables shared by every scraper. The first label with a match wins.
+ISLAND_KEYWORDS = {
+    'Oahu': ['oahu', 'honolulu', 'waikiki', 'pearl city', 'pearl harbor', 'kailua', 'kaneohe',
+             'waipahu', 'mililani', 'aiea', 'ewa beach', 'kapolei', 'diamond head'],
+    'Maui': ['maui', 'kahului', 'kihei', 'lahaina', 'wailuku', 'makawao', 'paia', 'haiku',
+             'wailea', 'haleakala', 'upcountry', 'road to hana'],
+    'Big Island': ['big island', 'hawaii island', 'hilo', 'kona', 'kailua-kona', 'waimea',
+                   'pahoa', 'kamuela', 'volcano', 'mauna kea'],
+    'Kauai': ['kauai', 'lihue', 'kapaa', 'princeville', 'poipu', 'hanapepe', 'hanalei',
+              'napali', 'waimea canyon'],
+    'Molokai': ['molokai', 'kaunakakai', 'maunaloa'],
+    'Lanai': ['lanai', 'lanai city']
+}
+
+INDUSTRY_KEYWORDS = {
+    'Tourism': ['tour', 'tourist', 'visitor', 'sightseeing', 'activity', 'activities',
+                'excursion', 'luau', 'adventure'],
+    'Hospitality': ['hotel', 'resort', 'inn', 'accommodation', 'lodging', 'bed and breakfast',
+                    'vacation rental'],
+    'Agriculture': ['farm', 'ranch', 'agricultural', 'agriculture', 'crop', 'livestock',
+                    'aquaculture'],
+    'Retail': ['store', 'shop', 'boutique', 'mall', 'retail', 'merchandise', 'shopping'],
+    'Healthcare': ['hospital', 'clinic', 'medical', 'health', 'healthcare', 'doctor', 'dental',
+                   'dentist', 'teeth', 'orthodontist', 'orthodontics', 'pharmacy'],
+    'Real Estate': ['realty', 'property', 'properties', 'real estate', 'broker', 'development',
+                    'construction', 'condo', 'rental'],
+    'Technology': ['software', 'tech', 'technology', 'it services', 'information technology',
+                   'computer', 'digital', 'app', 'saas'],
+    'Food Service': ['restaurant', 'cafe', 'food', 'dining', 'catering', 'bakery', 'kitchen',
+                     'menu', 'cuisine'],
+    'Transportation': ['transport', 'transportation', 'shipping', 'freight', 'logistics',
+                       'delivery', 'moving'],
+    'Professional Services': ['consulting', 'accounting', 'legal', 'law', 'marketing', 'design',
+                              'cpa', 'tax', 'bookkeeping', 'financial', 'attorney', 'lawyer']
+}
+
+# Punctuation separates words, so "kailua-kona" is matched as a phrase and
+# "tech-savvy" still matches "tech"; apostrophes and the okina are dropped
+# so "O'ahu" and "Kaua\u02bbi" match "oahu" and "kauai"
+_SEPARATORS = str.maketrans({char: ' ' for char in string.punctuation})
+_SEPARATORS.update({ord("'"): None, ord('\u2019'): None, ord('\u02bb'): None})
+
+# The same mapping for ASCII text as a byte table, which also lowercases
+# and translates several times faster than the str mapping above
+_ASCII_PUNCTUATION = ''.join(char for char in string.punctuation if char != "'").encode()
+_ASCII_SEPARATORS = bytes.maketrans(
+    _ASCII_PUNCTUATION + string.ascii_uppercase.encode(),
+    b' ' * len(_ASCII_PUNCTUATION) + string.ascii_lowercase.encode()
+)
+
+
+class Classification(NamedTuple):
+    island: Optional[str]
+    industry: Optional[str]
+    island_evidence: List[str]
+    industry_evidence: List[str]
+
+
+class BusinessClassifier:
+    """Island and industry classifier compiled into hash lookups
+
+    Each text is lowercased and tokenized once; whole words (and their
+    plurals) are matched against one keyword set covering both tables, so
+    "it" no longer matches inside "with". Multi-word keywords are checked
+    only when their first word occurs, and a word that only appears inside
+    a matched phrase ("waimea" in "waimea canyon") does not count on its
+    own. As with the keyword loops this replaced, the first label in table
+    order with a matching keyword wins.
+    """
+
+    def __init__(self, islands: Dict[str, List[str]] = ISLAND_KEYWORDS,
+                 industries: Dict[str, List[str]] = INDUSTRY_KEYWORDS):
+        # (label, keywords) in table order
+        self._islands = self._compile(islands)
+        self._industries = self._compile(industries)
+        keywords = set().union(*(keywords for _, keywords in self._islands + self._industries))
+
+        # Surface form (keyword or plural) -> keyword, for single-token keywords
+        self._words: Dict[str, str] = {}
+        # Single-token keyword -> its surface forms
+        self._forms_of: Dict[str, FrozenSet[str]] = {}
+        # First word -> multi-word keywords starting with it, each with its
+        # leading words, their space-padded text, the forms of its last word
+        # and the keywords among its words
+        self._phrases: Dict[str, List[Tuple[str, FrozenSet[str], str, FrozenSet[str], List[str]]]] = {}
+        for keyword in sorted(keywords):
+            if ' ' in keyword:
+                words = keyword.split()
+                inner = [word for word in words if word in keywords]
+                self._phrases.setdefault(words[0], []).append((
+                    keyword, frozenset(words[:-1]), ' ' + ' '.join(words[:-1]) + ' ',
+                    frozenset(self._forms(words[-1])), inner
+                ))
+            else:
+                self._forms_of[keyword] = frozenset(self._forms(keyword))
+                for form in self._forms(keyword):
+                    self._words.setdefault(form, keyword)
+        self._word_set = frozenset(self._words)
+        self._phrase_heads = frozenset(self._phrases)
+
+    @classmethod
+    def _compile(cls, table: Dict[str, List[str]]) -> List[Tuple[str, FrozenSet[str]]]:
+        """Keywords of each label, tokenized like the texts they are matched in"""
+        return [
+            (label, frozenset(' '.join(cls._words_of(keyword)) for keyword in keywords))
+            for label, keywords in table.items()
+        ]
+
+    def classify(self, *texts: Optional[str]) -> Classification:
+        """Classify one or more texts (e.g. name, description, address) in one scan"""
+        found = self._match(' '.join(filter(None, texts)))
+        island, island_evidence = self._first(self._islands, found)
+        industry, industry_evidence = self._first(self._industries, found)
+        return Classification(island, industry, island_evidence, industry_evidence)
+
+    @staticmethod
+    def _first(table: List[Tuple[str, FrozenSet[str]]], found: Set[str]) -> Tuple[Optional[str], List[str]]:
+        """Earliest label of table with a keyword in found, and those keywords"""
+        if found:
+            for label, keywords in table:
+                if not keywords.isdisjoint(found):
+                    return label, sorted(found & keywords)
+        return None, []
+
+    @staticmethod
+    def _words_of(text: str) -> List[str]:
+        """Lowercased words of text, split on punctuation"""
+        if text.isascii():
+            return text.encode().translate(_ASCII_SEPARATORS, b"'").decode().split()
+        return text.lower().translate(_SEPARATORS).split()
+
+    def _match(self, text: str) -> Set[str]:
+        """Distinct keywords occurring in text as whole words"""
+        words = self._words_of(text)
+        tokens = set(words)
+
+        found = set(map(self._words.__getitem__, tokens & self._word_set))
+
+        # Phrases are only searched for when all of their words occur, and
+        # only forms that occur as tokens are counted
+        joined = None
+        for head in tokens & self._phrase_heads:
+            for phrase, leading, prefix, last, inner in self._phrases[head]:
+                if not leading <= tokens:
+                    continue
+                endings = last & tokens
+                if not endings:
+                    continue
+                if joined is None:
+                    joined = ' ' + ' '.join(words) + ' '
+                occurrences = 0
+                for ending in endings:
+                    occurrences += joined.count(f'{prefix}{ending} ')
+                if not occurrences:
+                    continue
+                found.add(phrase)
+                for word in inner:
+                    if word in found:
+                        count = 0
+                        for form in self._forms_of[word] & tokens:
+                            count += joined.count(f' {form} ')
+                        if count <= occurrences:
+                            found.discard(word)
+
+        return found
+
+    @staticmethod
+    def _forms(keyword: str) -> List[str]:
+        return [keyword, keyword + 's', keyword + 'es']
+
+
+classifier = BusinessClassifier()
+
+
+def classify_business(*texts: Optional[str]) -> Classification:
+    """Classify texts with the shared, precompiled classifier"""
+    return classifier.classify(*texts)
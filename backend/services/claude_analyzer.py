@@ -1,19 +1,65 @@
 import os
-import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterator, AsyncIterator
 from anthropic import Anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 from dotenv import load_dotenv
 
+from .analysis_cache import AnalysisCache, get_analysis_cache
+from .analysis_engine import ConcurrentAnalysisEngine
+from .analysis_batch import BatchAnalysisJob
+from .analysis_schema import ANALYSIS_TOOL, AnalysisParseError, parse_analysis_message
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = """You are an expert business analyst specializing in the Hawaii market. \
+You understand the unique challenges of island businesses, from tourism dependency \
+to logistics complexities. You evaluate businesses for AI and technology consulting \
+opportunities, always considering local culture and the importance of building \
+relationships in Hawaii's tight-knit business community. Provide insights that \
+demonstrate deep understanding of each business's specific challenges and opportunities."""
+
+# Identical for every business, so it is sent as part of the cached prefix
+# and each user message carries only the business itself
+ANALYSIS_INSTRUCTIONS = """Each user message describes one Hawaii business. Analyze it for \
+potential AI consulting opportunities.
+
+LeniLani Consulting offers:
+1. Data Analytics - Transform business data into actionable insights
+2. Custom Chatbots - AI-powered customer service and engagement
+3. Fractional CTO - Strategic technology leadership
+4. HubSpot Digital Marketing - Marketing automation and CRM
+
+Record your analysis with the record_analysis tool. Recommend only the services above.
+
+Consider Hawaii-specific factors:
+- Tourism dependency and seasonality
+- Inter-island business challenges
+- Local vs mainland competition
+- Aloha spirit in business culture
+- Sustainability and environmental consciousness
+
+Score higher for:
+- Growing businesses (hiring, expanding)
+- Tourism/hospitality needing analytics or automation
+- Companies with outdated technology
+- Businesses expanding to multiple islands
+- High employee count (>50)"""
+
+# Usage fields reported by the Messages API, summed per analyzer
+USAGE_FIELDS = ['input_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens', 'output_tokens']
+
 
 class ClaudeBusinessAnalyzer:
     """Analyze Hawaii businesses using Claude API for intelligent insights"""
     
+    # Bump whenever the prompt or response handling changes so cached
+    # analyses from the old prompt are not reused
+    PROMPT_VERSION = '3'
+    
     def __init__(self):
         self.api_key = os.getenv('CLAUDE_API_KEY') or os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
@@ -21,135 +67,142 @@ class ClaudeBusinessAnalyzer:
             
         self.client = Anthropic(api_key=self.api_key)
         self.model = "claude-3-haiku-20240307"  # Using Haiku for cost efficiency
+        self.cache = get_analysis_cache()
+        # Mark the system prompt and instructions as a cacheable prefix.
+        # Prefixes shorter than the model's minimum are simply not cached.
+        self.prompt_caching = os.getenv('CLAUDE_PROMPT_CACHING', 'true').lower() == 'true'
+        self.usage = dict.fromkeys(USAGE_FIELDS + ['requests', 'parse_failures'], 0)
+        self._usage_lock = threading.Lock()
+        # Responses that fail validation are re-requested, for that business
+        # only, up to this many times before falling back to the default
+        self.parse_retries = int(os.getenv('CLAUDE_PARSE_RETRIES', 2))
         
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def analyze_business(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a single business and generate insights"""
-        try:
-            prompt = self._create_analysis_prompt(business_data)
-            
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1500,
-                temperature=0.7,
-                system=self._get_system_prompt(),
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Parse the response
-            analysis = self._parse_analysis_response(message.content[0].text)
+        """Analyze a single business and generate insights
+        
+        Businesses whose prompt inputs are unchanged since a previous
+        analysis are answered from the cache without calling the API.
+        """
+        cached = self._cached_analysis(business_data)
+        if cached:
+            return cached
             
-            return {
-                'score': analysis.get('score', 0),
-                'ai_analysis': analysis.get('summary', ''),
-                'pain_points': analysis.get('pain_points', []),
-                'recommended_services': analysis.get('recommended_services', []),
-                'estimated_deal_value': analysis.get('estimated_deal_value', 0),
-                'growth_signals': analysis.get('growth_signals', []),
-                'technology_readiness': analysis.get('technology_readiness', 'Unknown'),
-                'priority_level': self._determine_priority(analysis.get('score', 0)),
-                'outreach_strategy': analysis.get('outreach_strategy', '')
-            }
+        try:
+            for attempt in range(self.parse_retries + 1):
+                message = self.client.messages.create(**self._build_request(business_data))
+                self._record_usage(getattr(message, 'usage', None))
+                try:
+                    analysis = self._build_analysis(message)
+                except AnalysisParseError as e:
+                    self._record_parse_failure(business_data, e)
+                    continue
+                self._store_analysis(business_data, analysis)
+                return analysis
+            return self._get_default_analysis()
             
         except Exception as e:
             logger.error(f"Error analyzing business {business_data.get('name')}: {str(e)}")
             return self._get_default_analysis()
             
-    def _create_analysis_prompt(self, business_data: Dict[str, Any]) -> str:
-        """Create a detailed prompt for Claude to analyze the business"""
-        return f"""
-        Analyze this Hawaii business for potential AI consulting opportunities:
-        
-        Company: {business_data.get('name', 'Unknown')}
-        Island: {business_data.get('island', 'Unknown')}
-        Industry: {business_data.get('industry', 'Unknown')}
-        Description: {business_data.get('description', 'No description available')}
-        Employee Count: {business_data.get('employee_count_estimate', 'Unknown')}
-        Growth Signals: {', '.join(business_data.get('growth_signals', []))}
-        Website: {business_data.get('website', 'Not provided')}
-        
-        LeniLani Consulting offers:
-        1. Data Analytics - Transform business data into actionable insights
-        2. Custom Chatbots - AI-powered customer service and engagement
-        3. Fractional CTO - Strategic technology leadership
-        4. HubSpot Digital Marketing - Marketing automation and CRM
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "score": <0-100 based on fit and opportunity>,
-            "summary": "<2-3 sentence executive summary>",
-            "pain_points": ["<specific pain point 1>", "<pain point 2>", ...],
-            "recommended_services": ["<service 1>", "<service 2>", ...],
-            "estimated_deal_value": <annual value in USD>,
-            "growth_signals": ["<signal 1>", "<signal 2>", ...],
-            "technology_readiness": "<Low/Medium/High>",
-            "outreach_strategy": "<personalized approach considering Hawaii culture and business environment>",
-            "decision_makers": ["<likely title 1>", "<likely title 2>", ...]
-        }}
-        
-        Consider Hawaii-specific factors:
-        - Tourism dependency and seasonality
-        - Inter-island business challenges
-        - Local vs mainland competition
-        - Aloha spirit in business culture
-        - Sustainability and environmental consciousness
-        
-        Score higher for:
-        - Growing businesses (hiring, expanding)
-        - Tourism/hospitality needing analytics or automation
-        - Companies with outdated technology
-        - Businesses expanding to multiple islands
-        - High employee count (>50)
-        """
+    def _cached_analysis(self, business_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Previous analysis of identical prompt inputs, if cached"""
+        if not self.cache:
+            return None
+        return self.cache.get(AnalysisCache.make_key(business_data, self.model, self.PROMPT_VERSION))
         
-    def _get_system_prompt(self) -> str:
-        """System prompt for Claude"""
-        return """You are an expert business analyst specializing in the Hawaii market. 
-        You understand the unique challenges of island businesses, from tourism dependency 
-        to logistics complexities. You evaluate businesses for AI and technology consulting 
-        opportunities, always considering local culture and the importance of building 
-        relationships in Hawaii's tight-knit business community. Provide insights that 
-        demonstrate deep understanding of each business's specific challenges and opportunities."""
-        
-    def _parse_analysis_response(self, response: str) -> Dict[str, Any]:
-        """Parse Claude's response into structured data"""
-        try:
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
+    def _store_analysis(self, business_data: Dict[str, Any], analysis: Dict[str, Any]):
+        """Cache a successful analysis under its prompt inputs"""
+        if self.cache:
+            self.cache.put(AnalysisCache.make_key(business_data, self.model, self.PROMPT_VERSION), analysis)
             
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                logger.warning("Could not find JSON in Claude response")
-                return self._parse_text_response(response)
-                
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse JSON response, falling back to text parsing")
-            return self._parse_text_response(response)
-            
-    def _parse_text_response(self, response: str) -> Dict[str, Any]:
-        """Fallback parser for non-JSON responses"""
-        # Simple text parsing logic
-        analysis = {
-            'score': 50,  # Default middle score
-            'summary': response[:200],
-            'pain_points': ['General business improvement needed'],
-            'recommended_services': ['Data Analytics'],
-            'estimated_deal_value': 50000,
-            'growth_signals': [],
-            'technology_readiness': 'Medium',
-            'outreach_strategy': 'Schedule an introductory meeting to discuss needs'
+    def _build_request(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Messages API parameters for analyzing one business"""
+        return {
+            'model': self.model,
+            'max_tokens': 1500,
+            'temperature': 0.7,
+            'system': self._get_system_prompt(),
+            'tools': [ANALYSIS_TOOL],
+            'tool_choice': {'type': 'tool', 'name': ANALYSIS_TOOL['name']},
+            'messages': [{"role": "user", "content": self._create_analysis_prompt(business_data)}]
         }
         
-        # Try to extract score if mentioned
-        import re
-        score_match = re.search(r'score[:\s]+(\d+)', response, re.IGNORECASE)
-        if score_match:
-            analysis['score'] = int(score_match.group(1))
+    def _record_parse_failure(self, business_data: Dict[str, Any], error: AnalysisParseError):
+        """Count a response that did not validate"""
+        with self._usage_lock:
+            self.usage['parse_failures'] += 1
+        logger.warning(f"Unusable analysis for {business_data.get('name')}: {str(error)}")
+        
+    def _record_usage(self, usage):
+        """Add one response's token usage to the running totals"""
+        if usage is None:
+            return
+        with self._usage_lock:
+            self.usage['requests'] += 1
+            for field in USAGE_FIELDS:
+                self.usage[field] += getattr(usage, field, None) or 0
+                
+    def usage_summary(self) -> str:
+        """Average tokens per analysis since the analyzer was created
+        
+        Input is split into uncached, cache-write and cache-read tokens;
+        cache reads are billed at a tenth of the input price.
+        """
+        with self._usage_lock:
+            usage = dict(self.usage)
+        requests = usage['requests']
+        if not requests:
+            return "No Claude requests made"
+        total_input = sum(usage[field] for field in USAGE_FIELDS[:3])
+        return (f"{requests} Claude requests, {total_input / requests:.0f} input tokens per analysis "
+                f"({usage['input_tokens'] / requests:.0f} uncached, "
+                f"{usage['cache_creation_input_tokens'] / requests:.0f} cache write, "
+                f"{usage['cache_read_input_tokens'] / requests:.0f} cache read), "
+                f"{usage['output_tokens'] / requests:.0f} output, "
+                f"{usage['parse_failures']} parse failures")
+        
+    def _build_analysis(self, message: Any) -> Dict[str, Any]:
+        """Turn Claude's reply into the prospect analysis fields
+        
+        Raises AnalysisParseError if the reply does not validate against
+        ANALYSIS_TOOL's schema; recommended_services always holds
+        service_enum values.
+        """
+        analysis = parse_analysis_message(message)
+        
+        return {
+            'score': analysis['score'],
+            'ai_analysis': analysis['summary'],
+            'pain_points': analysis['pain_points'],
+            'recommended_services': analysis['recommended_services'],
+            'estimated_deal_value': analysis['estimated_deal_value'],
+            'growth_signals': analysis['growth_signals'],
+            'technology_readiness': analysis['technology_readiness'],
+            'priority_level': self._determine_priority(analysis['score']),
+            'outreach_strategy': analysis['outreach_strategy'] or ''
+        }
             
-        return analysis
+    def _create_analysis_prompt(self, business_data: Dict[str, Any]) -> str:
+        """Per-business part of the prompt; instructions live in the system prefix"""
+        fields = [
+            ('Company', business_data.get('name') or 'Unknown'),
+            ('Island', business_data.get('island')),
+            ('Industry', business_data.get('industry')),
+            ('Employees', business_data.get('employee_count_estimate')),
+            ('Website', business_data.get('website')),
+            ('Growth signals', ', '.join(business_data.get('growth_signals') or [])),
+            ('Description', business_data.get('description'))
+        ]
+        # Unknown fields are left out rather than spelled out
+        return '\n'.join(f"{label}: {value}" for label, value in fields if value)
+        
+    def _get_system_prompt(self) -> List[Dict[str, Any]]:
+        """System prompt and analysis instructions, shared by every request"""
+        instructions = {"type": "text", "text": ANALYSIS_INSTRUCTIONS}
+        if self.prompt_caching:
+            instructions["cache_control"] = {"type": "ephemeral"}
+        return [{"type": "text", "text": SYSTEM_PROMPT}, instructions]
         
     def _determine_priority(self, score: int) -> str:
         """Determine priority level based on score"""
@@ -174,19 +227,37 @@ class ClaudeBusinessAnalyzer:
             'outreach_strategy': ''
         }
         
+    def analyze_stream(self, businesses: List[Dict[str, Any]], **engine_options) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Analyze businesses concurrently, yielding (index, analysis) as each finishes
+        
+        engine_options are passed to ConcurrentAnalysisEngine (max_in_flight,
+        requests_per_minute, tokens_per_minute, base_url).
+        """
+        return ConcurrentAnalysisEngine(self, **engine_options).analyze_stream(businesses)
+        
+    def iter_analyze(self, businesses: List[Dict[str, Any]], **engine_options) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Blocking version of analyze_stream so callers can persist results as they arrive"""
+        return ConcurrentAnalysisEngine(self, **engine_options).iter_analyze(businesses)
+        
+    def iter_analyze_batch(self, businesses: List[Dict[str, Any]], **batch_options) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Bulk mode: analyze through Message Batches jobs, yielding (index, analysis)
+        
+        Half the cost of iter_analyze with no rate limiting, but results
+        arrive only as each batch ends, and failed requests are not yielded
+        at all. batch_options are passed to BatchAnalysisJob (poll_interval,
+        max_requests, base_url).
+        """
+        return BatchAnalysisJob(self, **batch_options).iter_analyze(businesses)
+        
     def batch_analyze(self, businesses: List[Dict[str, Any]], max_batch_size: int = 10) -> List[Dict[str, Any]]:
-        """Analyze multiple businesses in batches"""
-        results = []
+        """Analyze multiple businesses with up to max_batch_size requests in flight"""
+        logger.info(f"Analyzing {len(businesses)} businesses, {max_batch_size} at a time")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(businesses)
         
-        for i in range(0, len(businesses), max_batch_size):
-            batch = businesses[i:i + max_batch_size]
-            logger.info(f"Analyzing batch {i//max_batch_size + 1} of {len(businesses)//max_batch_size + 1}")
-            
-            for business in batch:
-                analysis = self.analyze_business(business)
-                results.append({
-                    'business_data': business,
-                    'analysis': analysis
-                })
+        for index, analysis in self.iter_analyze(businesses, max_in_flight=max_batch_size):
+            results[index] = {
+                'business_data': businesses[index],
+                'analysis': analysis
+            }
                 
         return results
\ No newline at end of file
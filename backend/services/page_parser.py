@@ -0,0 +1,194 @@
+import os
+import re
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, Comment, Doctype
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # Optional; the fastest backend, preferred when installed
+    HTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+except ImportError:  # Optional; used when selectolax is not installed
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+# Elements whose text is never shown to a reader
+HIDDEN_TAGS = ['script', 'style', 'noscript', 'template']
+
+
+class ParsedPage(ABC):
+    """The handful of extractions scrapers need from an HTML page
+
+    Backends implement these on top of a fast parser so callers that only
+    need text, a meta tag or some links never build a BeautifulSoup tree.
+    """
+
+    backend = ''
+
+    @abstractmethod
+    def text(self, separator: str = '\n') -> str:
+        """Visible text of the page, without scripts and styles"""
+
+    @abstractmethod
+    def meta_description(self) -> Optional[str]:
+        """Content of <meta name="description">, or og:description"""
+
+    def json_ld(self) -> List[Any]:
+        """Parsed JSON-LD blocks; invalid blocks are skipped"""
+        return [data for data in (_load_json(raw) for raw in self._json_ld_raw()) if data is not None]
+
+    def anchors(self, pattern: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(href, text) of links whose href or text matches pattern (case-insensitive)"""
+        regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        return [
+            (href, text) for href, text in self._anchors_raw()
+            if regex is None or regex.search(href) or regex.search(text)
+        ]
+
+    @abstractmethod
+    def paragraphs(self) -> List[str]:
+        """Stripped text of each <p> element"""
+
+    @abstractmethod
+    def _json_ld_raw(self) -> List[str]:
+        """Contents of the JSON-LD script blocks"""
+
+    @abstractmethod
+    def _anchors_raw(self) -> List[Tuple[str, str]]:
+        """(href, text) of every link"""
+
+
+class SelectolaxPage(ParsedPage):
+    backend = 'selectolax'
+
+    def __init__(self, html: Union[str, bytes]):
+        self._tree = HTMLParser(html)
+
+    def text(self, separator: str = '\n') -> str:
+        # strip_tags mutates, so work on a copy and keep the tree intact
+        tree = self._tree.clone()
+        tree.strip_tags(HIDDEN_TAGS)
+        root = tree.body or tree.root
+        return root.text(separator=separator, strip=True) if root is not None else ''
+
+    def meta_description(self) -> Optional[str]:
+        for selector in ('meta[name="description"]', 'meta[property="og:description"]'):
+            node = self._tree.css_first(selector)
+            if node is not None and node.attributes.get('content'):
+                return node.attributes['content'].strip()
+        return None
+
+    def paragraphs(self) -> List[str]:
+        return [node.text(strip=True) for node in self._tree.css('p')]
+
+    def _json_ld_raw(self) -> List[str]:
+        return [node.text() for node in self._tree.css('script[type="application/ld+json"]')]
+
+    def _anchors_raw(self) -> List[Tuple[str, str]]:
+        return [(node.attributes.get('href') or '', node.text(strip=True)) for node in self._tree.css('a[href]')]
+
+
+class LxmlPage(ParsedPage):
+    backend = 'lxml'
+
+    def __init__(self, html: Union[str, bytes]):
+        if isinstance(html, str):
+            # lxml rejects str input that carries an encoding declaration
+            html = html.encode('utf-8')
+        try:
+            self._doc = lxml.html.fromstring(html)
+        except (ParserError, ValueError):
+            # Empty or unparseable documents behave like a blank page
+            self._doc = lxml.html.fromstring('<html></html>')
+
+    def text(self, separator: str = '\n') -> str:
+        hidden = ' or '.join(f'ancestor::{tag}' for tag in HIDDEN_TAGS)
+        parts = self._doc.xpath(f'//text()[not({hidden})]')
+        return separator.join(part.strip() for part in parts if part.strip())
+
+    def meta_description(self) -> Optional[str]:
+        for name in ('description', 'og:description'):
+            values = self._doc.xpath('//meta[@name=$name or @property=$name]/@content', name=name)
+            if values and values[0].strip():
+                return values[0].strip()
+        return None
+
+    def paragraphs(self) -> List[str]:
+        return [p.text_content().strip() for p in self._doc.iter('p')]
+
+    def _json_ld_raw(self) -> List[str]:
+        return self._doc.xpath('//script[@type="application/ld+json"]/text()')
+
+    def _anchors_raw(self) -> List[Tuple[str, str]]:
+        return [(a.get('href') or '', a.text_content().strip()) for a in self._doc.xpath('//a[@href]')]
+
+
+class SoupPage(ParsedPage):
+    """BeautifulSoup fallback when no fast parser is installed"""
+
+    backend = 'bs4'
+
+    def __init__(self, html: Union[str, bytes]):
+        self._soup = BeautifulSoup(html, 'html.parser')
+
+    def text(self, separator: str = '\n') -> str:
+        parts = [
+            string.strip() for string in self._soup.find_all(string=True)
+            if not isinstance(string, (Comment, Doctype)) and string.strip()
+            and string.parent is not None and string.parent.name not in HIDDEN_TAGS
+        ]
+        return separator.join(parts)
+
+    def meta_description(self) -> Optional[str]:
+        for attrs in ({'name': 'description'}, {'property': 'og:description'}):
+            meta = self._soup.find('meta', attrs=attrs)
+            if meta and meta.get('content', '').strip():
+                return meta['content'].strip()
+        return None
+
+    def paragraphs(self) -> List[str]:
+        return [p.get_text().strip() for p in self._soup.find_all('p')]
+
+    def _json_ld_raw(self) -> List[str]:
+        return [script.string or '' for script in self._soup.find_all('script', type='application/ld+json')]
+
+    def _anchors_raw(self) -> List[Tuple[str, str]]:
+        return [(a['href'], a.get_text().strip()) for a in self._soup.find_all('a', href=True)]
+
+
+BACKENDS = {'selectolax': SelectolaxPage, 'lxml': LxmlPage, 'bs4': SoupPage}
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    installed = {'selectolax': HTMLParser is not None, 'lxml': lxml is not None, 'bs4': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def parse_page(html: Union[str, bytes], backend: Optional[str] = None) -> ParsedPage:
+    """Parse HTML with the requested backend, or the fastest one installed
+
+    HTML_PARSER_BACKEND picks the default; 'auto' (the default) prefers
+    selectolax, then lxml, then BeautifulSoup.
+    """
+    backend = backend or os.getenv('HTML_PARSER_BACKEND', 'auto')
+    if backend == 'auto' or backend not in available_backends():
+        if backend != 'auto':
+            logger.warning(f"HTML parser backend {backend} not installed, using the fastest available")
+        backend = available_backends()[0]
+    return BACKENDS[backend](html)
+
+
+def _load_json(raw: str) -> Optional[Any]:
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,52 @@
+"""
+Decoding of PostgreSQL array values
+psycopg2 returns arrays of custom types (service_enum[]) as their text
+form, e.g. '{"Data Analytics","Custom Chatbots"}', while text[] columns
+already arrive as lists. decode_array turns either into a list of str.
+"""
+
+from typing import Any, List, Optional
+
+
+def decode_array(value: Any) -> List[Optional[str]]:
+    """List for a one-dimensional PostgreSQL array value
+
+    Lists and tuples pass through, None becomes []. Text follows the array
+    output format: elements separated by commas, double-quoted when they
+    contain commas, braces, quotes or spaces, with backslash escapes inside
+    quotes and an unquoted NULL for null elements. Text that is not an
+    array literal is treated as a single element.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+
+    text = str(value).strip()
+    if not (text.startswith('{') and text.endswith('}')):
+        return [text] if text else []
+
+    body = text[1:-1]
+    items: List[Optional[str]] = []
+    i, length = 0, len(body)
+    while i < length:
+        if body[i] == '"':
+            chars = []
+            i += 1
+            while i < length and body[i] != '"':
+                if body[i] == '\\' and i + 1 < length:
+                    i += 1
+                chars.append(body[i])
+                i += 1
+            items.append(''.join(chars))
+            i += 1  # closing quote
+        else:
+            end = body.find(',', i)
+            end = length if end == -1 else end
+            raw = body[i:end].strip()
+            items.append(None if raw == 'NULL' else raw)
+            i = end
+        # Skip to the start of the next element
+        while i < length and body[i] in ', ':
+            i += 1
+    return items
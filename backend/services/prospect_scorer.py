@@ -0,0 +1,101 @@
+"""
+Vectorized heuristic fit score for prospects
+Scores whole batches with pandas so obvious low-fit businesses can be
+filtered out before any Claude call is spent on them.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Relative fit of each industry for LeniLani's services (see the analysis
+# prompt: tourism/hospitality needing analytics or automation score higher)
+INDUSTRY_FIT = {
+    'Tourism': 1.0, 'Hospitality': 1.0, 'Healthcare': 0.8, 'Real Estate': 0.7,
+    'Professional Services': 0.7, 'Retail': 0.6, 'Transportation': 0.6,
+    'Food Service': 0.5, 'Agriculture': 0.5, 'Construction': 0.5,
+    'Technology': 0.4, 'Other': 0.3
+}
+
+# Market size and reachability by island
+ISLAND_FIT = {
+    'Oahu': 1.0, 'All Islands': 1.0, 'Maui': 0.8, 'Big Island': 0.8,
+    'Kauai': 0.7, 'Molokai': 0.4, 'Lanai': 0.4
+}
+
+# Points per component; they add up to the 0-100 fit score
+WEIGHTS = {'industry': 25, 'island': 10, 'employees': 30, 'reviews': 15, 'growth': 15, 'website': 5}
+
+# Employee and review counts at which those components saturate
+EMPLOYEES_FULL = 200
+REVIEWS_FULL = 1000
+
+# Review counts as Google Places and Yelp write them into descriptions:
+# "Google rating: 4.5/5 (312 reviews)", "Active cafe with 87 Yelp reviews"
+REVIEWS_PATTERN = re.compile(r'(\d[\d,]*)\s+(?:yelp\s+)?reviews', re.IGNORECASE)
+
+# Description phrases that count as a growth signal of their own
+GROWTH_PATTERN = r'hiring|expanding|expansion|new location|now open|grand opening|growing'
+
+
+class ProspectScorer:
+    """Heuristic 0-100 fit score computed over a batch of businesses at once
+
+    Uses industry, island, employee estimate, review count and growth
+    signals. Review counts come from a 'review_count' field when present,
+    otherwise from the description the Google Places and Yelp scrapers
+    write. Unknown values score as neutral-low rather than failing.
+    """
+
+    COLUMNS = ['industry', 'island', 'employee_count_estimate', 'review_count',
+               'growth_signals', 'description', 'website']
+
+    def score_frame(self, frame: pd.DataFrame) -> pd.Series:
+        """Fit score for each row of a frame with (some of) COLUMNS"""
+        frame = frame.reindex(columns=self.COLUMNS)
+        description = frame['description'].fillna('').astype(str)
+
+        industry = frame['industry'].map(INDUSTRY_FIT).fillna(INDUSTRY_FIT['Other'])
+        island = frame['island'].map(ISLAND_FIT).fillna(0.5)
+
+        employees = pd.to_numeric(frame['employee_count_estimate'], errors='coerce')
+        employees = self._log_scale(employees, EMPLOYEES_FULL).fillna(0.25)
+
+        reviews = pd.to_numeric(frame['review_count'], errors='coerce')
+        described = pd.to_numeric(
+            description.str.extract(REVIEWS_PATTERN, expand=False).str.replace(',', '', regex=False),
+            errors='coerce'
+        )
+        reviews = self._log_scale(reviews.fillna(described), REVIEWS_FULL).fillna(0.0)
+
+        signals = frame['growth_signals'].map(lambda value: value if isinstance(value, list) else [])
+        growth = signals.str.len() + description.str.contains(GROWTH_PATTERN, case=False, regex=True)
+        growth = growth.clip(upper=3) / 3
+
+        website = frame['website'].fillna('').astype(str).str.strip().ne('').astype(float)
+
+        score = (
+            WEIGHTS['industry'] * industry
+            + WEIGHTS['island'] * island
+            + WEIGHTS['employees'] * employees
+            + WEIGHTS['reviews'] * reviews
+            + WEIGHTS['growth'] * growth
+            + WEIGHTS['website'] * website
+        )
+        return score.round().clip(0, 100).astype(int)
+
+    def score(self, businesses: List[Dict[str, Any]]) -> np.ndarray:
+        """Fit scores for a list of business dicts, in order"""
+        if not businesses:
+            return np.zeros(0, dtype=int)
+        return self.score_frame(pd.DataFrame.from_records(businesses)).to_numpy()
+
+    @staticmethod
+    def _log_scale(values: pd.Series, full: float) -> pd.Series:
+        """log(1 + x) scaled so `full` maps to 1; NaN stays NaN"""
+        return (np.log1p(values.clip(lower=0)) / np.log1p(full)).clip(upper=1.0)
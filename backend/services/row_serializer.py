@@ -0,0 +1,101 @@
+"""
+Row-to-JSON serialization for the raw-SQL routes
+A RowSerializer maps output keys to column names once per query shape and
+is compiled against the result's column order into a single function, so
+building a response dict is one expression per row. Payloads are encoded
+straight to JSON bytes, bypassing FastAPI's jsonable_encoder.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+# Template value: a column name, (column name, converter), or a nested template
+Spec = Union[str, Tuple[str, Callable[[Any], Any]], Dict[str, Any]]
+
+
+def to_float(value: Any) -> float:
+    """Numeric column as float, with NULL and zero as 0"""
+    return float(value) if value else 0
+
+
+def _default(value: Any) -> Any:
+    """Types neither encoder handles natively (timestamps only for json)"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """JSON bytes for a payload; timestamps come out in isoformat() form"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class RowSerializer:
+    """Dicts (or JSON bytes) for result rows, keyed by column name
+
+    template maps each output key to a column name, to a (column name,
+    converter) pair, or to a nested template for sub-objects such as the
+    company of a prospect. Timestamps are left to the encoder, so they
+    need no converter. The compiled function for each column order is
+    kept, so the template is only resolved once per query shape.
+    """
+
+    def __init__(self, template: Dict[str, Spec]):
+        self.template = template
+        self._compiled: Dict[Tuple[str, ...], Callable[[Sequence[Any]], Dict[str, Any]]] = {}
+
+    def rows(self, columns: Iterable[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Response dicts for rows of a result with the given column names"""
+        convert = self._for(tuple(columns))
+        return [convert(row) for row in rows]
+
+    def dumps(self, columns: Iterable[str], rows: Iterable[Sequence[Any]]) -> bytes:
+        """JSON array of the response dicts for rows"""
+        return dumps(self.rows(columns, rows))
+
+    def dumps_row(self, columns: Iterable[str], row: Sequence[Any]) -> bytes:
+        """JSON object for a single row"""
+        return dumps(self._for(tuple(columns))(row))
+
+    def _for(self, columns: Tuple[str, ...]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        convert = self._compiled.get(columns)
+        if convert is None:
+            convert = self._compiled[columns] = self._compile(columns)
+        return convert
+
+    def _compile(self, columns: Tuple[str, ...]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        """One lambda building the whole (nested) dict from positional lookups"""
+        index = {name: position for position, name in enumerate(columns)}
+        converters: Dict[str, Callable[[Any], Any]] = {}
+
+        def expression(template: Dict[str, Spec]) -> str:
+            items = []
+            for key, spec in template.items():
+                if isinstance(spec, dict):
+                    value = expression(spec)
+                else:
+                    column, convert = (spec, None) if isinstance(spec, str) else spec
+                    if column not in index:
+                        raise KeyError(f"Query has no column {column!r} for {key!r}")
+                    value = f"row[{index[column]}]"
+                    if convert is not None:
+                        name = f"convert_{len(converters)}"
+                        converters[name] = convert
+                        value = f"{name}({value})"
+                items.append(f"{str(key)!r}: {value}")
+            return "{" + ", ".join(items) + "}"
+
+        return eval(f"lambda row: {expression(self.template)}", {'__builtins__': {}, **converters})
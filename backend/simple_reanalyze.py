@@ -13,65 +13,61 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from models.database import SessionLocal
 from models.models import Prospect
 from services.claude_analyzer import ClaudeBusinessAnalyzer
+from reanalyze_prospects import MARK_ANALYZED, load_prospects
 
-def reanalyze_prospects():
-    """Re-analyze all prospects with score 0"""
-    db = SessionLocal()
+def reanalyze_prospects(bulk=True):
+    """Re-analyze every prospect flagged needs_analysis that passes the fit pre-filter
+    
+    No database session is held while Claude works. With bulk (the
+    default) the analyses run as one Message Batches job; --sync uses the
+    concurrent API path instead. Each result is saved in its own short
+    transaction as it comes back.
+    """
     analyzer = ClaudeBusinessAnalyzer()
+    jobs = load_prospects()
+    print(f"Found {len(jobs)} prospects to re-analyze")
     
-    try:
-        # Get prospects with score 0
-        prospects = db.query(Prospect).filter(Prospect.score == 0).all()
-        print(f"Found {len(prospects)} prospects to re-analyze")
+    businesses = [company_data for _, company_data, _ in jobs]
+    analyses = analyzer.iter_analyze_batch(businesses) if bulk else analyzer.iter_analyze(businesses)
+    
+    success_count = 0
+    for i, (index, analysis) in enumerate(analyses):
+        prospect_id, company_data, fingerprint = jobs[index]
+        print(f"\n[{i+1}/{len(jobs)}] {company_data['name']}")
         
-        success_count = 0
-        for i, prospect in enumerate(prospects):
-            company = prospect.company
-            print(f"\n[{i+1}/{len(prospects)}] Analyzing {company.name}...")
+        if not analysis or analysis.get('score', 0) <= 0:
+            print(f"✗ Analysis returned no score")
+            continue
             
-            try:
-                # Convert company to dictionary for analyzer
-                company_data = {
-                    'name': company.name,
-                    'island': company.island,
-                    'industry': company.industry,
-                    'description': company.description or '',
-                    'employee_count_estimate': company.employee_count_estimate or 50,
-                    'website': company.website or '',
-                    'growth_signals': []
-                }
-                
-                # Get AI analysis
-                analysis = analyzer.analyze_business(company_data)
-                
-                if analysis and analysis.get('score', 0) > 0:
-                    # Update only the simple fields to avoid enum issues
-                    prospect.score = analysis['score']
-                    prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis completed')
-                    prospect.priority_level = analysis['priority_level']
-                    prospect.technology_readiness = analysis['technology_readiness']
-                    prospect.estimated_deal_value = analysis['estimated_deal_value']
-                    prospect.last_analyzed = datetime.now()
-                    
-                    db.commit()
-                    success_count += 1
-                    print(f"✓ Successfully analyzed - Score: {analysis['score']}, Priority: {analysis['priority_level']}")
-                else:
-                    print(f"✗ Analysis returned no score")
-                    
-            except Exception as e:
-                print(f"✗ Error: {str(e)}")
-                db.rollback()
-                
-        print(f"\n{success_count}/{len(prospects)} prospects successfully re-analyzed")
-        
-    finally:
-        db.close()
+        db = SessionLocal()
+        try:
+            # Update only the simple fields to avoid enum issues
+            prospect = db.get(Prospect, prospect_id)
+            prospect.score = analysis['score']
+            prospect.ai_analysis = analysis.get('ai_analysis', 'AI analysis completed')
+            prospect.priority_level = analysis['priority_level']
+            prospect.technology_readiness = analysis['technology_readiness']
+            prospect.estimated_deal_value = analysis['estimated_deal_value']
+            prospect.last_analyzed = datetime.now()
+            db.execute(MARK_ANALYZED, {'id': prospect_id, 'fingerprint': fingerprint})
+            
+            db.commit()
+            success_count += 1
+            print(f"✓ Successfully analyzed - Score: {analysis['score']}, Priority: {analysis['priority_level']}")
+            
+        except Exception as e:
+            print(f"✗ Error: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+            
+    print(f"\n{success_count}/{len(jobs)} prospects successfully re-analyzed")
+    print(analyzer.usage_summary())
 
 if __name__ == "__main__":
     print("Re-analyzing prospects with Claude AI (simple version)...")
     print("=" * 60)
-    reanalyze_prospects()
+    reanalyze_prospects(bulk='--sync' not in sys.argv)
     
     # Show updated stats
     db = SessionLocal()
@@ -0,0 +1,66 @@
+"""
+Shared fixtures for the backend tests
+Database tests run against TEST_DATABASE_URL, an empty PostgreSQL database,
+and are skipped when it is not set. Each test creates database/schema.sql
+inside a transaction that is rolled back afterwards (PostgreSQL DDL is
+transactional), so nothing is left behind.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Add the backend directory to the path, as the scripts do
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'database', 'schema.sql')
+
+
+@pytest.fixture(scope='session')
+def engine():
+    url = os.getenv('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Session on a fresh schema, rolled back when the test ends"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    with open(SCHEMA_PATH) as schema:
+        # Straight to the driver: the script is several statements
+        connection.connection.cursor().execute(schema.read())
+    session = Session(bind=connection, join_transaction_mode='create_savepoint')
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Context manager yielding a list of every statement sent while in its block"""
+    @contextmanager
+    def counting():
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+            
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+            
+    return counting
@@ -0,0 +1,41 @@
+"""
+Tests for decode_array against PostgreSQL's array output format
+"""
+
+import pytest
+
+from services.pg_array import decode_array
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('{}', []),
+    ('{Hiring}', ['Hiring']),
+    ('{"Data Analytics","Custom Chatbots"}', ['Data Analytics', 'Custom Chatbots']),
+    ('{Hiring,"Data Analytics"}', ['Hiring', 'Data Analytics']),
+    ('{"Kona, Big Island",Hilo}', ['Kona, Big Island', 'Hilo']),
+    ('{"{braces}"}', ['{braces}']),
+    (r'{"say \"aloha\"","back\\slash"}', ['say "aloha"', 'back\\slash']),
+    ('{NULL,"NULL"}', [None, 'NULL']),
+    ('{""}', ['']),
+    ('{"",Hiring}', ['', 'Hiring']),
+])
+def test_array_literals(value, expected):
+    assert decode_array(value) == expected
+
+
+def test_plain_string_is_one_element():
+    assert decode_array('Data Analytics') == ['Data Analytics']
+
+
+def test_empty_string_is_empty():
+    assert decode_array('') == []
+
+
+def test_none_is_empty():
+    assert decode_array(None) == []
+
+
+def test_lists_pass_through():
+    value = ['Data Analytics', None]
+    assert decode_array(value) == value
+    assert decode_array(('Hiring',)) == ['Hiring']
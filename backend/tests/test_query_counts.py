@@ -0,0 +1,71 @@
+"""
+N+1 regression tests: the number of statements an endpoint issues must not
+grow with the number of rows it returns.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from api.routes import interactions, prospects
+
+ENDPOINTS = ['/prospects/', '/prospects/high-priority/summary', '/interactions/upcoming/tasks']
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(prospects.router, prefix='/prospects')
+    app.include_router(interactions.router, prefix='/interactions')
+    # Override the dependency the routes declare, wherever it comes from
+    app.dependency_overrides[prospects.get_db] = lambda: db
+    app.dependency_overrides[interactions.get_db] = lambda: db
+    return TestClient(app)
+
+
+def seed(db, first, count):
+    """count High priority prospects on two islands, each with an upcoming task"""
+    for i in range(first, first + count):
+        company_id = db.execute(text("""
+            INSERT INTO companies (name, island, industry, website)
+            VALUES (:name, :island, 'Tourism', :website) RETURNING id
+        """), {'name': f'Business {i}', 'island': ['Oahu', 'Maui'][i % 2],
+               'website': f'https://business{i}.example.com'}).scalar()
+        prospect_id = db.execute(text("""
+            INSERT INTO prospects (company_id, score, priority_level, recommended_services,
+                                   estimated_deal_value, growth_signals, pain_points)
+            VALUES (:company_id, :score, 'High',
+                    ARRAY['Data Analytics', 'Custom Chatbots']::service_enum[],
+                    25000, ARRAY['Hiring'], ARRAY['Manual reporting'])
+            RETURNING id
+        """), {'company_id': company_id, 'score': 80 + i % 20}).scalar()
+        db.execute(text("""
+            INSERT INTO interactions (prospect_id, interaction_type, next_action, next_action_date)
+            VALUES (:prospect_id, 'Email', 'Follow up', :next_action_date)
+        """), {'prospect_id': prospect_id, 'next_action_date': date.today() + timedelta(days=i + 1)})
+    db.flush()
+
+
+def statements_for(client, count_queries, path):
+    with count_queries() as statements:
+        response = client.get(path)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()
+
+
+@pytest.mark.parametrize('path', ENDPOINTS)
+def test_query_count_does_not_grow_with_rows(client, db, count_queries, path):
+    seed(db, 0, 2)
+    few, few_body = statements_for(client, count_queries, path)
+    seed(db, 2, 8)
+    many, many_body = statements_for(client, count_queries, path)
+    
+    # The second request really returned more rows
+    if isinstance(few_body, list):
+        assert len(many_body) > len(few_body) >= 2
+    else:
+        assert many_body['total_count'] > few_body['total_count'] >= 2
+    assert many == few
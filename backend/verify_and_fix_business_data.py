@@ -6,7 +6,6 @@ Verify and fix business data by scraping their actual websites
 import os
 import sys
 import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 from sqlalchemy import text
@@ -15,6 +14,7 @@ import time
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models.database import SessionLocal
+from services.page_parser import parse_page
 
 def clean_phone(phone_text):
     """Extract and clean phone number from text"""
@@ -47,31 +47,29 @@ def scrape_website_info(url, company_name):
         response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Fast parser: only text, links, meta and paragraphs are needed
+        page = parse_page(response.content)
         
         # Extract phone numbers from the page
-        page_text = soup.get_text()
+        page_text = page.text()
         phone = clean_phone(page_text)
         
         # Look for contact or about page links
         contact_links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href'].lower()
-            text = link.get_text().lower()
-            if any(word in href or word in text for word in ['contact', 'about', 'location', 'info']):
-                if href.startswith('http'):
-                    contact_links.append(href)
-                elif href.startswith('/'):
-                    from urllib.parse import urljoin
-                    contact_links.append(urljoin(url, href))
+        for href, _ in page.anchors(r'contact|about|location|info'):
+            href = href.lower()
+            if href.startswith('http'):
+                contact_links.append(href)
+            elif href.startswith('/'):
+                from urllib.parse import urljoin
+                contact_links.append(urljoin(url, href))
         
         # Try to get more specific contact info from contact pages
         if contact_links and not phone:
             for contact_url in contact_links[:2]:  # Try first 2 contact pages
                 try:
                     contact_response = requests.get(contact_url, headers=headers, timeout=10)
-                    contact_soup = BeautifulSoup(contact_response.content, 'html.parser')
-                    contact_text = contact_soup.get_text()
+                    contact_text = parse_page(contact_response.content).text()
                     phone = clean_phone(contact_text)
                     if phone:
                         break
@@ -80,16 +78,14 @@ def scrape_website_info(url, company_name):
         
         # Extract business description from meta tags or first paragraph
         description = ""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            description = meta_desc['content'][:200]
+        meta_desc = page.meta_description()
+        if meta_desc:
+            description = meta_desc[:200]
         else:
             # Try to find the first meaningful paragraph
-            paragraphs = soup.find_all('p')
-            for p in paragraphs:
-                text = p.get_text().strip()
-                if len(text) > 50 and company_name.lower() in text.lower():
-                    description = text[:200]
+            for paragraph in page.paragraphs():
+                if len(paragraph) > 50 and company_name.lower() in paragraph.lower():
+                    description = paragraph[:200]
                     break
         
         return {
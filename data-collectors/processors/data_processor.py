@@ -1,15 +1,20 @@
 import logging
-from typing import List, Dict, Any, Tuple
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Callable
 from datetime import datetime
 import os
 import sys
+import threading
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from services.database_service import DatabaseService
+from processors.entity_resolver import EntityResolver
 from backend.services.claude_analyzer import ClaudeBusinessAnalyzer
+from backend.services.analysis_cache import input_fingerprint
+from backend.services.prospect_scorer import ProspectScorer
 
 logger = logging.getLogger(__name__)
 
@@ -20,89 +25,252 @@ class DataProcessor:
     def __init__(self):
         self.db_service = DatabaseService()
         self.analyzer = ClaudeBusinessAnalyzer()
+        self.bulk_ingest = os.getenv('BULK_INGEST', 'true').lower() == 'true'
+        self.entity_resolution = os.getenv('ENTITY_RESOLUTION', 'true').lower() == 'true'
+        self.resolver = EntityResolver(float(os.getenv('ENTITY_MATCH_THRESHOLD', 0.9)))
+        self._resolver_lock = threading.Lock()
+        # Held for the whole of an analysis sweep (see analyze_new_prospects)
+        self._analysis_lock = threading.Lock()
+        self.ingest_batch_size = int(os.getenv('INGEST_BATCH_SIZE', 50))
+        # Prospects whose heuristic fit score is below this skip Claude (0 = off)
+        self.scorer = ProspectScorer()
+        self.fit_score_threshold = int(os.getenv('FIT_SCORE_THRESHOLD', 50))
         
-    def process_businesses(self, businesses: List[Dict[str, Any]], source: str) -> Tuple[int, int]:
-        """Process list of businesses and save to database"""
+    def process_stream(self, businesses: Iterable[Dict[str, Any]], source: str,
+                       batch_size: Optional[int] = None,
+                       on_batch: Optional[Callable[[], None]] = None) -> Tuple[int, int, int]:
+        """Persist a scraper's stream in micro-batches as records arrive
+        
+        Only one batch is held in memory at a time, and everything written
+        before a failure stays written. on_batch runs after each batch is
+        saved (e.g. to flush collection checkpoints). Returns
+        (found, processed, added).
+        """
+        batch_size = batch_size or self.ingest_batch_size
+        stream = iter(businesses)
+        found = processed = added = 0
+        
+        while True:
+            batch = list(islice(stream, batch_size))
+            if batch:
+                batch_processed, batch_added = self.process_businesses(batch, source)
+                found += len(batch)
+                processed += batch_processed
+                added += batch_added
+            if on_batch:
+                on_batch()
+            if len(batch) < batch_size:
+                break
+            
+        return found, processed, added
+        
+    def process_businesses(self, businesses: List[Dict[str, Any]], source: str,
+                           bulk: Optional[bool] = None) -> Tuple[int, int]:
+        """Process list of businesses and save to database
+        
+        In bulk mode the whole batch is upserted with a constant number of
+        round trips; if that fails (e.g. one bad row) the batch is retried
+        row by row so the good records still land.
+        """
+        for business_data in businesses:
+            # Add source if not present
+            if 'source' not in business_data:
+                business_data['source'] = source
+                
+        if self.entity_resolution:
+            self._resolve_duplicates(businesses, source)
+            
+        use_bulk = self.bulk_ingest if bulk is None else bulk
+        if use_bulk:
+            counts = self.db_service.bulk_upsert_companies(
+                businesses, on_commit=self.resolver.index if self.entity_resolution else None
+            )
+            if counts is not None:
+                return counts
+            logger.warning(f"Bulk ingest failed for {source}, falling back to row-by-row processing")
+            
         processed_count = 0
         added_count = 0
         
         for business_data in businesses:
             try:
-                # Add source if not present
-                if 'source' not in business_data:
-                    business_data['source'] = source
+                # Lookup, company and prospect writes share one connection
+                # and are committed together
+                company_id = prospect_id = None
+                with self.db_service.unit_of_work():
+                    # Check if company already exists
+                    existing_company = self.db_service.get_company_by_name_and_island(
+                        business_data.get('name'),
+                        business_data.get('island')
+                    )
                     
-                # Check if company already exists
-                existing_company = self.db_service.get_company_by_name_and_island(
-                    business_data.get('name'),
-                    business_data.get('island')
-                )
-                
-                if existing_company:
-                    # Update existing company
-                    self.db_service.update_company(existing_company['id'], business_data)
-                    processed_count += 1
-                else:
-                    # Create new company
-                    company_id = self.db_service.create_company(business_data)
-                    if company_id:
-                        # Create prospect entry
-                        prospect_id = self.db_service.create_prospect({
-                            'company_id': company_id,
-                            'score': 0,  # Will be updated by analysis
-                            'growth_signals': business_data.get('growth_signals', [])
-                        })
-                        
-                        if prospect_id:
-                            added_count += 1
-                            processed_count += 1
+                    if existing_company:
+                        # Update existing company
+                        self.db_service.update_company(existing_company['id'], business_data)
+                        processed_count += 1
+                    else:
+                        # Create new company
+                        company_id = self.db_service.create_company(business_data)
+                        if company_id:
+                            # Create prospect entry
+                            prospect_id = self.db_service.create_prospect({
+                                'company_id': company_id,
+                                'score': 0,  # Will be updated by analysis
+                                'growth_signals': business_data.get('growth_signals', [])
+                            })
+                            
+                            if prospect_id:
+                                added_count += 1
+                                processed_count += 1
+                                
+                # A failed write rolls the whole unit back, so only a stored
+                # company (existing, or created with its prospect) is indexed
+                if self.entity_resolution and (existing_company or (company_id and prospect_id)):
+                    self.resolver.index([business_data])
                             
             except Exception as e:
                 logger.error(f"Error processing business {business_data.get('name')}: {str(e)}")
                 
         return processed_count, added_count
         
-    def analyze_new_prospects(self, limit: int = 50):
-        """Analyze prospects that haven't been analyzed yet"""
+    def _resolve_duplicates(self, businesses: List[Dict[str, Any]], source: str):
+        """Rename records that duplicate a known company to its stored name
+        
+        The resolver is warmed from the companies table on first use and then
+        kept current with the records of each batch once they are written.
+        """
+        with self._resolver_lock:
+            if not self.resolver.loaded:
+                companies = self.db_service.get_company_identities()
+                if companies is None:
+                    logger.warning("Entity resolution skipped; could not load existing companies")
+                    return
+                self.resolver.load(companies)
+            
+        merged = self.resolver.resolve(businesses)
+        if merged:
+            logger.info(f"Merged {merged} {source} records into existing companies")
+            
+    def analyze_new_prospects(self, limit: int = 50, bulk: Optional[bool] = None, wait: bool = False):
+        """Analyze new prospects and those whose company data changed
+        
+        Prospects whose inputs hash to the fingerprint of their last
+        analysis are cleared without calling Claude, as are those below
+        the heuristic fit-score threshold (see _prefilter). Analyses run
+        concurrently, or with bulk (CLAUDE_BATCH_MODE) as a Message
+        Batches job; either way each result is saved as soon as it comes
+        back.
+        
+        Only one sweep runs at a time, so the post-collection sweep and the
+        nightly batch never analyze the same prospects twice. With wait
+        the call blocks until the running sweep ends; otherwise it returns
+        at once and the flagged prospects are left for a later sweep.
+        """
+        if not self._analysis_lock.acquire(blocking=wait):
+            logger.info("Another analysis sweep is running, leaving flagged prospects for the next one")
+            return
+            
         try:
-            # Get unanalyzed prospects
+            self._analyze_new_prospects(limit, bulk)
+        finally:
+            self._analysis_lock.release()
+            
+    def _analyze_new_prospects(self, limit: int, bulk: Optional[bool]):
+        try:
+            # Get prospects flagged needs_analysis, highest priority first
             prospects = self.db_service.get_unanalyzed_prospects(limit)
             
+            pending = []
+            unchanged = []
             for prospect in prospects:
-                try:
-                    # Get company data
-                    company = self.db_service.get_company(prospect['company_id'])
+                # Get company data
+                company = self.db_service.get_company(prospect['company_id'])
+                
+                if company:
+                    # Prepare data for analysis
+                    business_data = {
+                        'name': company['name'],
+                        'island': company['island'],
+                        'industry': company['industry'],
+                        'description': company.get('description', ''),
+                        'employee_count_estimate': company.get('employee_count_estimate'),
+                        'website': company.get('website'),
+                        'growth_signals': prospect.get('growth_signals', [])
+                    }
+                    fingerprint = input_fingerprint(business_data)
+                    if fingerprint == prospect.get('analysis_fingerprint'):
+                        unchanged.append(prospect['id'])
+                        continue
+                    pending.append((prospect, company, business_data, fingerprint))
                     
-                    if company:
-                        # Prepare data for analysis
-                        business_data = {
-                            'name': company['name'],
-                            'island': company['island'],
-                            'industry': company['industry'],
-                            'description': company.get('description', ''),
-                            'employee_count_estimate': company.get('employee_count_estimate'),
-                            'website': company.get('website'),
-                            'growth_signals': prospect.get('growth_signals', [])
-                        }
-                        
-                        # Analyze with Claude
-                        analysis = self.analyzer.analyze_business(business_data)
-                        
-                        # Update prospect with analysis
-                        self.db_service.update_prospect(prospect['id'], analysis)
+            if unchanged:
+                logger.info(f"Skipped {len(unchanged)} prospects whose analysis inputs are unchanged")
+                self.db_service.mark_prospects_analyzed(unchanged)
+                
+            pending = self._prefilter(pending)
+                
+            # Analyze with Claude
+            businesses = [business_data for _, _, business_data, _ in pending]
+            if bulk is None:
+                bulk = os.getenv('CLAUDE_BATCH_MODE', 'false').lower() == 'true'
+            if bulk and businesses:
+                analyses = self.analyzer.iter_analyze_batch(businesses)
+            else:
+                analyses = self.analyzer.iter_analyze(businesses)
+            
+            for index, analysis in analyses:
+                prospect, company, _, fingerprint = pending[index]
+                if not analysis or not analysis.get('score'):
+                    # A failed analysis (default result, score 0) must not
+                    # overwrite an earlier one; the prospect stays flagged
+                    logger.warning(f"Analysis of {company['name']} failed, keeping its previous analysis")
+                    continue
+                
+                try:
+                    # Update prospect and record any alert in one transaction
+                    with self.db_service.unit_of_work():
+                        self.db_service.update_prospect(prospect['id'], analysis, fingerprint)
                         
                         # Send alert if high priority
                         if analysis['score'] >= int(os.getenv('HIGH_PRIORITY_SCORE', 80)):
                             self._send_high_priority_alert(company, analysis)
                             
-                        logger.info(f"Analyzed {company['name']} - Score: {analysis['score']}")
-                        
+                    logger.info(f"Analyzed {company['name']} - Score: {analysis['score']}")
+                    
                 except Exception as e:
                     logger.error(f"Error analyzing prospect {prospect['id']}: {str(e)}")
                     
+            if pending:
+                logger.info(self.analyzer.usage_summary())
+                
         except Exception as e:
             logger.error(f"Error in analyze_new_prospects: {str(e)}")
             
+    def _prefilter(self, pending: List[Tuple]) -> List[Tuple]:
+        """Drop low-fit prospects before spending Claude calls on them
+        
+        pending holds (prospect, company, business_data, fingerprint)
+        entries; all are scored in one vectorized pass and the scores are
+        stored. Those below fit_score_threshold are marked clean until
+        their inputs change.
+        """
+        if not pending or not self.fit_score_threshold:
+            return pending
+            
+        scores = self.scorer.score([business_data for _, _, business_data, _ in pending])
+        keep = scores >= self.fit_score_threshold
+        
+        self.db_service.record_fit_scores([
+            (prospect['id'], int(score), None if passed else fingerprint)
+            for (prospect, _, _, fingerprint), score, passed in zip(pending, scores, keep)
+        ])
+        
+        skipped = len(pending) - int(keep.sum())
+        if skipped:
+            logger.info(f"Fit score pre-filter skipped {skipped} of {len(pending)} prospects "
+                        f"below {self.fit_score_threshold}")
+        return [entry for entry, passed in zip(pending, keep) if passed]
+        
     def _send_high_priority_alert(self, company: Dict[str, Any], analysis: Dict[str, Any]):
         """Send email alert for high priority prospects"""
         try:
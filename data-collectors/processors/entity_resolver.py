@@ -0,0 +1,208 @@
+"""
+In-memory entity resolution for scraped companies
+Matches incoming records to known companies by normalized name, phone and
+website domain so the same business from two sources lands on one row.
+"""
+
+import logging
+import re
+import threading
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Trailing words that do not distinguish one business from another
+LEGAL_SUFFIXES = {
+    'llc', 'inc', 'incorporated', 'corp', 'corporation', 'co', 'company',
+    'ltd', 'limited', 'llp', 'lp', 'pllc', 'pc', 'plc'
+}
+
+# Hosts shared by many businesses, so they say nothing about identity
+SHARED_DOMAINS = {
+    'facebook.com', 'instagram.com', 'yelp.com', 'linkedin.com', 'twitter.com',
+    'google.com', 'sites.google.com', 'business.site', 'wixsite.com', 'squarespace.com'
+}
+
+# (name, island) of a company row; unique in the companies table
+CompanyKey = Tuple[str, str]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase, drop punctuation, a leading "the" and trailing legal suffixes"""
+    if not name:
+        return ''
+    # Collapse dotted abbreviations first: "L.L.C." -> "llc"
+    text = re.sub(r'\b([a-z])\.(?=[a-z]\.)', r'\1', name.lower()).replace('&', ' and ').replace("'", '')
+    text = re.sub(r'\bd\s*/?\s*b\s*/?\s*a\b.*$', '', text)  # "X dba Y" -> "X"
+    words = re.sub(r'[^a-z0-9]+', ' ', text).split()
+
+    if words and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Last ten digits of a phone number, or '' if it is too short"""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 10 else ''
+
+
+def normalize_domain(website: Optional[str]) -> str:
+    """Registrable-looking host of a website, or '' for shared hosts"""
+    if not website:
+        return ''
+    if '//' not in website:
+        website = f"http://{website}"
+    host = urlparse(website.strip().lower()).netloc.split(':')[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host or host in SHARED_DOMAINS or any(host.endswith(f".{d}") for d in SHARED_DOMAINS):
+        return ''
+    return host
+
+
+class EntityResolver:
+    """Index of known companies keyed by normalized identity attributes
+
+    A record matches an existing company on the same island with, in order:
+    the same normalized name; the same phone number or website domain
+    together with an agreeing name (see names_agree), since chain locations
+    share both; or a name similar enough (SequenceMatcher ratio) among
+    candidates sharing a blocking key (see block_key). All lookups are dict
+    hits plus a ratio over a small block, so no database round trip is
+    needed.
+
+    Only companies that are stored belong in the index: resolve() matches
+    a batch without indexing it, and index() adds records once their write
+    has committed.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.9):
+        self.similarity_threshold = similarity_threshold
+        self._names: Dict[Tuple[str, str], CompanyKey] = {}
+        self._phones: Dict[Tuple[str, str], CompanyKey] = {}
+        self._domains: Dict[Tuple[str, str], CompanyKey] = {}
+        self._blocks: Dict[Tuple[str, str], Set[str]] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def load(self, companies: Iterable[Dict[str, Any]]):
+        """Warm the index from company rows (name, island, phone, website)"""
+        count = 0
+        for company in companies:
+            self.add(company)
+            count += 1
+        self.loaded = True
+        logger.info(f"Entity resolution index loaded with {count} companies")
+
+    def add(self, company: Dict[str, Any]) -> Optional[CompanyKey]:
+        """Index a company under its own (name, island); existing keys win"""
+        name = company.get('name')
+        island = company.get('island') or ''
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+
+        key = (name, island)
+        phone = normalize_phone(company.get('phone'))
+        domain = normalize_domain(company.get('website'))
+
+        with self._lock:
+            key = self._names.setdefault((normalized, island), key)
+            if phone:
+                self._phones.setdefault((phone, island), key)
+            if domain:
+                self._domains.setdefault((domain, island), key)
+            self._blocks.setdefault((self.block_key(normalized), island), set()).add(normalized)
+        return key
+
+    def match(self, business: Dict[str, Any]) -> Optional[CompanyKey]:
+        """(name, island) of the known company this record refers to, if any"""
+        island = business.get('island') or ''
+        normalized = normalize_name(business.get('name'))
+        if not normalized:
+            return None
+
+        with self._lock:
+            key = self._names.get((normalized, island))
+            if key:
+                return key
+
+            # A shared phone or domain alone also links the branches of a
+            # chain ("Foodland Kailua", "Foodland Beretania")
+            phone = normalize_phone(business.get('phone'))
+            key = self._phones.get((phone, island)) if phone else None
+            if key and self.names_agree(normalized, normalize_name(key[0])):
+                return key
+
+            domain = normalize_domain(business.get('website'))
+            key = self._domains.get((domain, island)) if domain else None
+            if key and self.names_agree(normalized, normalize_name(key[0])):
+                return key
+
+            best, best_ratio = None, self.similarity_threshold
+            for candidate in self._blocks.get((self.block_key(normalized), island), ()):
+                matcher = SequenceMatcher(None, normalized, candidate)
+                if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                    continue
+                ratio = matcher.ratio()
+                if ratio >= best_ratio:
+                    best, best_ratio = candidate, ratio
+            return self._names[(best, island)] if best else None
+
+    def names_agree(self, first: str, second: str) -> bool:
+        """Whether two normalized names can belong to one company
+
+        True when either name's words include all of the other's ("aloha
+        tours" and "aloha tours hawaii") or they clear the similarity
+        threshold; branch names ("foodland kailua", "foodland beretania")
+        do neither.
+        """
+        first_words, second_words = set(first.split()), set(second.split())
+        if first_words <= second_words or second_words <= first_words:
+            return True
+        return SequenceMatcher(None, first, second).ratio() >= self.similarity_threshold
+
+    @staticmethod
+    def block_key(normalized: str) -> str:
+        """First three letters of the first two name tokens
+
+        Common leading words ("hawaii", "aloha") would otherwise put most
+        companies into one block.
+        """
+        return ' '.join(word[:3] for word in normalized.split()[:2])
+
+    def resolve(self, businesses: List[Dict[str, Any]]) -> int:
+        """Point each record at the company it duplicates
+
+        Records are matched against the index and against earlier records
+        of the same batch. Matched records take the stored name, so the
+        upsert and the (name, island) lookup hit the existing row. Nothing
+        is indexed here; call index() once the batch is written. Returns
+        how many records were merged into another company.
+        """
+        merged = 0
+        batch = EntityResolver(self.similarity_threshold)
+        with self._lock:
+            for business in businesses:
+                key = self.match(business) or batch.match(business)
+                if key is not None and key != (business.get('name'), business.get('island') or ''):
+                    logger.debug(f"Resolved {business.get('name')!r} to company {key[0]!r}")
+                    merged += 1
+                    business['name'] = key[0]
+                # Later records of the batch may duplicate this one
+                batch.add(business)
+        return merged
+
+    def index(self, businesses: Iterable[Dict[str, Any]]):
+        """Add written records, including their phones and domains, to the index"""
+        with self._lock:
+            for business in businesses:
+                self.add(business)
@@ -1,6 +1,8 @@
 import schedule
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -14,6 +16,7 @@ from scrapers.linkedin_scraper import LinkedInScraper
 # from scrapers.chamber_of_commerce_scraper import ChamberOfCommerceScraper
 from processors.data_processor import DataProcessor
 from services.database_service import DatabaseService
+from services.checkpoint_store import CheckpointStore
 
 load_dotenv()
 
@@ -45,8 +48,27 @@ class DataCollectionScheduler:
         # Combined for backward compatibility
         self.scrapers = {**self.demo_scrapers, **self.real_scrapers}
         
-    def run_collection(self, source='all'):
-        """Run data collection for specified source"""
+        # Sources are I/O bound, so several can scrape at once; each scraper
+        # keeps its own session and throttling
+        self.collection_workers = int(os.getenv('COLLECTION_WORKERS', 4))
+        
+        # Grid units fetched more recently than this are skipped, so runs
+        # resume where the last one stopped and rotate through the grid
+        self.checkpoint_freshness = float(os.getenv('CHECKPOINT_FRESHNESS_HOURS', 24)) * 3600
+        
+        # Overnight sweep of prospects whose inputs changed, as one batch job
+        self.nightly_analysis_limit = int(os.getenv('NIGHTLY_ANALYSIS_LIMIT', 5000))
+        self._reanalysis_lock = threading.Lock()
+        self.rollup_refresh_minutes = int(os.getenv('ANALYTICS_ROLLUP_REFRESH_MINUTES', 10))
+        
+    def run_collection(self, source='all', workers=None):
+        """Run data collection for specified source
+        
+        Sources are scraped concurrently on up to `workers` threads
+        (COLLECTION_WORKERS by default; 1 runs them one after another).
+        Each source's records are saved in micro-batches while it is still
+        scraping, so a failure late in a run keeps what was already found.
+        """
         start_time = datetime.now()
         total_found = 0
         total_processed = 0
@@ -56,35 +78,36 @@ class DataCollectionScheduler:
         
         try:
             if source == 'all':
-                sources_to_run = self.scrapers.keys()
+                sources_to_run = list(self.scrapers.keys())
             else:
                 sources_to_run = [source] if source in self.scrapers else []
                 
-            for scraper_name in sources_to_run:
-                logger.info(f"Starting collection for {scraper_name}")
-                scraper = self.scrapers[scraper_name]
+            workers = max(1, min(workers or self.collection_workers, len(sources_to_run)))
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='collector') as executor:
+                futures = {
+                    executor.submit(self._collect_source, scraper_name): scraper_name
+                    for scraper_name in sources_to_run
+                }
                 
-                try:
-                    # Scrape data
-                    raw_data = scraper.scrape()
-                    total_found += len(raw_data)
-                    
-                    # Process and save data
-                    processed_count, added_count = self.processor.process_businesses(
-                        raw_data, scraper_name
-                    )
+                for future in as_completed(futures):
+                    scraper_name = futures[future]
                     
-                    total_processed += processed_count
-                    total_added += added_count
-                    
-                    logger.info(f"Completed {scraper_name}: Found {len(raw_data)}, "
-                               f"Processed {processed_count}, Added {added_count}")
-                    
-                except Exception as e:
-                    errors += 1
-                    error_msg = f"Error in {scraper_name}: {str(e)}"
-                    error_details.append(error_msg)
-                    logger.error(error_msg)
+                    try:
+                        found_count, processed_count, added_count = future.result()
+                        
+                        total_found += found_count
+                        total_processed += processed_count
+                        total_added += added_count
+                        
+                        logger.info(f"Completed {scraper_name}: Found {found_count}, "
+                                   f"Processed {processed_count}, Added {added_count}")
+                        
+                    except Exception as e:
+                        errors += 1
+                        error_msg = f"Error in {scraper_name}: {str(e)}"
+                        error_details.append(error_msg)
+                        logger.error(error_msg)
                     
             # Log collection results
             duration = (datetime.now() - start_time).seconds
@@ -98,12 +121,16 @@ class DataCollectionScheduler:
                 duration_seconds=duration,
                 status='completed' if errors == 0 else 'completed_with_errors'
             )
+            logger.info(f"Database pool after {source} collection: {self.db_service.pool_metrics()}")
             
             # Analyze new prospects
             if total_added > 0:
                 logger.info(f"Analyzing {total_added} new prospects")
                 self.processor.analyze_new_prospects()
                 
+            if total_processed > 0:
+                self.refresh_rollups()
+                
         except Exception as e:
             logger.error(f"Critical error in data collection: {str(e)}")
             self.db_service.log_collection(
@@ -117,6 +144,29 @@ class DataCollectionScheduler:
                 status='failed'
             )
             
+    def _collect_source(self, scraper_name):
+        """Scrape and persist a single source; called from the collection worker pool
+        
+        Returns (found, processed, added) for the source.
+        """
+        logger.info(f"Starting collection for {scraper_name}")
+        scraper = self.scrapers[scraper_name]
+        
+        if getattr(scraper, 'cache_stats', None) is not None:
+            scraper.cache_stats = {'hits': 0, 'misses': 0}
+            
+        # Completed units are recorded only once their records are saved
+        checkpoints = CheckpointStore(self.db_service, scraper_name, self.checkpoint_freshness)
+        scraper.checkpoints = checkpoints
+        counts = self.processor.process_stream(scraper.iter_businesses(), scraper_name,
+                                               on_batch=checkpoints.flush)
+        
+        cache_stats = getattr(scraper, 'cache_stats', None)
+        if cache_stats is not None:
+            logger.info(f"HTTP cache for {scraper_name}: {cache_stats['hits']} hits, "
+                       f"{cache_stats['misses']} misses")
+        return counts
+        
     def daily_collection(self):
         """Run daily data collection"""
         logger.info("Starting daily data collection")
@@ -127,10 +177,38 @@ class DataCollectionScheduler:
         logger.info("Starting hourly quick scan")
         self.run_collection('hawaii_business_news')
         
+    def nightly_reanalysis(self):
+        """Analyze every prospect flagged needs_analysis as a Message Batches job
+        
+        Runs in a background thread because batches take minutes to hours
+        to end and the scheduler loop must keep running meanwhile.
+        """
+        if not self._reanalysis_lock.acquire(blocking=False):
+            logger.info("Previous nightly re-analysis still running, skipping")
+            return
+            
+        def run():
+            try:
+                logger.info("Starting nightly bulk re-analysis")
+                # Waits for a post-collection sweep that is still running
+                self.processor.analyze_new_prospects(limit=self.nightly_analysis_limit, bulk=True, wait=True)
+            except Exception as e:
+                logger.error(f"Error in nightly re-analysis: {str(e)}")
+            finally:
+                self._reanalysis_lock.release()
+                
+        threading.Thread(target=run, name='nightly-reanalysis', daemon=True).start()
+        
+    def refresh_rollups(self):
+        """Bring the analytics rollups up to date with prospect and company writes"""
+        if self.db_service.refresh_analytics_rollups():
+            logger.info("Analytics rollups refreshed")
+            
     def weekly_analytics(self):
         """Generate weekly analytics snapshot"""
         logger.info("Generating weekly analytics snapshot")
         try:
+            self.refresh_rollups()
             self.db_service.create_analytics_snapshot()
             logger.info("Analytics snapshot created successfully")
         except Exception as e:
@@ -155,7 +233,9 @@ class DataCollectionScheduler:
         schedule.every().day.at("06:00").do(self.daily_collection)
         schedule.every().day.at("18:00").do(self.daily_collection)
         schedule.every().hour.do(self.hourly_quick_scan)
+        schedule.every().day.at("01:00").do(self.nightly_reanalysis)
         schedule.every().monday.at("09:00").do(self.weekly_analytics)
+        schedule.every(self.rollup_refresh_minutes).minutes.do(self.refresh_rollups)
         
         # Run initial collection
         self.daily_collection()
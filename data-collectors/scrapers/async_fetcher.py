@@ -0,0 +1,136 @@
+"""
+Asyncio fetch layer shared by the scrapers
+Per-host token buckets replace blanket sleeps, and a semaphore bounds how
+many requests are in flight at once.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out wait times instead of blocking
+
+    Callers reserve a token and sleep for the returned delay themselves, so
+    the same bucket works from threads (time.sleep) and event loops
+    (asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+_host_buckets: Dict[str, TokenBucket] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def host_bucket(url: str) -> TokenBucket:
+    """Get the process-wide rate limiter for the host of a URL"""
+    host = urlparse(url).netloc.lower()
+
+    with _host_buckets_lock:
+        if host not in _host_buckets:
+            delay = float(os.getenv('SCRAPER_DELAY', 2))
+            _host_buckets[host] = TokenBucket(
+                rate=1.0 / delay if delay > 0 else 1e9,
+                capacity=float(os.getenv('SCRAPER_HOST_BURST', 1))
+            )
+        return _host_buckets[host]
+
+
+class FetchedPage(NamedTuple):
+    status: int
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class AsyncFetcher:
+    """Fetch many URLs concurrently over one pooled aiohttp session"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None,
+                 max_concurrency: Optional[int] = None, timeout: int = 30):
+        self.headers = headers or {}
+        self.max_concurrency = max_concurrency or int(os.getenv('SCRAPER_MAX_CONCURRENCY', 8))
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+        """Fetch a URL, waiting for its host's rate limit first
+        
+        A 304 Not Modified comes back as a page with an empty body.
+        """
+        delay = host_bucket(url).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+        async with self._semaphore:
+            logger.info(f"Fetching URL: {url}")
+            async with self._session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    return FetchedPage(304, b'', response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                response.raise_for_status()
+                return FetchedPage(
+                    response.status,
+                    await response.read(),
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
+
+    async def fetch_many(self, urls: List[str],
+                         headers: Optional[List[Dict[str, str]]] = None) -> List[Optional[FetchedPage]]:
+        """Fetch URLs concurrently; failed URLs come back as None"""
+        headers = headers or [{} for _ in urls]
+        results = await asyncio.gather(
+            *(self.fetch(url, url_headers) for url, url_headers in zip(urls, headers)),
+            return_exceptions=True
+        )
+
+        pages = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error fetching {url}: {str(result)}")
+                pages.append(None)
+            else:
+                pages.append(result)
+        return pages
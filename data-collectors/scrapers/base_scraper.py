@@ -1,14 +1,23 @@
+import asyncio
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import requests
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
 import os
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.business_classifier import classify_business
+from backend.services.page_parser import parse_page, ParsedPage
+from .async_fetcher import AsyncFetcher, host_bucket
+from .response_cache import get_response_cache
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -26,24 +35,166 @@ class BaseScraper(ABC):
         self.session.headers.update({
             'User-Agent': self.user_agent.random
         })
+        # Shared on-disk cache used to revalidate pages with ETag/Last-Modified
+        self.cache = get_response_cache()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        # Grid scrapers fetch at most this many (location, category, page)
+        # units per run; the scheduler attaches a CheckpointStore so each run
+        # picks up the stalest units and skips fresh ones
+        self.units_per_run = int(os.getenv('COLLECTION_UNITS_PER_RUN', 12))
+        self.checkpoints = None
+        # Pages fetched with only_if_changed that are cached once their
+        # records are saved (see complete_page)
+        self._uncached: Dict[str, Tuple[bytes, Optional[str], Optional[str]]] = {}
+        
+    def fetch_page(self, url: str, only_if_changed: bool = False) -> Optional[BeautifulSoup]:
+        """Fetch and parse a web page with retry logic
+        
+        Cached pages are revalidated with a conditional GET. With
+        only_if_changed=True an unchanged page (HTTP 304) returns None
+        so the caller can skip it without parsing; such pages are only
+        cached when the caller reports them with complete_page().
+        """
+        body = self._fetch_body(url, only_if_changed)
+        return BeautifulSoup(body, 'html.parser') if body is not None else None
+        
+    def fetch_document(self, url: str, only_if_changed: bool = False) -> Optional[ParsedPage]:
+        """Like fetch_page, but parsed with the fast page parser
+        
+        For scrapers that only need text, meta tags, JSON-LD or links;
+        see backend/services/page_parser.py.
+        """
+        body = self._fetch_body(url, only_if_changed)
+        return parse_page(body) if body is not None else None
         
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def fetch_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse a web page with retry logic"""
+    def _fetch_body(self, url: str, only_if_changed: bool) -> Optional[bytes]:
+        """Raw body of url, revalidating any cached copy"""
         try:
+            # Respect the per-host rate limit shared with the async fetcher
+            time.sleep(host_bucket(url).reserve())
             logger.info(f"Fetching URL: {url}")
-            response = self.session.get(url, timeout=30)
+            # Keep the entry the validators came from: it may be evicted
+            # or expire before the 304 arrives
+            cached = self.cache.get(url) if self.cache else None
+            headers = self.cache.validator_headers(cached) if cached else {}
+            response = self.session.get(url, timeout=30, headers=headers)
+            
+            if response.status_code == 304:
+                if cached is None:
+                    # Unsolicited 304; ask again for the full body
+                    response = self.session.get(url, timeout=30)
+                else:
+                    self._revalidated(url)
+                    return None if only_if_changed else cached.body
+                
             response.raise_for_status()
-            time.sleep(self.delay)  # Respect rate limits
-            return BeautifulSoup(response.content, 'html.parser')
+            self._store_response(url, response.content, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), defer=only_if_changed)
+            return response.content
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             raise
             
+    async def fetch_pages_async(self, urls: List[str],
+                                only_if_changed: bool = False) -> List[Optional[BeautifulSoup]]:
+        """Fetch and parse several pages concurrently
+        
+        Requests are rate limited per host and bounded by
+        SCRAPER_MAX_CONCURRENCY overall. Pages that still fail after
+        retries come back as None, as do unchanged pages when
+        only_if_changed is set.
+        """
+        # Entries the validators came from, kept in case they are evicted
+        # or expire before their 304 arrives
+        cached = [self.cache.get(url) if self.cache else None for url in urls]
+        headers = [self.cache.validator_headers(entry) if entry else {} for entry in cached]
+        async with AsyncFetcher(headers=dict(self.session.headers)) as fetcher:
+            pages = await fetcher.fetch_many(urls, headers)
+            
+            # Unsolicited 304s (no validators sent): ask again for the body
+            refetch = [
+                i for i, page in enumerate(pages)
+                if page is not None and page.status == 304 and cached[i] is None
+            ]
+            if refetch:
+                for i, page in zip(refetch, await fetcher.fetch_many([urls[i] for i in refetch])):
+                    pages[i] = page
+            
+        soups = []
+        for url, page, entry in zip(urls, pages, cached):
+            if page is None or (page.status == 304 and entry is None):
+                soups.append(None)
+            elif page.status == 304:
+                self._revalidated(url)
+                soups.append(None if only_if_changed else BeautifulSoup(entry.body, 'html.parser'))
+            else:
+                self._store_response(url, page.body, page.etag, page.last_modified, defer=only_if_changed)
+                soups.append(BeautifulSoup(page.body, 'html.parser'))
+        return soups
+        
+    def fetch_pages(self, urls: List[str], only_if_changed: bool = False) -> List[Optional[BeautifulSoup]]:
+        """Synchronous wrapper around fetch_pages_async for scrape() methods"""
+        if not urls:
+            return []
+        return asyncio.run(self.fetch_pages_async(urls, only_if_changed))
+        
+    def _revalidated(self, url: str):
+        """Record a 304 for url; the caller already holds the cached body"""
+        self.cache_stats['hits'] += 1
+        self.cache.touch(url)
+        
+    def _store_response(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+                        defer: bool = False):
+        """Record a full download for url and cache it for revalidation
+        
+        Deferred responses wait for complete_page(): once cached, a page is
+        skipped as unchanged, so caching it before its records are saved
+        would lose them if the run dies in between.
+        """
+        self.cache_stats['misses'] += 1
+        if not self.cache:
+            return
+        if defer:
+            self._uncached[url] = (body, etag, last_modified)
+        else:
+            self.cache.put(url, body, etag, last_modified)
+            
+    def complete_page(self, url: str):
+        """Cache a page fetched with only_if_changed after its records were yielded
+        
+        With a CheckpointStore attached the write waits for its next
+        flush(), i.e. until the records are saved.
+        """
+        response = self._uncached.pop(url, None)
+        if response is None or not self.cache:
+            return
+        if self.checkpoints is not None:
+            self.checkpoints.after_flush(lambda: self.cache.put(url, *response))
+        else:
+            self.cache.put(url, *response)
+            
+    def plan_units(self, units: List[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+        """Search units to fetch this run: due ones, stalest first, capped at units_per_run"""
+        if self.checkpoints is not None:
+            units = self.checkpoints.due(units)
+        return units[:self.units_per_run]
+        
+    def complete_unit(self, unit: Tuple[str, str, int], records_found: int = 0):
+        """Checkpoint a finished search unit"""
+        if self.checkpoints is not None:
+            self.checkpoints.complete(unit, records_found)
+            
     @abstractmethod
+    def iter_businesses(self) -> Iterator[Dict[str, Any]]:
+        """Yield businesses as they are scraped
+        
+        Callers can persist records while the run is still going.
+        """
+        
     def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method to be implemented by subclasses"""
-        pass
+        """Scrape everything and return it as a list"""
+        return list(self.iter_businesses())
         
     @abstractmethod
     def parse_business_info(self, element: Any) -> Dict[str, Any]:
@@ -61,46 +212,23 @@ class BaseScraper(ABC):
             return ""
         return ' '.join(text.strip().split())
         
+    def classify(self, address: str, description: str = "", name: str = "") -> Tuple[str, str]:
+        """(island, industry) of a listing from one classifier pass over all its text
+        
+        Use this instead of determine_island plus determine_industry when a
+        listing needs both, so its text is tokenized and scanned once.
+        """
+        result = classify_business(address, description, name)
+        return result.island or "Unknown", result.industry or "Other"
+        
     def determine_island(self, address: str) -> str:
         """Determine which Hawaiian island based on address"""
-        if not address:
-            return "Unknown"
-            
-        address_lower = address.lower()
-        island_keywords = {
-            'Oahu': ['honolulu', 'pearl city', 'kailua', 'kaneohe', 'waipahu', 'mililani', 'aiea', 'ewa'],
-            'Maui': ['kahului', 'kihei', 'lahaina', 'wailuku', 'makawao', 'paia', 'haiku'],
-            'Big Island': ['hilo', 'kona', 'kailua-kona', 'waimea', 'pahoa', 'kamuela'],
-            'Kauai': ['lihue', 'kapaa', 'princeville', 'poipu', 'hanapepe', 'waimea'],
-            'Molokai': ['kaunakakai', 'maunaloa'],
-            'Lanai': ['lanai city']
-        }
-        
-        for island, keywords in island_keywords.items():
-            if any(keyword in address_lower for keyword in keywords):
-                return island
-                
-        return "Unknown"
+        return classify_business(address).island or "Unknown"
+        
+    def extract_island(self, text: str) -> Optional[str]:
+        """Extract island from free text, or None if no island is mentioned"""
+        return classify_business(text).island
         
     def determine_industry(self, description: str, name: str = "") -> str:
         """Determine industry based on business description and name"""
-        text = f"{description} {name}".lower()
-        
-        industry_keywords = {
-            'Tourism': ['tour', 'tourist', 'visitor', 'sightseeing', 'activity', 'excursion'],
-            'Hospitality': ['hotel', 'resort', 'accommodation', 'lodging', 'bed and breakfast', 'vacation rental'],
-            'Agriculture': ['farm', 'ranch', 'agricultural', 'crop', 'livestock', 'aquaculture'],
-            'Retail': ['store', 'shop', 'boutique', 'mall', 'retail', 'merchandise'],
-            'Healthcare': ['hospital', 'clinic', 'medical', 'health', 'doctor', 'dental', 'pharmacy'],
-            'Real Estate': ['realty', 'property', 'real estate', 'broker', 'development', 'construction'],
-            'Technology': ['software', 'tech', 'it', 'computer', 'digital', 'app', 'saas'],
-            'Food Service': ['restaurant', 'cafe', 'food', 'dining', 'catering', 'bakery'],
-            'Transportation': ['transport', 'shipping', 'freight', 'logistics', 'delivery', 'moving'],
-            'Professional Services': ['consulting', 'accounting', 'legal', 'law', 'marketing', 'design']
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return industry
-                
-        return "Other"
\ No newline at end of file
+        return classify_business(description, name).industry or "Other"
\ No newline at end of file
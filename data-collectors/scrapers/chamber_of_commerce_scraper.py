@@ -5,7 +5,7 @@ Extracts member business data from Chamber of Commerce Hawaii directory
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -36,7 +36,7 @@ class ChamberOfCommerceScraper(BaseScraper):
             'Transportation', 'Education', 'Non-Profit'
         ]
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape Chamber of Commerce directory"""
         all_companies = []
         
@@ -44,7 +44,8 @@ class ChamberOfCommerceScraper(BaseScraper):
             # Try API approach first
             companies = self._scrape_via_api()
             if companies:
-                return companies
+                yield from companies
+                return
                 
             # Fallback to HTML scraping
             logger.info("API approach failed, trying HTML scraping...")
@@ -69,7 +70,7 @@ class ChamberOfCommerceScraper(BaseScraper):
             if company['name'] not in unique_companies:
                 unique_companies[company['name']] = company
                 
-        return list(unique_companies.values())
+        yield from unique_companies.values()
     
     def _scrape_via_api(self) -> List[Dict]:
         """Try to scrape using the API endpoint"""
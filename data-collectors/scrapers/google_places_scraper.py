@@ -5,7 +5,7 @@ Requires Google Places API key to be set in environment variables
 
 import os
 import json
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator
 import logging
 import time
 import requests
@@ -55,37 +55,41 @@ class GooglePlacesScraper(BaseScraper):
             'travel_agency'
         ]
         
-    def scrape(self) -> List[Dict]:
-        """Scrape Google Places for Hawaii businesses"""
+    def iter_businesses(self) -> Iterator[Dict]:
+        """Scrape Google Places for Hawaii businesses, yielding each new one as found"""
         if not self.api_key:
             logger.error("Cannot scrape Google Places without API key")
-            return []
+            return
             
-        all_companies = []
+        seen = set()
+        locations = {location['name']: location for location in self.locations}
+        units = [(location['name'], business_type, 1)
+                 for location in self.locations for business_type in self.business_types]
         
-        # Search each location for various business types
-        for location in self.locations[:3]:  # Limit to conserve API quota
-            for business_type in self.business_types[:4]:  # Limit types
-                logger.info(f"Searching Google Places for {business_type} near {location['name']}")
+        # Search each location for various business types; capped per run
+        # (units_per_run) to conserve API quota
+        for unit in self.plan_units(units):
+            location, business_type = locations[unit[0]], unit[1]
+            logger.info(f"Searching Google Places for {business_type} near {location['name']}")
+            
+            try:
+                companies = self._search_nearby(location, business_type)
                 
-                try:
-                    companies = self._search_nearby(location, business_type)
-                    all_companies.extend(companies)
-                    
-                    # Respect API rate limits
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {business_type} in {location['name']}: {e}")
-        
-        # Remove duplicates
-        unique_companies = {}
-        for company in all_companies:
-            if company.name not in unique_companies:
-                unique_companies[company.name] = company
+                # Remove duplicates
+                for company in companies:
+                    if company['name'] not in seen:
+                        seen.add(company['name'])
+                        yield company
+                        
+                self.complete_unit(unit, len(companies))
+                
+                # Respect API rate limits
+                time.sleep(1)
                 
-        logger.info(f"Found {len(unique_companies)} unique businesses from Google Places")
-        return list(unique_companies.values())
+            except Exception as e:
+                logger.error(f"Error searching {business_type} in {location['name']}: {e}")
+        
+        logger.info(f"Found {len(seen)} unique businesses from Google Places")
     
     def _search_nearby(self, location: Dict, business_type: str) -> List[Dict]:
         """Search for businesses near a location"""
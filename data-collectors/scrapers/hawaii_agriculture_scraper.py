@@ -5,7 +5,7 @@ Extracts agricultural business data from farming associations and ag directories
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -75,7 +75,7 @@ class HawaiiAgricultureScraper(BaseScraper):
             'livestock', 'dairy', 'aquaculture', 'organic farming'
         ]
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape all agricultural sources"""
         all_companies = []
         
@@ -94,7 +94,7 @@ class HawaiiAgricultureScraper(BaseScraper):
             if company['name'] not in unique_companies:
                 unique_companies[company['name']] = company
                 
-        return list(unique_companies.values())
+        yield from unique_companies.values()
     
     def _scrape_ag_source(self, source: Dict) -> List[Dict]:
         """Scrape a specific agricultural source"""
@@ -433,21 +433,8 @@ class HawaiiAgricultureScraper(BaseScraper):
         if not products:
             return 'Oahu'
             
-        products = products.lower()
-        
-        # Product-island associations
-        if 'kona coffee' in products:
-            return 'Big Island'
-        elif 'maui onion' in products or 'upcountry' in products:
-            return 'Maui'
-        elif 'taro' in products and 'hanalei' in products:
-            return 'Kauai'
-        elif 'molokai' in products:
-            return 'Molokai'
-        elif 'pineapple' in products and 'lanai' in products:
-            return 'Lanai'
-            
-        return 'Oahu'  # Default
+        # Product names carry the region (kona coffee, maui onion, hanalei taro)
+        return self.extract_island(products) or 'Oahu'
     
     def _determine_island_for_product(self, product: str, location: str) -> str:
         """Determine island based on product type and location"""
@@ -5,7 +5,7 @@ Extracts business registration data from Hawaii's official business portal
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -25,7 +25,7 @@ class HawaiiBusinessExpressScraper(BaseScraper):
         self.base_url = "https://hbe.hawaii.gov"
         self.search_url = "https://hbe.hawaii.gov/documents/search.html"
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape business registrations from Hawaii Business Express"""
         companies = []
         
@@ -48,11 +48,10 @@ class HawaiiBusinessExpressScraper(BaseScraper):
                 if company['name'] not in unique_companies:
                     unique_companies[company['name']] = company
                     
-            return list(unique_companies.values())
+            yield from unique_companies.values()
             
         except Exception as e:
             logger.error(f"Error scraping Hawaii Business Express: {e}")
-            return []
     
     def _search_businesses(self, search_term: str) -> List[Dict]:
         """Search for businesses with specific term"""
@@ -6,7 +6,7 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 import logging
 from .base_scraper import BaseScraper
 
@@ -23,7 +23,7 @@ class HawaiiBusinessFinder(BaseScraper):
         """Parse business info - just return as-is since we're already formatting"""
         return raw_data
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape businesses from multiple sources"""
         companies = []
         
@@ -44,7 +44,7 @@ class HawaiiBusinessFinder(BaseScraper):
                 seen.add(company['name'])
                 unique.append(company)
         
-        return unique
+        yield from unique
     
     def _scrape_hawaii_business_magazine(self) -> List[Dict]:
         """Scrape from Hawaii Business Magazine top companies"""
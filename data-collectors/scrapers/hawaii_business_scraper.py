@@ -1,8 +1,8 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 from bs4 import BeautifulSoup
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ParsedPage
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,46 +18,61 @@ class HawaiiBusinessNewsScraper(BaseScraper):
             "https://www.bizjournals.com/pacific/"
         ]
         
-    def scrape(self) -> List[Dict[str, Any]]:
+    def iter_businesses(self) -> Iterator[Dict[str, Any]]:
         """Scrape business news for company mentions and growth signals"""
-        all_businesses = []
-        
         for base_url in self.base_urls:
             try:
-                businesses = self._scrape_source(base_url)
-                all_businesses.extend(businesses)
+                yield from self._scrape_source(base_url)
             except Exception as e:
                 logger.error(f"Error scraping {base_url}: {str(e)}")
                 
-        return all_businesses
-        
-    def _scrape_source(self, base_url: str) -> List[Dict[str, Any]]:
-        """Scrape a specific news source"""
-        businesses = []
-        
+    def _scrape_source(self, base_url: str) -> Iterator[Dict[str, Any]]:
+        """Scrape a specific news source
+        
+        Each page is marked complete only after its records are yielded,
+        and the front page only after all of its articles, so a run that
+        dies before they are saved refetches them next time instead of
+        skipping them as unchanged.
+        """
         # This is a simplified version - in production, you'd implement
         # proper pagination and article parsing
-        soup = self.fetch_page(base_url)
+        # Only links are needed from the front page, so skip BeautifulSoup
+        page = self.fetch_document(base_url, only_if_changed=True)
+        if page is None:
+            # Front page unchanged since the last run, so are its articles
+            logger.info(f"{base_url} not modified, skipping")
+            return
         
         # Find article links
-        article_links = self._extract_article_links(soup, base_url)
+        article_links = self._extract_article_links(page, base_url)
+        
+        # Fetch the articles concurrently; limit to 10 for demo
+        article_links = article_links[:10]
+        article_soups = self.fetch_pages(article_links, only_if_changed=True)
         
-        for link in article_links[:10]:  # Limit to 10 articles for demo
+        complete = True
+        for link, article_soup in zip(article_links, article_soups):
+            if article_soup is None:
+                continue
+                
             try:
-                article_businesses = self._extract_businesses_from_article(link)
-                businesses.extend(article_businesses)
+                article_businesses = self._extract_businesses_from_article(link, article_soup)
             except Exception as e:
                 logger.error(f"Error processing article {link}: {str(e)}")
-                
-        return businesses
+                complete = False
+                continue
+            yield from article_businesses
+            self.complete_page(link)
+            
+        if complete:
+            self.complete_page(base_url)
         
-    def _extract_article_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def _extract_article_links(self, page: ParsedPage, base_url: str) -> List[str]:
         """Extract article links from the main page"""
         links = []
         
         # Generic article link patterns
-        for a in soup.find_all('a', href=True):
-            href = a['href']
+        for href, _ in page.anchors():
             if any(pattern in href for pattern in ['/article/', '/news/', '/story/']):
                 if href.startswith('http'):
                     links.append(href)
@@ -66,12 +81,14 @@ class HawaiiBusinessNewsScraper(BaseScraper):
                     
         return list(set(links))  # Remove duplicates
         
-    def _extract_businesses_from_article(self, article_url: str) -> List[Dict[str, Any]]:
+    def _extract_businesses_from_article(self, article_url: str,
+                                         soup: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
         """Extract business mentions from a news article"""
         businesses = []
         
         try:
-            soup = self.fetch_page(article_url)
+            if soup is None:
+                soup = self.fetch_page(article_url)
             article_text = self._extract_article_text(soup)
             
             # Extract company names using patterns
@@ -157,12 +174,14 @@ class HawaiiBusinessNewsScraper(BaseScraper):
         if employee_match:
             employee_count = int(employee_match.group(1))
             
+        island, industry = self.classify(location, text, name)
+        
         return {
             'name': name,
             'source': self.source_name,
             'source_url': data.get('url', ''),
-            'island': self.determine_island(location),
-            'industry': self.determine_industry(text, name),
+            'island': island,
+            'industry': industry,
             'description': text[:500] + '...' if len(text) > 500 else text,
             'growth_signals': growth_signals,
             'employee_count_estimate': employee_count,
@@ -5,7 +5,7 @@ Extracts tech company data from Hawaii tech organizations and directories
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -54,7 +54,7 @@ class HawaiiTechScraper(BaseScraper):
             }
         ]
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape all tech sources"""
         all_companies = []
         
@@ -69,7 +69,7 @@ class HawaiiTechScraper(BaseScraper):
             if company['name'] not in unique_companies:
                 unique_companies[company['name']] = company
                 
-        return list(unique_companies.values())
+        yield from unique_companies.values()
     
     def _scrape_tech_source(self, source: Dict) -> List[Dict]:
         """Scrape a specific tech source"""
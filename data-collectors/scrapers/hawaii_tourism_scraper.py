@@ -5,7 +5,7 @@ Extracts tourism-related business data from HTA and tourism directories
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -44,7 +44,7 @@ class HawaiiTourismScraper(BaseScraper):
             }
         ]
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Scrape all tourism sources"""
         all_companies = []
         
@@ -69,7 +69,7 @@ class HawaiiTourismScraper(BaseScraper):
             if company['name'] not in unique_companies:
                 unique_companies[company['name']] = company
                 
-        return list(unique_companies.values())
+        yield from unique_companies.values()
     
     def _scrape_source(self, source: Dict) -> List[Dict]:
         """Scrape a specific tourism source"""
@@ -325,21 +325,7 @@ class HawaiiTourismScraper(BaseScraper):
         if not text:
             return None
             
-        text = text.lower()
-        island_keywords = {
-            'oahu': ['oahu', 'honolulu', 'waikiki', 'pearl harbor'],
-            'maui': ['maui', 'lahaina', 'kihei', 'haleakala'],
-            'big island': ['big island', 'hawaii island', 'kona', 'hilo', 'kailua-kona'],
-            'kauai': ['kauai', 'lihue', 'poipu', 'princeville'],
-            'molokai': ['molokai'],
-            'lanai': ['lanai']
-        }
-        
-        for island, keywords in island_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return island.title()
-                
-        return None
+        return self.extract_island(text)
     
     def _extract_room_count(self, text: str) -> Optional[int]:
         """Extract number of rooms from text"""
@@ -353,19 +339,8 @@ class HawaiiTourismScraper(BaseScraper):
         if not activities:
             return 'Oahu'
             
-        activities = activities.lower()
-        
-        # Island-specific activities
-        if 'pearl harbor' in activities or 'diamond head' in activities:
-            return 'Oahu'
-        elif 'haleakala' in activities or 'road to hana' in activities:
-            return 'Maui'
-        elif 'volcano' in activities or 'mauna kea' in activities:
-            return 'Big Island'
-        elif 'napali' in activities or 'waimea canyon' in activities:
-            return 'Kauai'
-            
-        return 'Oahu'  # Default
+        # Landmarks (pearl harbor, haleakala, waimea canyon) identify the island
+        return self.extract_island(activities) or 'Oahu'
     
     def _extract_website(self, element) -> Optional[str]:
         """Extract website URL from element"""
@@ -8,7 +8,7 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import random
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import logging
 from urllib.parse import quote
 
@@ -155,30 +155,18 @@ class LinkedInScraper(BaseScraper):
         
         return company
     
-    def scrape(self) -> List[Dict]:
-        """Main scrape method called by scheduler"""
+    def iter_businesses(self) -> Iterator[Dict]:
+        """Main scrape method called by scheduler; yields each company once enriched"""
         logger.info("Starting LinkedIn scraper for Hawaii companies")
-        return self._scrape_linkedin_hawaii_companies()
+        yield from self._scrape_linkedin_hawaii_companies()
     
-    def _scrape_linkedin_hawaii_companies(self) -> List[Dict]:
+    def _scrape_linkedin_hawaii_companies(self) -> Iterator[Dict]:
         """Internal method to scrape LinkedIn for Hawaii companies"""
-        all_companies = []
+        seen = set()
         
         # Search for companies by island
         islands = ['Oahu', 'Maui', 'Big Island', 'Kauai']
         
-        for island in islands:
-            logger.info(f"Searching for companies in {island}")
-            companies = self.search_hawaii_companies(island=island)
-            
-            # Enrich data for each company
-            for company in companies:
-                enriched = self.enrich_company_data(company)
-                all_companies.append(enriched)
-            
-            # Be respectful of rate limits
-            time.sleep(random.uniform(5, 10))
-        
         # Also search for specific Hawaii-focused industries
         hawaii_industries = [
             'tourism', 'hospitality', 'resort', 'hotel',
@@ -190,37 +178,43 @@ class LinkedInScraper(BaseScraper):
             'technology', 'software'
         ]
         
-        for industry in hawaii_industries[:5]:  # Limit to 5 industries for now
-            logger.info(f"Searching for {industry} companies in Hawaii")
-            companies = self.search_hawaii_companies(industry=industry)
+        units = [(island, '', 1) for island in islands] + \
+                [('', industry, 1) for industry in hawaii_industries]
+        
+        for unit in self.plan_units(units):
+            island, industry = unit[0] or None, unit[1] or None
+            if island:
+                logger.info(f"Searching for companies in {island}")
+            else:
+                logger.info(f"Searching for {industry} companies in Hawaii")
+            companies = self.search_hawaii_companies(island=island, industry=industry)
             
+            # Enrich data for each company we don't already have
             for company in companies:
-                # Check if we already have this company
-                if not any(c['name'] == company['name'] for c in all_companies):
-                    enriched = self.enrich_company_data(company)
-                    all_companies.append(enriched)
+                if company['name'] not in seen:
+                    seen.add(company['name'])
+                    yield self._to_business(self.enrich_company_data(company))
+                    
+            self.complete_unit(unit, len(companies))
             
+            # Be respectful of rate limits
             time.sleep(random.uniform(5, 10))
         
-        logger.info(f"Found {len(all_companies)} total companies")
-        
-        # Transform to match expected format
-        businesses = []
-        for company in all_companies:
-            business = {
-                'name': company['name'],
-                'address': f"{company['location']}, Hawaii",
-                'island': company['island'],
-                'industry': company.get('meta_description', 'Business Services')[:100] if 'meta_description' in company else 'Business Services',
-                'website': company.get('linkedin_url', ''),
-                'description': company.get('description_snippet', ''),
-                'employee_count_estimate': company.get('employee_count_indicator', ''),
-                'source': 'LinkedIn',
-                'source_url': company.get('linkedin_url', '')
-            }
-            businesses.append(business)
+        logger.info(f"Found {len(seen)} total companies")
         
-        return businesses
+    def _to_business(self, company: Dict) -> Dict:
+        """Transform to match expected format"""
+        return {
+            'name': company['name'],
+            'address': f"{company['location']}, Hawaii",
+            'island': company['island'],
+            'industry': company.get('meta_description', 'Business Services')[:100] if 'meta_description' in company else 'Business Services',
+            'website': company.get('linkedin_url', ''),
+            'description': company.get('description_snippet', ''),
+            'employee_count_estimate': company.get('employee_count_indicator', ''),
+            'source': 'LinkedIn',
+            'source_url': company.get('linkedin_url', '')
+        }
     
     def parse_business_info(self, element):
         """Required by base class - not used in this implementation"""
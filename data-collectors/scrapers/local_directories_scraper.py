@@ -5,7 +5,7 @@ Extracts business data from various local Hawaiian directories and yellow pages
 
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
@@ -61,9 +61,9 @@ class LocalDirectoriesScraper(BaseScraper):
             'property-management', 'insurance-agencies', 'banks'
         ]
         
-    def scrape(self) -> List[Dict]:
-        """Scrape all local directories"""
-        all_companies = []
+    def iter_businesses(self) -> Iterator[Dict]:
+        """Scrape all local directories, yielding each new business as found"""
+        seen = set()
         
         for directory in self.directories:
             logger.info(f"Scraping {directory['name']}...")
@@ -75,42 +75,43 @@ class LocalDirectoriesScraper(BaseScraper):
                 # General directory
                 companies = self._scrape_general_directory(directory)
                 
-            all_companies.extend(companies)
-        
-        # Remove duplicates
-        unique_companies = {}
-        for company in all_companies:
-            if company['name'] not in unique_companies:
-                unique_companies[company['name']] = company
-                
-        return list(unique_companies.values())
+            # Remove duplicates
+            for company in companies:
+                if company['name'] not in seen:
+                    seen.add(company['name'])
+                    yield company
     
-    def _scrape_location_directory(self, directory: Dict) -> List[Dict]:
-        """Scrape location-based directories like Yellow Pages"""
-        companies = []
+    def _scrape_location_directory(self, directory: Dict) -> Iterator[Dict]:
+        """Scrape location-based directories like Yellow Pages, one search at a time"""
+        # Units are keyed by directory and city, since directories share cities
+        locations = {f"{directory['name']}: {location['city']}": location for location in directory['locations']}
+        units = [(key, category, 1) for key in locations for category in self.target_categories]
         
-        for location in directory['locations']:
-            for category in self.target_categories[:5]:  # Limit categories to avoid overload
-                try:
-                    # Build search URL
-                    search_url = f"{directory['base_url']}search?search_terms={category}&geo_location_terms={location['city']}+{location['state']}"
+        # Capped per run (units_per_run) to avoid overload
+        for unit in self.plan_units(units):
+            location, category = locations[unit[0]], unit[1]
+            try:
+                # Build search URL
+                search_url = f"{directory['base_url']}search?search_terms={category}&geo_location_terms={location['city']}+{location['state']}"
+                
+                response = self.session.get(search_url, timeout=30)
+                if response.status_code == 200:
+                    soup = BeautifulSoup(response.text, 'html.parser')
                     
-                    response = self.session.get(search_url, timeout=30)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        # Extract business listings
-                        listings = soup.find_all('div', class_=['result', 'listing', 'business-card'])
-                        
-                        for listing in listings[:10]:  # Limit per category/location
-                            company = self._extract_yellowpages_listing(listing, location)
-                            if company:
-                                companies.append(company)
-                                
-                except Exception as e:
-                    logger.debug(f"Error scraping {location['city']} {category}: {e}")
+                    # Extract business listings
+                    listings = soup.find_all('div', class_=['result', 'listing', 'business-card'])
                     
-        return companies
+                    companies = []
+                    for listing in listings[:10]:  # Limit per category/location
+                        company = self._extract_yellowpages_listing(listing, location)
+                        if company:
+                            companies.append(company)
+                            
+                    yield from companies
+                    self.complete_unit(unit, len(companies))
+                    
+            except Exception as e:
+                logger.debug(f"Error scraping {location['city']} {category}: {e}")
     
     def _scrape_general_directory(self, directory: Dict) -> List[Dict]:
         """Scrape general Hawaii business directories"""
@@ -0,0 +1,151 @@
+"""
+Persistent HTTP response cache for the scrapers
+Stores response bodies with their ETag/Last-Modified validators in a local
+SQLite file so repeat runs can revalidate instead of re-downloading.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'http_responses.db'
+)
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    """URL-keyed response cache with age- and size-based eviction"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024 * 1024,
+                 max_age: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Get a cached response, dropping it if it is older than max_age"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if not row:
+                return None
+
+            if time.time() - row[4] > self.max_age:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+
+            return CachedResponse(url=row[0], body=row[1], etag=row[2], last_modified=row[3], fetched_at=row[4])
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match/If-Modified-Since headers for a cached URL"""
+        return self.validator_headers(self.get(url))
+
+    @staticmethod
+    def validator_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """If-None-Match/If-Modified-Since headers for a cached response"""
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        return headers
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """Store a response; only responses with validators are worth keeping"""
+        if not (etag or last_modified) or len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO responses
+                    (url, etag, last_modified, body, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, body, len(body), now, now))
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """Mark a cached response as revalidated (HTTP 304)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones over max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE fetched_at < ?", (time.time() - self.max_age,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None if HTTP_CACHE_ENABLED is off"""
+    global _cache
+
+    if os.getenv('HTTP_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ResponseCache(
+                    path=os.getenv('HTTP_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    max_bytes=int(os.getenv('HTTP_CACHE_MAX_MB', 256)) * 1024 * 1024,
+                    max_age=float(os.getenv('HTTP_CACHE_MAX_AGE_HOURS', 168)) * 3600
+                )
+            except Exception as e:
+                logger.warning(f"HTTP response cache disabled: {str(e)}")
+                return None
+        return _cache
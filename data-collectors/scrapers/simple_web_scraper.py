@@ -4,7 +4,7 @@ Scrapes basic business information from publicly available sources
 """
 
 import re
-from typing import List, Optional
+from typing import Optional, Iterator
 import logging
 from datetime import datetime
 import random
@@ -206,7 +206,7 @@ class SimpleWebScraper(BaseScraper):
             }
         ]
         
-    def scrape(self) -> List[dict]:
+    def iter_businesses(self) -> Iterator[dict]:
         """Return sample Hawaii businesses"""
         companies = []
         
@@ -240,7 +240,7 @@ class SimpleWebScraper(BaseScraper):
                 logger.error(f"Error creating sample company: {e}")
                 
         logger.info(f"Generated {len(companies)} sample companies")
-        return companies
+        yield from companies
     
     def _generate_hawaii_phone(self) -> str:
         """Generate a realistic Hawaii phone number"""
@@ -6,7 +6,7 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import re
-from typing import List, Dict, Optional
+from typing import Dict, Optional, Iterator
 import logging
 from .base_scraper import BaseScraper
 
@@ -23,7 +23,7 @@ class SmallBusinessFinder(BaseScraper):
         """Parse business info - return as-is"""
         return raw_data
         
-    def scrape(self) -> List[Dict]:
+    def iter_businesses(self) -> Iterator[Dict]:
         """Return curated list of small Hawaii businesses"""
         
         # Curated list of real small-to-medium Hawaii businesses
@@ -240,4 +240,4 @@ class SmallBusinessFinder(BaseScraper):
             }
         ]
         
-        return small_businesses
\ No newline at end of file
+        yield from small_businesses
\ No newline at end of file
@@ -5,7 +5,7 @@ Extracts real business data from Yelp for Hawaii locations
 
 import re
 import json
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator
 import logging
 import time
 import requests
@@ -51,33 +51,35 @@ class YelpScraper(BaseScraper):
             'eventservices'
         ]
         
-    def scrape(self) -> List[Dict]:
-        """Scrape Yelp for Hawaii businesses"""
-        all_companies = []
+    def iter_businesses(self) -> Iterator[Dict]:
+        """Scrape Yelp for Hawaii businesses, yielding each new one as found"""
+        seen = set()
+        locations = {location['city']: location for location in self.locations}
+        units = [(location['city'], category, 1) for location in self.locations for category in self.categories]
         
-        # Limit searches for rate limiting
-        for location in self.locations[:3]:  # Start with 3 locations
-            for category in self.categories[:4]:  # Start with 4 categories
-                logger.info(f"Searching Yelp for {category} in {location['city']}")
+        # Grid is capped per run (units_per_run) for rate limiting
+        for unit in self.plan_units(units):
+            location, category = locations[unit[0]], unit[1]
+            logger.info(f"Searching Yelp for {category} in {location['city']}")
+            
+            try:
+                companies = self._search_location_category(location, category)
+                
+                # Remove duplicates
+                for company in companies:
+                    if company['name'] not in seen:
+                        seen.add(company['name'])
+                        yield company
+                        
+                self.complete_unit(unit, len(companies))
+                
+                # Be respectful with rate limiting
+                time.sleep(3)
                 
-                try:
-                    companies = self._search_location_category(location, category)
-                    all_companies.extend(companies)
-                    
-                    # Be respectful with rate limiting
-                    time.sleep(3)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {category} in {location['city']}: {e}")
-                    
-        # Remove duplicates
-        unique_companies = {}
-        for company in all_companies:
-            if company.name not in unique_companies:
-                unique_companies[company.name] = company
+            except Exception as e:
+                logger.error(f"Error searching {category} in {location['city']}: {e}")
                 
-        logger.info(f"Found {len(unique_companies)} unique businesses from Yelp")
-        return list(unique_companies.values())
+        logger.info(f"Found {len(seen)} unique businesses from Yelp")
     
     def _search_location_category(self, location: dict, category: str) -> List[Dict]:
         """Search for businesses in a specific location and category"""
@@ -0,0 +1,64 @@
+import logging
+import threading
+from typing import Callable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (location, category, page) cell of a scraper's search grid
+Unit = Tuple[str, str, int]
+
+
+class CheckpointStore:
+    """Completed search units of one source, backed by collection_checkpoints
+
+    Scrapers ask for the units that are due, stalest first, and report each
+    unit as it completes. Completions are only written by flush(), which the
+    processor calls after the batch holding the unit's records is saved, so
+    an interrupted run resumes without dropping records. Other progress
+    markers, such as response cache writes, can wait for flush() through
+    after_flush().
+    """
+
+    def __init__(self, db_service, source: str, freshness_seconds: float):
+        self.db_service = db_service
+        self.source = source
+        self.freshness_seconds = freshness_seconds
+        self._pending: List[Tuple[str, str, int, int]] = []
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def due(self, units: Sequence[Unit]) -> List[Unit]:
+        """Units not fetched within the freshness window, never-fetched first"""
+        ages = self.db_service.get_checkpoints(self.source)
+        if ages is None:
+            return list(units)
+
+        due = [unit for unit in units if ages.get(unit, float('inf')) >= self.freshness_seconds]
+        skipped = len(units) - len(due)
+        if skipped:
+            logger.info(f"{self.source}: skipping {skipped} of {len(units)} units fetched recently")
+        # sorted() is stable, so the grid order is kept among equally stale units
+        return sorted(due, key=lambda unit: -ages.get(unit, float('inf')))
+
+    def complete(self, unit: Unit, records_found: int = 0):
+        """Note that a unit finished; written on the next flush()"""
+        with self._lock:
+            self._pending.append(tuple(unit) + (records_found,))
+
+    def after_flush(self, callback: Callable[[], None]):
+        """Run callback on the next flush(), once the current records are saved"""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def flush(self):
+        """Persist completions whose records have been saved"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            callbacks, self._callbacks = self._callbacks, []
+        self.db_service.record_checkpoints(self.source, pending)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"{self.source}: post-flush callback failed: {str(e)}")
+
@@ -0,0 +1,174 @@
+import threading
+import time
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions, pool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the timeout"""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of psycopg2 connections with usage metrics
+
+    min_size defaults to max_size: ThreadedConnectionPool closes every
+    returned connection once min_size idle ones are held, so a smaller
+    minimum makes concurrent collectors reconnect on nearly every call.
+    """
+
+    def __init__(self, connection_params: Dict[str, Any], min_size: Optional[int] = None,
+                 max_size: int = 10, checkout_timeout: float = 30.0,
+                 max_age: float = 1800.0):
+        min_size = max_size if min_size is None else min(min_size, max_size)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_age = max_age
+
+        self._pool = pool.ThreadedConnectionPool(min_size, max_size, **connection_params)
+        # ThreadedConnectionPool raises as soon as it is exhausted, so callers
+        # wait on this semaphore for a free slot instead
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # Open time of each connection, keyed by the connection itself
+        # (ids of closed connections are reused)
+        self._born: Dict[Any, float] = {}
+
+        self._checkouts = 0
+        self._in_use = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def getconn(self):
+        """Check out a connection, waiting up to checkout_timeout for a free slot"""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f"No database connection available after {self.checkout_timeout}s "
+                f"(pool size {self.max_size})"
+            )
+
+        try:
+            conn = self._pool.getconn()
+            now = time.monotonic()
+            with self._lock:
+                born = self._born.setdefault(conn, now)
+
+            # Replace connections that were dropped or have outlived max_age
+            if conn.closed or now - born > self.max_age:
+                self._discard(conn)
+                conn = self._pool.getconn()
+                with self._lock:
+                    self._born[conn] = time.monotonic()
+                    self._recycled += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool, closing it if broken or discarded"""
+        try:
+            if discard or conn.closed:
+                self._discard(conn)
+            else:
+                # Never hand out a connection with a dangling transaction
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                self._pool.putconn(conn)
+                # The pool closes connections beyond min_size it holds idle
+                if conn.closed:
+                    with self._lock:
+                        self._born.pop(conn, None)
+        except Exception as e:
+            logger.warning(f"Error returning connection to pool: {str(e)}")
+            self._discard(conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a with-block"""
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool size, checkout wait time and connection age statistics"""
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - born for born in self._born.values()]
+            return {
+                'max_size': self.max_size,
+                'open_connections': len(self._born),
+                'in_use': self._in_use,
+                'checkouts': self._checkouts,
+                'checkout_timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'avg_wait_ms': round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._wait_max * 1000, 3),
+                'avg_connection_age_s': round(sum(ages) / len(ages), 1) if ages else 0.0,
+                'max_connection_age_s': round(max(ages), 1) if ages else 0.0,
+            }
+
+    def closeall(self):
+        """Close every connection held by the pool"""
+        self._pool.closeall()
+        with self._lock:
+            self._born.clear()
+
+    def _discard(self, conn):
+        """Close a connection and drop it from the pool"""
+        with self._lock:
+            self._born.pop(conn, None)
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            pass
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_params: Dict[str, Any]) -> ConnectionPool:
+    """Get the process-wide pool for these connection parameters"""
+    key = tuple(sorted((k, str(v)) for k, v in connection_params.items()))
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                connection_params,
+                min_size=int(os.environ['DB_POOL_MIN_SIZE']) if os.getenv('DB_POOL_MIN_SIZE') else None,
+                max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+                max_age=float(os.getenv('DB_POOL_MAX_AGE', 1800))
+            )
+        return _pools[key]
@@ -1,15 +1,29 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import logging
 from dotenv import load_dotenv
 
+from .connection_pool import ConnectionPool, get_pool
+
+try:
+    import redis
+except ImportError:  # Optional; without it the API cache relies on its staleness bound
+    redis = None
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Bumped after the analytics rollups are refreshed so the API's analytics
+# cache (backend/services/analytics_cache.py) drops payloads built from the
+# previous rollups; bumping on writes would let it re-cache stale rollups
+ANALYTICS_VERSION_KEY = 'hbi:analytics:version'
+
 
 class DatabaseService:
     """Database service for data collectors"""
@@ -22,10 +36,95 @@ class DatabaseService:
             'user': os.getenv('DB_USER', 'hbi_user'),
             'password': os.getenv('DB_PASSWORD')
         }
+        self._pool: Optional[ConnectionPool] = None
+        self._local = threading.local()
+        self._redis = None
+        
+    @property
+    def pool(self) -> ConnectionPool:
+        """Shared connection pool, created on first use"""
+        if self._pool is None:
+            self._pool = get_pool(self.connection_params)
+        return self._pool
         
+    @contextmanager
     def get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(**self.connection_params)
+        """Get a pooled database connection
+        
+        Inside unit_of_work() this yields the unit's connection and leaves
+        the commit to it; otherwise the work is committed when the block exits.
+        """
+        uow_conn = getattr(self._local, 'conn', None)
+        if uow_conn is not None:
+            try:
+                yield uow_conn
+            except Exception:
+                self._local.failed = True
+                raise
+            return
+            
+        with self.pool.connection() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._local.analytics_dirty = False
+                raise
+            self._publish_analytics_change()
+                
+    @contextmanager
+    def unit_of_work(self):
+        """Run several writes on one connection and commit them together
+        
+        If any write inside the block fails, everything in the unit is
+        rolled back. Nested units join the outermost one.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+            
+        with self.pool.connection() as conn:
+            self._local.conn = conn
+            self._local.failed = False
+            try:
+                yield conn
+                if self._local.failed:
+                    logger.warning("Rolling back unit of work after a failed write")
+                    conn.rollback()
+                    self._local.analytics_dirty = False
+                else:
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                self._local.analytics_dirty = False
+                raise
+            finally:
+                self._local.conn = None
+            self._publish_analytics_change()
+            
+    def _mark_analytics_dirty(self):
+        """Note that the current transaction refreshes the dashboard aggregates"""
+        self._local.analytics_dirty = True
+        
+    def _publish_analytics_change(self):
+        """Invalidate the API's analytics cache once dirty writes are committed"""
+        if not getattr(self._local, 'analytics_dirty', False):
+            return
+        self._local.analytics_dirty = False
+        
+        if redis is None or not os.getenv('REDIS_URL'):
+            return
+        try:
+            if self._redis is None:
+                self._redis = redis.Redis.from_url(os.getenv('REDIS_URL'), socket_timeout=0.5)
+            self._redis.incr(ANALYTICS_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not publish analytics invalidation: {str(e)}")
+                
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Connection pool size, checkout wait and connection age metrics"""
+        return self.pool.metrics()
         
     def create_company(self, company_data: Dict[str, Any]) -> Optional[int]:
         """Create a new company record"""
@@ -46,15 +145,21 @@ class DatabaseService:
                     """
                     cursor.execute(query, company_data)
                     company_id = cursor.fetchone()[0]
-                    conn.commit()
                     return company_id
                     
         except Exception as e:
             logger.error(f"Error creating company: {str(e)}")
             return None
             
+    # Company columns whose change makes a prospect's analysis stale
+    ANALYSIS_INPUT_COLUMNS = ['description', 'employee_count_estimate', 'website']
+    
     def update_company(self, company_id: int, company_data: Dict[str, Any]):
-        """Update existing company record"""
+        """Update existing company record
+        
+        Prospects of the company are flagged needs_analysis when the update
+        changes one of ANALYSIS_INPUT_COLUMNS.
+        """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -69,14 +174,30 @@ class DatabaseService:
                             params[field] = company_data[field]
                             
                     if update_fields:
+                        # Every WITH clause sees the row as it was before the
+                        # update, so "previous" holds the old values
+                        columns = ', '.join(self.ANALYSIS_INPUT_COLUMNS)
+                        changed = ' OR '.join(
+                            f"previous.{column} IS DISTINCT FROM updated.{column}"
+                            for column in self.ANALYSIS_INPUT_COLUMNS
+                        )
                         query = f"""
-                            UPDATE companies 
-                            SET {', '.join(update_fields)}, updated_at = NOW()
-                            WHERE id = %(id)s
+                            WITH previous AS (
+                                SELECT {columns} FROM companies WHERE id = %(id)s
+                            ), updated AS (
+                                UPDATE companies 
+                                SET {', '.join(update_fields)}, updated_at = NOW()
+                                WHERE id = %(id)s
+                                RETURNING {columns}
+                            )
+                            UPDATE prospects p SET needs_analysis = TRUE
+                            FROM previous, updated
+                            WHERE p.company_id = %(id)s
+                              AND NOT p.needs_analysis
+                              AND ({changed})
                         """
                         cursor.execute(query, params)
-                        conn.commit()
-                        
+                            
         except Exception as e:
             logger.error(f"Error updating company: {str(e)}")
             
@@ -109,6 +230,18 @@ class DatabaseService:
             logger.error(f"Error checking company existence: {str(e)}")
             return None
             
+    def get_company_identities(self) -> Optional[List[Dict[str, Any]]]:
+        """Identity fields of every company, for warming the entity resolver"""
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute("SELECT name, island, phone, website FROM companies ORDER BY id")
+                    return cursor.fetchall()
+                    
+        except Exception as e:
+            logger.error(f"Error loading company identities: {str(e)}")
+            return None
+            
     def create_prospect(self, prospect_data: Dict[str, Any]) -> Optional[int]:
         """Create a new prospect record"""
         try:
@@ -123,15 +256,172 @@ class DatabaseService:
                     """
                     cursor.execute(query, prospect_data)
                     prospect_id = cursor.fetchone()[0]
-                    conn.commit()
                     return prospect_id
                     
         except Exception as e:
             logger.error(f"Error creating prospect: {str(e)}")
             return None
             
-    def update_prospect(self, prospect_id: int, analysis_data: Dict[str, Any]):
-        """Update prospect with analysis results"""
+    # Columns staged and upserted by bulk_upsert_companies
+    BULK_COMPANY_FIELDS = [
+        'name', 'address', 'island', 'industry', 'website', 'phone',
+        'employee_count_estimate', 'annual_revenue_estimate',
+        'description', 'source', 'source_url'
+    ]
+    
+    # Enum columns of companies, staged as text and checked before the merge
+    BULK_ENUM_COLUMNS = {'island': 'island_enum', 'industry': 'industry_enum'}
+    
+    def bulk_upsert_companies(self, businesses: List[Dict[str, Any]],
+                              on_commit: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+                              ) -> Optional[Tuple[int, int]]:
+        """Upsert a batch of companies and create their missing prospects
+        
+        The batch is staged in a temp table with execute_values and merged
+        with a single INSERT ... ON CONFLICT (name, island), so the number of
+        round trips does not grow with the batch size. Records whose island
+        or industry is not a valid enum value are skipped, as the row-by-row
+        path skips them when their insert fails, as are records with a value
+        longer than its column allows. Names differing only in case count
+        as one company. Returns (processed, added)
+        like DataProcessor.process_businesses, added counting only companies
+        that did not exist yet, or None if the batch could not be written.
+        on_commit is called with the records that were written once the
+        transaction has committed.
+        """
+        if not businesses:
+            return 0, 0
+            
+        fields = self.BULK_COMPANY_FIELDS
+        enums = self.BULK_ENUM_COLUMNS
+        rows = [
+            tuple(business.get(field) for field in fields)
+            + (business.get('growth_signals') or [], seq)
+            for seq, business in enumerate(businesses)
+        ]
+        # Existing updates only touch these columns; NULLs keep the stored value
+        updatable = ['description', 'employee_count_estimate', 'website', 'phone', 'source_url']
+        inputs_changed = ' OR '.join(
+            f"(s.{column} IS NOT NULL AND s.{column} IS DISTINCT FROM c.{column})"
+            for column in self.ANALYSIS_INPUT_COLUMNS
+        )
+        
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT column_name, character_maximum_length
+                        FROM information_schema.columns
+                        WHERE table_schema = current_schema() AND table_name = 'companies'
+                          AND character_maximum_length IS NOT NULL
+                    """)
+                    limits = {column: length for column, length in cursor.fetchall() if column in fields}
+                    
+                    # Staging table inherits the column types of companies,
+                    # except that enums and length-limited columns are text
+                    # so one bad value cannot fail the whole insert
+                    staged_columns = ', '.join(
+                        f"{field}::TEXT AS {field}" if field in enums or field in limits else field
+                        for field in fields
+                    )
+                    valid = ' AND '.join(
+                        [f"{column} IN (SELECT unnest(enum_range(NULL::{enum}))::TEXT)"
+                         for column, enum in enums.items()]
+                        + [f"COALESCE(LENGTH({column}), 0) <= {length}" for column, length in limits.items()]
+                    )
+                    cursor.execute(f"""
+                        CREATE TEMP TABLE staging_companies ON COMMIT DROP AS
+                        SELECT {staged_columns},
+                               NULL::TEXT[] AS growth_signals,
+                               0 AS seq
+                        FROM companies
+                        WITH NO DATA
+                    """)
+                    execute_values(
+                        cursor,
+                        f"INSERT INTO staging_companies ({', '.join(fields)}, growth_signals, seq) VALUES %s",
+                        rows,
+                        page_size=len(rows)
+                    )
+                    
+                    # A NULL island or industry makes the check NULL, not false
+                    cursor.execute(f"DELETE FROM staging_companies WHERE NOT COALESCE({valid}, FALSE) RETURNING seq")
+                    skipped = {seq for (seq,) in cursor.fetchall()}
+                    if skipped:
+                        logger.warning(f"Skipped {len(skipped)} records with an invalid island or industry "
+                                       f"or an over-long value")
+                    cursor.execute(f"""
+                        ALTER TABLE staging_companies
+                        {', '.join(f"ALTER COLUMN {column} TYPE {enum} USING {column}::{enum}" for column, enum in enums.items())}
+                    """)
+                    
+                    # Match existing companies case-insensitively, as the
+                    # per-row lookup does, by adopting their stored name
+                    cursor.execute("""
+                        UPDATE staging_companies s
+                        SET name = c.name
+                        FROM companies c
+                        WHERE LOWER(c.name) = LOWER(s.name)
+                          AND c.island = s.island
+                          AND c.name <> s.name
+                    """)
+                    
+                    # Flag prospects whose analysis inputs the merge below
+                    # will change (NULL staged values keep the stored one)
+                    cursor.execute(f"""
+                        UPDATE prospects p SET needs_analysis = TRUE
+                        FROM staging_companies s
+                        JOIN companies c ON c.name = s.name AND c.island = s.island
+                        WHERE p.company_id = c.id
+                          AND NOT p.needs_analysis
+                          AND ({inputs_changed})
+                    """)
+                    
+                    # Keep the last record for duplicates within the batch,
+                    # case-insensitively like the lookup above; ON CONFLICT
+                    # cannot touch the same row twice
+                    cursor.execute(f"""
+                        INSERT INTO companies ({', '.join(fields)})
+                        SELECT DISTINCT ON (LOWER(name), island) {', '.join(fields)}
+                        FROM staging_companies
+                        WHERE name IS NOT NULL AND name <> ''
+                        ORDER BY LOWER(name), island, seq DESC
+                        ON CONFLICT (name, island) DO UPDATE SET
+                            {', '.join(f"{field} = COALESCE(EXCLUDED.{field}, companies.{field})" for field in updatable)},
+                            updated_at = NOW()
+                        RETURNING (xmax = 0) AS inserted
+                    """)
+                    merged = cursor.fetchall()
+                    processed = len(merged)
+                    added = sum(1 for (inserted,) in merged if inserted)
+                    
+                    cursor.execute("""
+                        INSERT INTO prospects (company_id, score, growth_signals)
+                        SELECT DISTINCT ON (c.id) c.id, 0, s.growth_signals
+                        FROM staging_companies s
+                        JOIN companies c ON c.name = s.name AND c.island = s.island
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM prospects p WHERE p.company_id = c.id
+                        )
+                        ORDER BY c.id, s.seq DESC
+                    """)
+                    
+            if on_commit is not None:
+                on_commit([business for seq, business in enumerate(businesses) if seq not in skipped])
+            return processed, added
+                    
+        except Exception as e:
+            logger.error(f"Error bulk upserting {len(businesses)} companies: {str(e)}")
+            return None
+            
+    def update_prospect(self, prospect_id: int, analysis_data: Dict[str, Any],
+                        fingerprint: Optional[str] = None):
+        """Update prospect with analysis results
+        
+        fingerprint is the input_fingerprint of the data the analysis was
+        made from; with it the prospect is marked clean until its inputs
+        change, without it the prospect stays queued for analysis.
+        """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -145,26 +435,40 @@ class DatabaseService:
                             growth_signals = %(growth_signals)s,
                             technology_readiness = %(technology_readiness)s,
                             priority_level = %(priority_level)s,
+                            analysis_fingerprint = COALESCE(%(analysis_fingerprint)s, analysis_fingerprint),
+                            needs_analysis = %(analysis_fingerprint)s IS NULL,
                             last_analyzed = NOW(),
                             updated_at = NOW()
                         WHERE id = %(id)s
                     """
                     analysis_data['id'] = prospect_id
-                    cursor.execute(query, analysis_data)
-                    conn.commit()
+                    cursor.execute(query, dict(analysis_data, analysis_fingerprint=fingerprint))
                     
         except Exception as e:
             logger.error(f"Error updating prospect: {str(e)}")
             
     def get_unanalyzed_prospects(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get prospects that need analysis"""
+        """Get prospects that need analysis
+        
+        Only prospects flagged needs_analysis (new, or whose company inputs
+        changed) are returned. High and Medium priority prospects come
+        first, then never-scored ones, then Low; higher scores first within
+        each level.
+        """
         try:
             with self.get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     query = """
                         SELECT * FROM prospects 
-                        WHERE score = 0 OR last_analyzed IS NULL
-                        ORDER BY created_at DESC
+                        WHERE needs_analysis
+                        ORDER BY CASE priority_level
+                                     WHEN 'High' THEN 0
+                                     WHEN 'Medium' THEN 1
+                                     WHEN 'Low' THEN 3
+                                     ELSE 2
+                                 END,
+                                 COALESCE(score, 0) DESC,
+                                 created_at DESC
                         LIMIT %s
                     """
                     cursor.execute(query, (limit,))
@@ -174,6 +478,45 @@ class DatabaseService:
             logger.error(f"Error getting unanalyzed prospects: {str(e)}")
             return []
             
+    def record_fit_scores(self, scores: List[Tuple[int, int, Optional[str]]]):
+        """Store pre-filter fit scores as (prospect_id, fit_score, fingerprint)
+        
+        Rows with a fingerprint were filtered out below the threshold; they
+        are marked clean under that fingerprint, so they are scored again
+        only once their inputs change.
+        """
+        if not scores:
+            return
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, """
+                        UPDATE prospects p SET
+                            fit_score = v.fit_score,
+                            needs_analysis = p.needs_analysis AND v.fingerprint IS NULL,
+                            analysis_fingerprint = COALESCE(v.fingerprint, p.analysis_fingerprint)
+                        FROM (VALUES %s) AS v(id, fit_score, fingerprint)
+                        WHERE p.id = v.id
+                    """, scores, page_size=len(scores))
+                    
+        except Exception as e:
+            logger.error(f"Error recording fit scores: {str(e)}")
+            
+    def mark_prospects_analyzed(self, prospect_ids: List[int]):
+        """Clear needs_analysis on prospects whose inputs turned out unchanged"""
+        if not prospect_ids:
+            return
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE prospects SET needs_analysis = FALSE WHERE id = ANY(%s)",
+                        (list(prospect_ids),)
+                    )
+                    
+        except Exception as e:
+            logger.error(f"Error clearing needs_analysis: {str(e)}")
+            
     def log_collection(self, **kwargs):
         """Log data collection run"""
         try:
@@ -191,43 +534,84 @@ class DatabaseService:
                         )
                     """
                     cursor.execute(query, kwargs)
-                    conn.commit()
                     
         except Exception as e:
             logger.error(f"Error logging collection: {str(e)}")
             
+    def get_checkpoints(self, source: str) -> Optional[Dict[Tuple[str, str, int], float]]:
+        """Seconds since each checkpointed unit of a source was last fetched"""
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT location, category, page,
+                               EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - fetched_at))
+                        FROM collection_checkpoints
+                        WHERE source = %s
+                    """, (source,))
+                    return {(row[0], row[1], row[2]): float(row[3]) for row in cursor.fetchall()}
+                    
+        except Exception as e:
+            logger.error(f"Error loading checkpoints for {source}: {str(e)}")
+            return None
+            
+    def record_checkpoints(self, source: str, units: List[Tuple[str, str, int, int]]):
+        """Mark (location, category, page, records_found) units as fetched now"""
+        if not units:
+            return
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, """
+                        INSERT INTO collection_checkpoints (source, location, category, page, records_found)
+                        VALUES %s
+                        ON CONFLICT (source, location, category, page) DO UPDATE SET
+                            records_found = EXCLUDED.records_found,
+                            fetched_at = CURRENT_TIMESTAMP
+                    """, [(source,) + tuple(unit) for unit in units])
+                    
+        except Exception as e:
+            logger.error(f"Error recording checkpoints for {source}: {str(e)}")
+            
+    def refresh_analytics_rollups(self) -> bool:
+        """Recompute the prospect_rollups materialized view
+        
+        CONCURRENTLY keeps the analytics routes reading the previous
+        contents while the refresh runs. Returns False if it failed.
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY prospect_rollups")
+                self._mark_analytics_dirty()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error refreshing analytics rollups: {str(e)}")
+            return False
+            
     def create_analytics_snapshot(self):
-        """Create analytics snapshot"""
+        """Create analytics snapshot from the analytics rollups"""
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     # Get analytics data
                     cursor.execute("""
                         SELECT 
-                            COUNT(*) as total_prospects,
-                            AVG(score) as average_score,
-                            COUNT(*) FILTER (WHERE priority_level = 'High') as high_priority_count,
-                            SUM(estimated_deal_value) as total_pipeline_value
-                        FROM prospects
+                            COALESCE(SUM(prospect_count), 0) as total_prospects,
+                            SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0) as average_score,
+                            COALESCE(SUM(high_priority_count), 0) as high_priority_count,
+                            SUM(pipeline_value) as total_pipeline_value
+                        FROM prospect_rollups
                     """)
                     stats = cursor.fetchone()
                     
                     # Get by island
-                    cursor.execute("""
-                        SELECT c.island, COUNT(*) as count
-                        FROM prospects p
-                        JOIN companies c ON p.company_id = c.id
-                        GROUP BY c.island
-                    """)
+                    cursor.execute("SELECT island, prospect_count FROM island_rollups")
                     by_island = {row[0]: row[1] for row in cursor.fetchall()}
                     
                     # Get by industry
-                    cursor.execute("""
-                        SELECT c.industry, COUNT(*) as count
-                        FROM prospects p
-                        JOIN companies c ON p.company_id = c.id
-                        GROUP BY c.industry
-                    """)
+                    cursor.execute("SELECT industry, prospect_count FROM industry_rollups")
                     by_industry = {row[0]: row[1] for row in cursor.fetchall()}
                     
                     # Insert snapshot
@@ -245,14 +629,12 @@ class DatabaseService:
                             prospects_by_industry = EXCLUDED.prospects_by_industry,
                             average_score = EXCLUDED.average_score,
                             high_priority_count = EXCLUDED.high_priority_count,
-                            total_pipeline_value = EXCLUDED.total_pipeline_value,
-                            updated_at = NOW()
+                            total_pipeline_value = EXCLUDED.total_pipeline_value
                     """, (
                         stats[0], psycopg2.extras.Json(by_island),
                         psycopg2.extras.Json(by_industry), stats[1],
                         stats[2], stats[3], 0  # Conversion rate placeholder
                     ))
-                    conn.commit()
                     
         except Exception as e:
             logger.error(f"Error creating analytics snapshot: {str(e)}")
@@ -272,7 +654,6 @@ class DatabaseService:
                         )
                     """
                     cursor.execute(query, alert_data)
-                    conn.commit()
                     
         except Exception as e:
             logger.error(f"Error creating email alert: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Keyset pagination indexes, for databases created from database/schema.sql
+-- before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Keyset pagination of the prospect list on (score, id), optionally
+-- narrowed by priority; island/industry filters join through companies
+CREATE INDEX IF NOT EXISTS idx_prospects_score_id ON prospects ((COALESCE(score, 0)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_prospects_priority_score_id ON prospects (priority_level, (COALESCE(score, 0)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_companies_island_industry ON companies(island, industry, id);
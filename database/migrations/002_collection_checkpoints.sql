@@ -0,0 +1,15 @@
+-- Collection checkpoints, for databases created from database/schema.sql
+-- before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Collection checkpoints table: last fetch of each (source, location, category, page)
+-- unit of a scraper's search grid, so runs resume and skip fresh units
+CREATE TABLE IF NOT EXISTS collection_checkpoints (
+    source VARCHAR(100) NOT NULL,
+    location VARCHAR(255) NOT NULL DEFAULT '',
+    category VARCHAR(255) NOT NULL DEFAULT '',
+    page INTEGER NOT NULL DEFAULT 1,
+    records_found INTEGER DEFAULT 0,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, location, category, page)
+);
@@ -0,0 +1,27 @@
+-- Prospect analysis fingerprints, for databases created from
+-- database/schema.sql before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Hash of the company fields the last analysis used, and whether they
+-- have changed since (set when description, size or website change)
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS analysis_fingerprint CHAR(64);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'prospects'
+          AND column_name = 'needs_analysis'
+    ) THEN
+        ALTER TABLE prospects ADD COLUMN needs_analysis BOOLEAN NOT NULL DEFAULT TRUE;
+        -- Only once, when the column is added: prospects that were already
+        -- scored keep their analysis until their company inputs change,
+        -- as they did when sweeps selected score 0. updated_at is left alone.
+        ALTER TABLE prospects DISABLE TRIGGER update_prospects_updated_at;
+        UPDATE prospects SET needs_analysis = FALSE WHERE COALESCE(score, 0) > 0;
+        ALTER TABLE prospects ENABLE TRIGGER update_prospects_updated_at;
+    END IF;
+END $$;
+
+-- Analysis sweeps only read prospects whose inputs changed
+CREATE INDEX IF NOT EXISTS idx_prospects_needs_analysis ON prospects(company_id) WHERE needs_analysis;
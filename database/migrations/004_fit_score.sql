@@ -0,0 +1,6 @@
+-- Prospect fit scores, for databases created from database/schema.sql
+-- before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Heuristic pre-filter score (0-100) computed before any Claude call
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS fit_score INTEGER;
@@ -0,0 +1,41 @@
+-- Analytics rollups, for databases created from database/schema.sql
+-- before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Prospect aggregates per (island, industry) segment, refreshed
+-- concurrently by the collectors' scheduler and the API (see schema.sql)
+CREATE MATERIALIZED VIEW IF NOT EXISTS prospect_rollups AS
+SELECT 
+    c.island,
+    c.industry,
+    COUNT(p.id)::int AS prospect_count,
+    COUNT(p.score)::int AS scored_count,
+    COALESCE(SUM(p.score), 0)::bigint AS score_sum,
+    (COUNT(p.id) FILTER (WHERE p.priority_level = 'High'))::int AS high_priority_count,
+    COALESCE(SUM(p.estimated_deal_value), 0) AS pipeline_value
+FROM prospects p
+JOIN companies c ON p.company_id = c.id
+GROUP BY c.island, c.industry;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_prospect_rollups_segment ON prospect_rollups(island, industry);
+
+CREATE OR REPLACE VIEW island_rollups AS
+SELECT 
+    island,
+    SUM(prospect_count)::int AS prospect_count,
+    COALESCE(SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0), 0) AS average_score,
+    SUM(high_priority_count)::int AS high_priority_count,
+    SUM(pipeline_value) AS total_pipeline_value
+FROM prospect_rollups
+GROUP BY island;
+
+CREATE OR REPLACE VIEW industry_rollups AS
+SELECT 
+    industry,
+    SUM(prospect_count)::int AS prospect_count,
+    COALESCE(SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0), 0) AS average_score,
+    SUM(high_priority_count)::int AS high_priority_count,
+    SUM(pipeline_value) AS total_pipeline_value
+FROM prospect_rollups
+GROUP BY industry;
@@ -0,0 +1,88 @@
+-- Daily prospect counters, for databases created from database/schema.sql
+-- before they were added there. Safe to run again.
+-- Apply the files in this directory in order: psql -f <file>
+
+-- Recent-prospect lists and the daily counts backfill read by creation time
+CREATE INDEX IF NOT EXISTS idx_prospects_created_at ON prospects(created_at);
+
+-- Daily timeline counters: prospects created and their pipeline value per
+-- creation day, kept current by statement-level triggers on prospects so
+-- the analytics timeline reads at most one row per day of its range.
+CREATE TABLE IF NOT EXISTS prospect_daily_counts (
+    day DATE PRIMARY KEY,
+    new_prospects INTEGER NOT NULL DEFAULT 0,
+    pipeline_value DECIMAL(14, 2) NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION apply_prospect_daily_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Net change per day: rows added count +1, rows removed -1; an update
+    -- is both, so one that leaves created_at and the deal value alone nets out
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO prospect_daily_counts AS d (day, new_prospects, pipeline_value)
+        SELECT created_at::date, COUNT(*), COALESCE(SUM(estimated_deal_value), 0)
+        FROM new_rows
+        WHERE created_at IS NOT NULL
+        GROUP BY created_at::date
+        ON CONFLICT (day) DO UPDATE SET
+            new_prospects = d.new_prospects + EXCLUDED.new_prospects,
+            pipeline_value = d.pipeline_value + EXCLUDED.pipeline_value;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO prospect_daily_counts AS d (day, new_prospects, pipeline_value)
+        SELECT day, SUM(n), SUM(value)
+        FROM (
+            SELECT created_at::date AS day, 1 AS n, COALESCE(estimated_deal_value, 0) AS value
+            FROM new_rows WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT created_at::date, -1, -COALESCE(estimated_deal_value, 0)
+            FROM old_rows WHERE created_at IS NOT NULL
+        ) changes
+        GROUP BY day
+        HAVING SUM(n) <> 0 OR SUM(value) <> 0
+        ON CONFLICT (day) DO UPDATE SET
+            new_prospects = d.new_prospects + EXCLUDED.new_prospects,
+            pipeline_value = d.pipeline_value + EXCLUDED.pipeline_value;
+    ELSE
+        UPDATE prospect_daily_counts d SET
+            new_prospects = d.new_prospects - removed.n,
+            pipeline_value = d.pipeline_value - removed.value
+        FROM (
+            SELECT created_at::date AS day, COUNT(*) AS n, COALESCE(SUM(estimated_deal_value), 0) AS value
+            FROM old_rows
+            WHERE created_at IS NOT NULL
+            GROUP BY created_at::date
+        ) removed
+        WHERE d.day = removed.day;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables need one trigger per event (and no column lists)
+DROP TRIGGER IF EXISTS prospect_daily_counts_insert ON prospects;
+CREATE TRIGGER prospect_daily_counts_insert AFTER INSERT ON prospects
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+DROP TRIGGER IF EXISTS prospect_daily_counts_update ON prospects;
+CREATE TRIGGER prospect_daily_counts_update AFTER UPDATE ON prospects
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+DROP TRIGGER IF EXISTS prospect_daily_counts_delete ON prospects;
+CREATE TRIGGER prospect_daily_counts_delete AFTER DELETE ON prospects
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+-- Count the prospects that existed before the triggers. Each day is
+-- recounted from the prospects table, so running this again corrects the
+-- counters rather than adding to them.
+INSERT INTO prospect_daily_counts (day, new_prospects, pipeline_value)
+SELECT created_at::date, COUNT(*), COALESCE(SUM(estimated_deal_value), 0)
+FROM prospects
+WHERE created_at IS NOT NULL
+GROUP BY created_at::date
+ON CONFLICT (day) DO UPDATE SET
+    new_prospects = EXCLUDED.new_prospects,
+    pipeline_value = EXCLUDED.pipeline_value;
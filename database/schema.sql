@@ -50,6 +50,12 @@ CREATE TABLE prospects (
     technology_readiness VARCHAR(50),
     priority_level VARCHAR(20) CHECK (priority_level IN ('High', 'Medium', 'Low')),
     last_analyzed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Hash of the company fields the last analysis used, and whether they
+    -- have changed since (set when description, size or website change)
+    analysis_fingerprint CHAR(64),
+    needs_analysis BOOLEAN NOT NULL DEFAULT TRUE,
+    -- Heuristic pre-filter score (0-100) computed before any Claude call
+    fit_score INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -144,6 +150,18 @@ CREATE TABLE data_collection_logs (
     status VARCHAR(20)
 );
 
+-- Collection checkpoints table: last fetch of each (source, location, category, page)
+-- unit of a scraper's search grid, so runs resume and skip fresh units
+CREATE TABLE collection_checkpoints (
+    source VARCHAR(100) NOT NULL,
+    location VARCHAR(255) NOT NULL DEFAULT '',
+    category VARCHAR(255) NOT NULL DEFAULT '',
+    page INTEGER NOT NULL DEFAULT 1,
+    records_found INTEGER DEFAULT 0,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, location, category, page)
+);
+
 -- Email alerts table
 CREATE TABLE email_alerts (
     id SERIAL PRIMARY KEY,
@@ -165,6 +183,18 @@ CREATE INDEX idx_opportunities_stage ON opportunities(stage_id);
 CREATE INDEX idx_interactions_prospect ON interactions(prospect_id);
 CREATE INDEX idx_interactions_date ON interactions(interaction_date);
 
+-- Keyset pagination of the prospect list on (score, id), optionally
+-- narrowed by priority; island/industry filters join through companies
+CREATE INDEX idx_prospects_score_id ON prospects ((COALESCE(score, 0)) DESC, id DESC);
+CREATE INDEX idx_prospects_priority_score_id ON prospects (priority_level, (COALESCE(score, 0)) DESC, id DESC);
+CREATE INDEX idx_companies_island_industry ON companies(island, industry, id);
+
+-- Recent-prospect lists and the daily counts backfill read by creation time
+CREATE INDEX idx_prospects_created_at ON prospects(created_at);
+
+-- Analysis sweeps only read prospects whose inputs changed
+CREATE INDEX idx_prospects_needs_analysis ON prospects(company_id) WHERE needs_analysis;
+
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -182,4 +212,118 @@ CREATE TRIGGER update_prospects_updated_at BEFORE UPDATE ON prospects
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 CREATE TRIGGER update_opportunities_updated_at BEFORE UPDATE ON opportunities
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Analytics rollups: prospect aggregates per (island, industry) segment.
+-- The analytics routes and snapshots read these instead of grouping the
+-- prospects table, so their cost depends on the number of segments, not
+-- prospects. Refreshed concurrently (readers are not blocked) by the
+-- data-collectors scheduler on an interval and after each collection run,
+-- and by a background thread of the API after its writes and on the same
+-- interval (backend/services/analytics_rollups.py).
+CREATE MATERIALIZED VIEW prospect_rollups AS
+SELECT 
+    c.island,
+    c.industry,
+    COUNT(p.id)::int AS prospect_count,
+    COUNT(p.score)::int AS scored_count,
+    COALESCE(SUM(p.score), 0)::bigint AS score_sum,
+    (COUNT(p.id) FILTER (WHERE p.priority_level = 'High'))::int AS high_priority_count,
+    COALESCE(SUM(p.estimated_deal_value), 0) AS pipeline_value
+FROM prospects p
+JOIN companies c ON p.company_id = c.id
+GROUP BY c.island, c.industry;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX idx_prospect_rollups_segment ON prospect_rollups(island, industry);
+
+CREATE VIEW island_rollups AS
+SELECT 
+    island,
+    SUM(prospect_count)::int AS prospect_count,
+    COALESCE(SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0), 0) AS average_score,
+    SUM(high_priority_count)::int AS high_priority_count,
+    SUM(pipeline_value) AS total_pipeline_value
+FROM prospect_rollups
+GROUP BY island;
+
+CREATE VIEW industry_rollups AS
+SELECT 
+    industry,
+    SUM(prospect_count)::int AS prospect_count,
+    COALESCE(SUM(score_sum)::numeric / NULLIF(SUM(scored_count), 0), 0) AS average_score,
+    SUM(high_priority_count)::int AS high_priority_count,
+    SUM(pipeline_value) AS total_pipeline_value
+FROM prospect_rollups
+GROUP BY industry;
+
+-- Daily timeline counters: prospects created and their pipeline value per
+-- creation day, kept current by statement-level triggers on prospects so
+-- the analytics timeline reads at most one row per day of its range.
+CREATE TABLE prospect_daily_counts (
+    day DATE PRIMARY KEY,
+    new_prospects INTEGER NOT NULL DEFAULT 0,
+    pipeline_value DECIMAL(14, 2) NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION apply_prospect_daily_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Net change per day: rows added count +1, rows removed -1; an update
+    -- is both, so one that leaves created_at and the deal value alone nets out
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO prospect_daily_counts AS d (day, new_prospects, pipeline_value)
+        SELECT created_at::date, COUNT(*), COALESCE(SUM(estimated_deal_value), 0)
+        FROM new_rows
+        WHERE created_at IS NOT NULL
+        GROUP BY created_at::date
+        ON CONFLICT (day) DO UPDATE SET
+            new_prospects = d.new_prospects + EXCLUDED.new_prospects,
+            pipeline_value = d.pipeline_value + EXCLUDED.pipeline_value;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO prospect_daily_counts AS d (day, new_prospects, pipeline_value)
+        SELECT day, SUM(n), SUM(value)
+        FROM (
+            SELECT created_at::date AS day, 1 AS n, COALESCE(estimated_deal_value, 0) AS value
+            FROM new_rows WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT created_at::date, -1, -COALESCE(estimated_deal_value, 0)
+            FROM old_rows WHERE created_at IS NOT NULL
+        ) changes
+        GROUP BY day
+        HAVING SUM(n) <> 0 OR SUM(value) <> 0
+        ON CONFLICT (day) DO UPDATE SET
+            new_prospects = d.new_prospects + EXCLUDED.new_prospects,
+            pipeline_value = d.pipeline_value + EXCLUDED.pipeline_value;
+    ELSE
+        UPDATE prospect_daily_counts d SET
+            new_prospects = d.new_prospects - removed.n,
+            pipeline_value = d.pipeline_value - removed.value
+        FROM (
+            SELECT created_at::date AS day, COUNT(*) AS n, COALESCE(SUM(estimated_deal_value), 0) AS value
+            FROM old_rows
+            WHERE created_at IS NOT NULL
+            GROUP BY created_at::date
+        ) removed
+        WHERE d.day = removed.day;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables need one trigger per event (and no column lists)
+CREATE TRIGGER prospect_daily_counts_insert AFTER INSERT ON prospects
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+CREATE TRIGGER prospect_daily_counts_update AFTER UPDATE ON prospects
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+CREATE TRIGGER prospect_daily_counts_delete AFTER DELETE ON prospects
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_prospect_daily_counts();
+
+-- This file creates a fresh database, so there is nothing to count yet;
+-- database/migrations adds these objects to existing databases and
+-- backfills the counters from their prospects.